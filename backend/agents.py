@@ -4,24 +4,233 @@ AI Agents Module - Storyteller and Judge Agents using LangChain + Groq
 This module implements the two-agent system:
 1. Storyteller Agent - Creates bedtime stories for children
 2. Judge Agent - Evaluates story quality and provides feedback
+3. Orchestrator - Creates and scores drafts (one combined request, or the
+   two agents' async calls run concurrently for several prompts)
+
+Both agents expose a blocking API (used by the LangGraph nodes) and an
+async API (acreate_story / arefine_story / aevaluate_story). Async calls
+made within a few milliseconds of each other are coalesced into a single
+ChatGroq.abatch request. The storyteller can also stream a new story
+token by token (create_story_stream / astream_story).
+
+Model/key fallback, client caching and batching live in groq_base
+(GroqFallbackMixin), shared by both agents.
 
 Integrated with:
 - LangSmith: For development tracing and debugging
 - Opik: For LLM performance evaluation and metrics
 """
 
-from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
-from typing import Dict, List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import json
 import os
 import re
 import time
 
-from config.prompts import StorytellerPrompts, JudgePrompts
-from opik_config import log_llm_call, get_opik_tracer
+from cache import DiskCache, SemanticCache, TTLCache, content_hash, cosine_similarity, embed_text
+from config import settings
+from config.constants import CacheConfig, FeatureFlags, QualityMetrics, RegexPatterns, StoryMarkers
+from config.prompts import StorytellerPrompts, JudgePrompts, OrchestratorPrompts
+from groq_base import GroqFallbackMixin, is_rate_limit_error, is_retryable_error, token_usage
+from telemetry import log_llm_call_async
+from utils import count_paragraphs, count_words, estimate_tokens, sentence_word_counts, setup_logger
+
+logger = setup_logger(__name__)
+
+# Shared across agent instances so every request benefits from earlier answers.
+# Stories are matched by prompt similarity; evaluations by exact (title, content).
+_STORY_CACHE = SemanticCache(
+    threshold=CacheConfig.STORY_SIMILARITY_THRESHOLD,
+    maxsize=CacheConfig.STORY_CACHE_SIZE,
+    ttl=CacheConfig.STORY_CACHE_TTL_SECONDS
+)
+_EVALUATION_CACHE = TTLCache(
+    maxsize=CacheConfig.EVALUATION_CACHE_SIZE,
+    ttl=CacheConfig.EVALUATION_CACHE_TTL_SECONDS
+)
+# Evaluations survive restarts, so regenerated stories skip the judge call
+_EVALUATION_DISK_CACHE = DiskCache(
+    Path(__file__).resolve().parent / CacheConfig.EVALUATION_DISK_CACHE_PATH,
+    ttl=CacheConfig.EVALUATION_DISK_CACHE_TTL_SECONDS
+)
+
+
+def _cache_evaluation(cache_key: str, evaluation: Dict) -> None:
+    """Store an evaluation in the memory and disk caches"""
+    _EVALUATION_CACHE.set(cache_key, dict(evaluation))
+    _EVALUATION_DISK_CACHE.set(cache_key, evaluation)
+
+# Response parsing patterns, compiled once at import
+_TITLE_RE = re.compile(r'TITLE:\s*(.+?)\n', re.IGNORECASE)
+_STORY_RE = re.compile(r'STORY:\s*([\s\S]+)', re.IGNORECASE)
+_STORY_MARKER_RE = re.compile(r'STORY:\s*', re.IGNORECASE)
+
+# Plain-text evaluation keys (judge output is line-oriented "KEY: value")
+_EVALUATION_SCORE_KEYS = ("CLARITY", "MORAL", "AGE_APPROPRIATE", "OVERALL")
+_UNSAFE_WORDS_RE = RegexPatterns.UNSAFE_STORY_WORDS
+# Markdown fence around a JSON answer (```json ... ```)
+_CODE_FENCE_RE = re.compile(r'^\s*```(?:json)?|```\s*$', re.IGNORECASE)
+
+# Previous-story context sent to the storyteller. Groq time-to-first-token
+# grows linearly with input tokens, so only the few most relevant stories
+# are included, as short excerpts, under a hard character cap.
+PREVIOUS_STORIES_K = 3
+PREVIOUS_EXCERPT_CHARS = 120
+PREVIOUS_CONTEXT_MAX_CHARS = 1500
+PREVIOUS_CONTEXT_HEADER = "\n\nHere are some examples of previously created stories to match the tone and style:\n"
+
+# Estimated prompt + completion tokens allowed per creation request. Staying
+# under it avoids Groq's per-request TPM errors and the fallback cascade.
+PROMPT_TOKEN_BUDGET = 6000
+
+FORMAT_OVERHEAD_TOKENS = 60
+# Output tokens per word of a range's upper bound, with headroom for longer
+# words and names
+TOKENS_PER_WORD = 1.5
+# Output token caps by story length. Output tokens dominate Groq latency, so
+# a short story should not be allowed 700 tokens. Each cap is the longest
+# story of that length (settings.story.WORD_COUNTS max) plus room for the
+# TITLE:/STORY: markers, so the caps follow the configured word counts.
+LENGTH_TO_MAX_TOKENS = {
+    length: int(counts["max"] * TOKENS_PER_WORD) + FORMAT_OVERHEAD_TOKENS
+    for length, counts in settings.story.WORD_COUNTS.items()
+}
+REFINEMENT_MAX_TOKENS = 900
+# Extra room for the evaluation section of a combined create + evaluate call
+EVALUATION_MAX_TOKENS = 120
+
+# Model tiers, fastest-to-first within each tier. Agents pick a tier by task:
+# the judge only emits a few integers and a sentence of feedback, so it runs
+# on the 8B instant model; the storyteller keeps 70B for quality, with the
+# speculative-decoding 70B variant as a faster first fallback.
+SPEED_MAP = {
+    "quality": ["llama-3.3-70b-versatile", "llama-3.3-70b-specdec", "llama-3.1-8b-instant"],
+    "fast": ["llama-3.1-8b-instant", "llama-3.3-70b-versatile"],
+}
+AGENT_TIERS = {"storyteller": "quality", "judge": "fast"}
+
+@lru_cache(maxsize=16)
+def _system_message(content: str) -> SystemMessage:
+    """
+    Build a system message flagged as a cacheable prompt prefix.
+    
+    System prompts are static strings, so every call starts with the same
+    bytes and providers with prefix caching can skip prefill for them.
+    All per-request data (user prompt, previous stories) goes into the
+    HumanMessage that follows. The message objects are never modified, so
+    one per system prompt is built and shared across requests.
+    """
+    return SystemMessage(
+        content=content,
+        additional_kwargs={"cache_control": {"type": "ephemeral"}}
+    )
+
+
+@lru_cache(maxsize=1024)
+def _story_vector(title: str, content: str) -> Dict[str, float]:
+    """Embedding of a saved story, cached since stories are reused across requests"""
+    return embed_text(f"{title} {content}")
+
+
+@lru_cache(maxsize=1024)
+def _story_excerpt(title: str, content: str) -> Tuple[str, int]:
+    """Previous-story context entry for a saved story and its estimated token count"""
+    excerpt = content[:PREVIOUS_EXCERPT_CHARS] + "..." if len(content) > PREVIOUS_EXCERPT_CHARS else content
+    entry = f"\nTitle: {title}\n{excerpt}\n"
+    return entry, estimate_tokens(entry)
+
+
+def _rank_by_similarity(prompt: str, stories: List[Dict], k: int = PREVIOUS_STORIES_K) -> List[Dict]:
+    """
+    Pick the k previous stories most similar to the prompt.
+    
+    Args:
+        prompt: The new story request
+        stories: Previously saved stories (dicts with 'title' and 'content')
+        k: Number of stories to keep
+        
+    Returns:
+        Up to k stories, most similar first
+    """
+    prompt_vector = embed_text(prompt)
+    scored = [
+        (cosine_similarity(prompt_vector, _story_vector(story.get("title", ""), story.get("content", ""))), index)
+        for index, story in enumerate(stories)
+    ]
+    # Ties (e.g. no word overlap at all) favour the most recent stories
+    scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    return [stories[index] for _, index in scored[:k]]
+
+
+def _leading_int(value: Optional[str], default: int) -> int:
+    """Integer at the start of value ("8", "8/10", "8 - clear"), or default"""
+    digits = ""
+    for ch in (value or "").lstrip():
+        if not ch.isdigit():
+            break
+        digits += ch
+    return int(digits) if digits else default
+
+
+def _word_range(target_word_count: Optional[str]) -> Optional[Tuple[int, int]]:
+    """(lower, upper) of a word range like "300-400", or None if it cannot be parsed"""
+    try:
+        bounds = [int(part) for part in str(target_word_count).split("-") if part.strip()]
+    except ValueError:
+        return None
+    return (min(bounds), max(bounds)) if bounds else None
+
+
+def _tokens_for(target_word_count: Optional[str]) -> Optional[int]:
+    """Output token cap for a word range like "300-400", or None if it cannot be parsed"""
+    word_range = _word_range(target_word_count)
+    if not word_range:
+        return None
+    return int(word_range[1] * TOKENS_PER_WORD) + FORMAT_OVERHEAD_TOKENS
+
+
+class _StoryStreamParser:
+    """
+    Incrementally splits a streamed TITLE/STORY response into events.
+    
+    Emits the title once its line is complete, then every new piece of
+    text after the STORY: marker as a story chunk.
+    """
+    
+    def __init__(self):
+        self.text = ""
+        self._title_sent = False
+        self._emitted = None
+    
+    def feed(self, chunk: str) -> List[Dict]:
+        """Add a streamed chunk and return the events it completes"""
+        self.text += chunk
+        events = []
+        
+        if not self._title_sent:
+            title_match = _TITLE_RE.search(self.text)
+            if title_match:
+                self._title_sent = True
+                events.append({"type": "title", "title": title_match.group(1).strip()})
+        
+        if self._emitted is None:
+            story_match = _STORY_MARKER_RE.search(self.text)
+            # Wait until the whitespace after the marker is complete
+            if story_match and story_match.end() < len(self.text):
+                self._emitted = story_match.end()
+        
+        if self._emitted is not None and self._emitted < len(self.text):
+            events.append({"type": "story_chunk", "content": self.text[self._emitted:]})
+            self._emitted = len(self.text)
+        
+        return events
 
 
-class StorytellerAgent:
+class StorytellerAgent(GroqFallbackMixin):
     """
     The Storyteller Agent creates engaging bedtime stories for children aged 5-10
     
@@ -29,93 +238,60 @@ class StorytellerAgent:
     It can create new stories or refine existing ones based on judge feedback.
     """
     
-    def __init__(self, groq_api_key: str, langsmith_api_key: Optional[str] = None):
+    AGENT_NAME = "storyteller"
+    
+    def __init__(
+        self,
+        groq_api_key: str,
+        langsmith_api_key: Optional[str] = None,
+        tier: str = AGENT_TIERS["storyteller"]
+    ):
         """
         Initialize the Storyteller Agent
         
         Args:
             groq_api_key: API key for Groq LLM service
             langsmith_api_key: Optional API key for LangSmith tracing
+            tier: SPEED_MAP tier used when GROQ_MODEL_STORYTELLER is not set
         """
         if langsmith_api_key:
             os.environ["LANGSMITH_API_KEY"] = langsmith_api_key
             os.environ["LANGCHAIN_TRACING_V2"] = "true"
             os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGSMITH_PROJECT", "bedtime-stories")
-        
-        self.groq_api_key = groq_api_key
+            
         env_list = os.getenv("GROQ_MODEL_STORYTELLER") or os.getenv("GROQ_MODEL") or ""
-        self.model_candidates = [m.strip() for m in env_list.split(",") if m.strip()] or [
-            "llama-3.3-70b-versatile",
-            "llama-3.1-8b-instant",
-            "mixtral-8x7b-32768"
-        ]
         self.temperature = 0.8
         self.max_tokens = 700
-        
-        self.llm = ChatGroq(
-            api_key=self.groq_api_key,
-            model=self.model_candidates[0], 
-            temperature=self.temperature,
-            max_tokens=self.max_tokens
+        self._init_groq_clients(
+            groq_api_key,
+            [m.strip() for m in env_list.split(",") if m.strip()] or list(SPEED_MAP[tier])
         )
-        self.current_model = self.model_candidates[0]
+    
+    def _max_tokens_for(
+        self,
+        length_type: Optional[str],
+        content: Optional[str] = None,
+        target_word_count: Optional[str] = None
+    ) -> int:
+        """
+        Output token cap for a story of length_type
         
-        print("Storyteller Agent initialized (Groq) with model fallback:", ", ".join(self.model_candidates))
-
-    def _invoke_with_fallback(self, messages, agent_name="storyteller"):
-        """Invoke LLM with fallback and Opik tracking"""
-        last_err = None
-        for model in self.model_candidates:
-            try:
-                start_time = time.time()
-                
-                if model != self.current_model:
-                    print(f"Switching to model: {model}")
-                    self.llm = ChatGroq(
-                        api_key=self.groq_api_key,
-                        model=model,
-                        temperature=self.temperature,
-                        max_tokens=self.max_tokens
-                    )
-                    self.current_model = model
-                
-                opik_tracer = get_opik_tracer()
-                config = {"callbacks": [opik_tracer]} if opik_tracer else {}
-                
-                response = self.llm.invoke(messages, config=config)
-                
-                latency_ms = (time.time() - start_time) * 1000
-                
-                log_llm_call(
-                    model_name=model,
-                    prompt=str(messages),
-                    completion=response.content,
-                    latency_ms=latency_ms,
-                    input_tokens=getattr(response, 'usage', {}).get('prompt_tokens'),
-                    output_tokens=getattr(response, 'usage', {}).get('completion_tokens'),
-                    metadata={
-                        "agent": agent_name,
-                        "temperature": self.temperature,
-                        "max_tokens": self.max_tokens
-                    }
-                )
-                
-                return response
-                
-            except Exception as e:
-                msg = str(e).lower()
-                last_err = e
-                print(f"⚠️ Storyteller model '{model}' failed: {e}")
-                if ("rate limit" in msg) or ("429" in msg) or ("limit" in msg and "token" in msg) or ("decommission" in msg) or ("invalid" in msg):
-                    print("↪️ Trying next Groq model due to rate limit or model issue...")
-                    continue
-                else:
-                    break
-        raise last_err if last_err else RuntimeError("All Groq models failed for storyteller")
+        An explicit target_word_count takes precedence over the length table.
+        Refinements without a known length are capped at ~1.1x the current
+        story, up to REFINEMENT_MAX_TOKENS.
+        """
+        word_count_tokens = _tokens_for(target_word_count) if target_word_count else None
+        if word_count_tokens:
+            return word_count_tokens
+        if length_type in LENGTH_TO_MAX_TOKENS:
+            return LENGTH_TO_MAX_TOKENS[length_type]
+        if content:
+            return min(int(estimate_tokens(content) * 1.1) + FORMAT_OVERHEAD_TOKENS, REFINEMENT_MAX_TOKENS)
+        return self.max_tokens
     
     def create_story(
-        self, 
-        prompt: str, 
+        self,
+        prompt: str,
         target_word_count: str,
         length_type: str,
         previous_stories: List[Dict] = None
@@ -131,34 +307,346 @@ class StorytellerAgent:
         Returns:
             Dict with 'title' and 'content' keys
         """
-        previous_context = ""
-        if previous_stories and len(previous_stories) > 0:
-            previous_context = "\n\nHere are some examples of previously created stories to match the tone and style:\n"
-            for story in previous_stories:
-                previous_context += f"\nTitle: {story['title']}\n{story['content'][:200]}...\n"
+        cached = self._lookup_cached_story(prompt, target_word_count, length_type)
+        if cached:
+            return cached
+            
+        messages = self._build_creation_messages(prompt, target_word_count, length_type, previous_stories)
+        
+        logger.info("Storyteller Agent: Creating story for '%s'...", prompt)
+        max_tokens = self._max_tokens_for(length_type, target_word_count=target_word_count)
+        response = self._invoke_with_fallback(messages, max_tokens=max_tokens)
+        
+        return self._finish_story(prompt, target_word_count, length_type, response.content)
+    
+    def create_story_stream(
+        self,
+        prompt: str,
+        target_word_count: str,
+        length_type: str,
+        previous_stories: List[Dict] = None
+    ) -> Iterator[Dict]:
+        """
+        Create a new bedtime story, yielding events as tokens arrive
+        
+        Args:
+            prompt: What the user wants the story to be about
+            target_word_count: Target range like "300-400"
+            previous_stories: List of previous stories for context
+            
+        Yields:
+            {"type": "title", "title": str} once the title line is complete
+            {"type": "story_chunk", "content": str} for each new piece of story text
+            {"type": "done", "story": {"title", "content"}} after the final parse
+        """
+        cached = self._lookup_cached_story(prompt, target_word_count, length_type)
+        if cached:
+            yield {"type": "title", "title": cached["title"]}
+            yield {"type": "story_chunk", "content": cached["content"]}
+            yield {"type": "done", "story": cached}
+            return
+        
+        messages = self._build_creation_messages(prompt, target_word_count, length_type, previous_stories)
+        
+        logger.info("Storyteller Agent: Streaming story for '%s'...", prompt)
+        parser = _StoryStreamParser()
+        max_tokens = self._max_tokens_for(length_type, target_word_count=target_word_count)
+        for text in self._stream_with_fallback(messages, max_tokens=max_tokens):
+            yield from parser.feed(text)
         
+        story = self._finish_story(prompt, target_word_count, length_type, parser.text)
+        yield {"type": "done", "story": story}
+    
+    async def astream_story(
+        self,
+        prompt: str,
+        target_word_count: str,
+        length_type: str,
+        previous_stories: List[Dict] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Async version of create_story_stream (same events), for async endpoints
+        
+        Tokens are read with ChatGroq.astream, so no worker thread is held
+        while the model is generating.
+        """
+        cached = self._lookup_cached_story(prompt, target_word_count, length_type)
+        if cached:
+            yield {"type": "title", "title": cached["title"]}
+            yield {"type": "story_chunk", "content": cached["content"]}
+            yield {"type": "done", "story": cached}
+            return
+        
+        messages = self._build_creation_messages(prompt, target_word_count, length_type, previous_stories)
+        
+        logger.info("Storyteller Agent: Streaming story for '%s' (async)...", prompt)
+        parser = _StoryStreamParser()
+        max_tokens = self._max_tokens_for(length_type, target_word_count=target_word_count)
+        async for text in self._astream_with_fallback(messages, max_tokens=max_tokens):
+            for event in parser.feed(text):
+                yield event
+        
+        story = self._finish_story(prompt, target_word_count, length_type, parser.text)
+        yield {"type": "done", "story": story}
+    
+    def _stream_with_fallback(
+        self,
+        messages,
+        agent_name="storyteller",
+        max_tokens: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Stream LLM output with fallback and Opik tracking
+        
+        Falls back to the next model only if the failure happens before the
+        first token, since partial output has already reached the caller.
+        """
+        invoke_kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+        last_err = None
+        for model in self.model_candidates:
+            for key in self._key_pool.candidates(model):
+                started = False
+                try:
+                    start_time = time.time()
+                    
+                    llm = self._client_for(model, key)
+                    
+                    parts = []
+                    usage_chunk = None
+                    for chunk in llm.stream(messages, config=self._invoke_config, **invoke_kwargs):
+                        if chunk.usage_metadata:
+                            usage_chunk = chunk
+                        if chunk.content:
+                            started = True
+                            parts.append(chunk.content)
+                            yield chunk.content
+                    
+                    latency_ms = (time.time() - start_time) * 1000
+                    
+                    if self._opik_tracer:
+                        input_tokens, output_tokens = token_usage(usage_chunk)
+                        log_llm_call_async(
+                            model_name=model,
+                            prompt=messages,
+                            completion="".join(parts),
+                            latency_ms=latency_ms,
+                            input_tokens=input_tokens,
+                            output_tokens=output_tokens,
+                            metadata={
+                                "agent": agent_name,
+                                "temperature": self.temperature,
+                                "max_tokens": max_tokens or self.max_tokens,
+                                "streaming": True
+                            }
+                        )
+                    return
+                    
+                except Exception as e:
+                    last_err = e
+                    logger.warning("⚠️ Storyteller model '%s' failed: %s", model, e)
+                    if started:
+                        raise
+                    if is_rate_limit_error(e):
+                        self._key_pool.penalize(model, key)
+                        logger.info("↪️ Trying next Groq API key or model due to rate limit...")
+                        continue
+                    if is_retryable_error(e):
+                        logger.info("↪️ Trying next Groq model due to model issue...")
+                        break
+                    raise
+                finally:
+                    self._key_pool.release(key)
+        raise last_err if last_err else RuntimeError("All Groq models failed for storyteller")
+    
+    async def _astream_with_fallback(
+        self,
+        messages,
+        agent_name="storyteller",
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Async version of _stream_with_fallback (same fallback rules)"""
+        invoke_kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+        last_err = None
+        for model in self.model_candidates:
+            for key in self._key_pool.candidates(model):
+                started = False
+                try:
+                    start_time = time.time()
+                    
+                    llm = self._client_for(model, key)
+                    
+                    parts = []
+                    usage_chunk = None
+                    async for chunk in llm.astream(messages, config=self._invoke_config, **invoke_kwargs):
+                        if chunk.usage_metadata:
+                            usage_chunk = chunk
+                        if chunk.content:
+                            started = True
+                            parts.append(chunk.content)
+                            yield chunk.content
+                    
+                    latency_ms = (time.time() - start_time) * 1000
+                    
+                    if self._opik_tracer:
+                        input_tokens, output_tokens = token_usage(usage_chunk)
+                        log_llm_call_async(
+                            model_name=model,
+                            prompt=messages,
+                            completion="".join(parts),
+                            latency_ms=latency_ms,
+                            input_tokens=input_tokens,
+                            output_tokens=output_tokens,
+                            metadata={
+                                "agent": agent_name,
+                                "temperature": self.temperature,
+                                "max_tokens": max_tokens or self.max_tokens,
+                                "streaming": True
+                            }
+                        )
+                    return
+                    
+                except Exception as e:
+                    last_err = e
+                    logger.warning("⚠️ Storyteller model '%s' failed: %s", model, e)
+                    if started:
+                        raise
+                    if is_rate_limit_error(e):
+                        self._key_pool.penalize(model, key)
+                        logger.info("↪️ Trying next Groq API key or model due to rate limit...")
+                        continue
+                    if is_retryable_error(e):
+                        logger.info("↪️ Trying next Groq model due to model issue...")
+                        break
+                    raise
+                finally:
+                    self._key_pool.release(key)
+        raise last_err if last_err else RuntimeError("All Groq models failed for storyteller")
+    
+    async def acreate_story(
+        self,
+        prompt: str,
+        target_word_count: str,
+        length_type: str,
+        previous_stories: List[Dict] = None
+    ) -> Dict[str, str]:
+        """
+        Async version of create_story (batched with concurrent calls)
+        
+        Returns:
+            Dict with 'title' and 'content' keys
+        """
+        cached = self._lookup_cached_story(prompt, target_word_count, length_type)
+        if cached:
+            return cached
+            
+        messages = self._build_creation_messages(prompt, target_word_count, length_type, previous_stories)
+        
+        logger.info("Storyteller Agent: Creating story for '%s' (async)...", prompt)
+        max_tokens = self._max_tokens_for(length_type, target_word_count=target_word_count)
+        response = await self._ainvoke_with_fallback(messages, max_tokens=max_tokens)
+        
+        return self._finish_story(prompt, target_word_count, length_type, response.content)
+    
+    def _lookup_cached_story(
+        self,
+        prompt: str,
+        target_word_count: str,
+        length_type: str
+    ) -> Optional[Dict[str, str]]:
+        """Return a cached story for this prompt and length, if any"""
+        # Modification requests embed a whole story, so near-identical text
+        # can still ask for very different changes - never serve those from cache
+        if not FeatureFlags.ENABLE_STORY_CACHING or StoryMarkers.MODIFY in prompt:
+            return None
+            
+        cached = _STORY_CACHE.lookup(prompt, namespace=f"{length_type}|{target_word_count}")
+        if cached:
+            logger.info("Storyteller Agent: Cache hit for '%s'", prompt)
+            return dict(cached)
+        return None
+    
+    def _build_creation_messages(
+        self,
+        prompt: str,
+        target_word_count: str,
+        length_type: str,
+        previous_stories: Optional[List[Dict]]
+    ) -> List:
+        """Build the system + user messages for story creation"""
         # Get system prompt from prompts module
         system_prompt = StorytellerPrompts.get_system_prompt()
         
-        # Get user prompt from prompts module
+        # Get user prompt from prompts module, first without context to size it
         user_prompt = StorytellerPrompts.get_story_creation_prompt(
             prompt=prompt,
             target_word_count=target_word_count,
-            length_type=length_type,
-            previous_context=previous_context
+            length_type=length_type
         )
         
-        # Send messages to the LLM
-        messages = [
-            SystemMessage(content=system_prompt),
+        token_budget = (
+            PROMPT_TOKEN_BUDGET - self._max_tokens_for(length_type, target_word_count=target_word_count)
+            - estimate_tokens(system_prompt) - estimate_tokens(user_prompt)
+        )
+        previous_context = self._build_previous_context(prompt, previous_stories, token_budget)
+        if previous_context:
+            user_prompt = StorytellerPrompts.get_story_creation_prompt(
+                prompt=prompt,
+                target_word_count=target_word_count,
+                length_type=length_type,
+                previous_context=previous_context
+            )
+        
+        return [
+            _system_message(system_prompt),
             HumanMessage(content=user_prompt)
         ]
+    
+    def _build_previous_context(
+        self,
+        prompt: str,
+        previous_stories: Optional[List[Dict]],
+        token_budget: Optional[int] = None
+    ) -> str:
+        """
+        Excerpts of the previous stories most relevant to prompt, for tone and style
         
-        print(f"Storyteller Agent: Creating story for '{prompt}'...")
-        response = self._invoke_with_fallback(messages)
+        Args:
+            prompt: The new story request
+            previous_stories: Previously saved stories
+            token_budget: Estimated tokens the context may use; the least
+                relevant excerpts are dropped until it fits
+        """
+        if not previous_stories:
+            return ""
+            
+        remaining = None if token_budget is None else token_budget - estimate_tokens(PREVIOUS_CONTEXT_HEADER)
+        parts = [PREVIOUS_CONTEXT_HEADER]
+        for story in _rank_by_similarity(prompt, previous_stories):
+            entry, tokens = _story_excerpt(story['title'], story['content'])
+            if remaining is not None:
+                if tokens > remaining:
+                    break
+                remaining -= tokens
+            parts.append(entry)
+            
+        if len(parts) == 1:
+            return ""
+        return "".join(parts)[:PREVIOUS_CONTEXT_MAX_CHARS]
+    
+    def _finish_story(
+        self,
+        prompt: str,
+        target_word_count: str,
+        length_type: str,
+        response_text: str
+    ) -> Dict[str, str]:
+        """Parse the LLM response and cache the resulting story"""
+        story = self._parse_story_response(response_text)
         
-        # Parse the response to extract title and story
-        return self._parse_story_response(response.content)
+        if FeatureFlags.ENABLE_STORY_CACHING and StoryMarkers.MODIFY not in prompt:
+            _STORY_CACHE.store(prompt, dict(story), namespace=f"{length_type}|{target_word_count}")
+            
+        return story
     
     def refine_story(
         self,
@@ -178,6 +666,70 @@ class StorytellerAgent:
         Returns:
             Dict with improved 'title' and 'content'
         """
+        messages = self._build_refinement_messages(title, content, feedback, length_type)
+        
+        logger.info("Storyteller Agent: Refining story based on feedback...")
+        response = self._invoke_with_fallback(messages, max_tokens=self._max_tokens_for(length_type, content))
+        
+        return self._parse_story_response(response.content)
+    
+    async def arefine_story(
+        self,
+        title: str,
+        content: str,
+        feedback: str,
+        length_type: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Async version of refine_story (batched with concurrent calls)
+        
+        Returns:
+            Dict with improved 'title' and 'content'
+        """
+        messages = self._build_refinement_messages(title, content, feedback, length_type)
+        
+        logger.info("Storyteller Agent: Refining story based on feedback (async)...")
+        response = await self._ainvoke_with_fallback(messages, max_tokens=self._max_tokens_for(length_type, content))
+        
+        return self._parse_story_response(response.content)
+    
+    def refine_candidates(
+        self,
+        title: str,
+        content: str,
+        feedback: str,
+        length_type: Optional[str] = None,
+        count: int = 2
+    ) -> List[Dict[str, str]]:
+        """
+        Write several refinement drafts at once
+        
+        The requests skip the response cache (identical prompts would get
+        the same draft) and go out together in one blocking batch call, so
+        the candidates run concurrently on the shared sync HTTP client.
+        Sampling at the storyteller's temperature makes the drafts differ.
+        
+        Args:
+            count: Number of drafts to request
+            
+        Returns:
+            List of drafts that succeeded (at least one)
+        """
+        messages = self._build_refinement_messages(title, content, feedback, length_type)
+        max_tokens = self._max_tokens_for(length_type, content)
+        
+        logger.info("Storyteller Agent: Writing %s refinement drafts concurrently...", count)
+        responses = self._batch_with_fallback([messages] * count, max_tokens=max_tokens)
+        return [self._parse_story_response(r.content) for r in responses]
+    
+    def _build_refinement_messages(
+        self,
+        title: str,
+        content: str,
+        feedback: str,
+        length_type: Optional[str]
+    ) -> List:
+        """Build the system + user messages for story refinement"""
         system_prompt = StorytellerPrompts.get_refinement_system_prompt()
         user_prompt = StorytellerPrompts.get_refinement_prompt(
             title=title,
@@ -186,15 +738,10 @@ class StorytellerAgent:
             length_type=length_type
         )
         
-        messages = [
-            SystemMessage(content=system_prompt),
+        return [
+            _system_message(system_prompt),
             HumanMessage(content=user_prompt)
         ]
-        
-        print(f"Storyteller Agent: Refining story based on feedback...")
-        response = self._invoke_with_fallback(messages)
-        
-        return self._parse_story_response(response.content)
     
     def _parse_story_response(self, response_text: str) -> Dict[str, str]:
         """
@@ -204,10 +751,10 @@ class StorytellerAgent:
         TITLE: [title]
         STORY: [content]
         
-        This function extracts those parts using regex
+        This function extracts those parts using the precompiled patterns
         """
-        title_match = re.search(r'TITLE:\s*(.+?)\n', response_text, re.IGNORECASE)
-        story_match = re.search(r'STORY:\s*([\s\S]+)', response_text, re.IGNORECASE)
+        title_match = _TITLE_RE.search(response_text)
+        story_match = _STORY_RE.search(response_text)
         
         title = title_match.group(1).strip() if title_match else "A Bedtime Story"
         content = story_match.group(1).strip() if story_match else response_text
@@ -218,7 +765,7 @@ class StorytellerAgent:
         }
 
 
-class JudgeAgent:
+class JudgeAgent(GroqFallbackMixin):
     """
     The Judge Agent evaluates story quality and provides feedback
     
@@ -228,101 +775,57 @@ class JudgeAgent:
     - Age Appropriateness: Is it suitable for 5-10 year-olds?
     """
     
-    def __init__(self, groq_api_key: str, langsmith_api_key: Optional[str] = None):
+    AGENT_NAME = "judge"
+    
+    def __init__(
+        self,
+        groq_api_key: str,
+        langsmith_api_key: Optional[str] = None,
+        tier: str = AGENT_TIERS["judge"]
+    ):
         """
         Initialize the Judge Agent
         
         Args:
             groq_api_key: API key for Groq LLM service
             langsmith_api_key: Optional API key for LangSmith tracing
+            tier: SPEED_MAP tier used when GROQ_MODEL_JUDGE is not set
         """
         # Configure LangSmith if available
         if langsmith_api_key:
             os.environ["LANGSMITH_API_KEY"] = langsmith_api_key
             os.environ["LANGCHAIN_TRACING_V2"] = "true"
             os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGSMITH_PROJECT", "bedtime-stories")
-        
-        self.groq_api_key = groq_api_key
+            
         env_list = os.getenv("GROQ_MODEL_JUDGE") or os.getenv("GROQ_MODEL") or ""
-        self.model_candidates = [m.strip() for m in env_list.split(",") if m.strip()] or [
-            "llama-3.3-70b-versatile",
-            "llama-3.1-8b-instant",
-            "mixtral-8x7b-32768"
-        ]
         self.temperature = 0.3
         self.max_tokens = 300
-        
-        self.llm = ChatGroq(
-            api_key=self.groq_api_key,
-            model=self.model_candidates[0],  
-            temperature=self.temperature,
-            max_tokens=self.max_tokens
+        # JSON mode: the judge returns structured scores instead of free text
+        self.model_kwargs = {"response_format": {"type": "json_object"}}
+        self._init_groq_clients(
+            groq_api_key,
+            [m.strip() for m in env_list.split(",") if m.strip()] or list(SPEED_MAP[tier]),
+            model_kwargs=self.model_kwargs
         )
-        self.current_model = self.model_candidates[0]
-        
-        print("Judge Agent initialized (Groq) with model fallback:", ", ".join(self.model_candidates))
-
-    def _invoke_with_fallback(self, messages):
-        """Invoke LLM with fallback and Opik tracking"""
-        last_err = None
-        for model in self.model_candidates:
-            try:
-                start_time = time.time()
-                
-                if model != self.current_model:
-                    print(f"🔄 Judge switching to model: {model}")
-                    self.llm = ChatGroq(
-                        api_key=self.groq_api_key,
-                        model=model,
-                        temperature=self.temperature,
-                        max_tokens=self.max_tokens
-                    )
-                    self.current_model = model
-                
-                # Get Opik tracer for automatic LangChain integration
-                opik_tracer = get_opik_tracer()
-                config = {"callbacks": [opik_tracer]} if opik_tracer else {}
-                
-                # Invoke with Opik tracing
-                response = self.llm.invoke(messages, config=config)
-                
-                latency_ms = (time.time() - start_time) * 1000
-                
-                # Log to Opik for performance tracking
-                log_llm_call(
-                    model_name=model,
-                    prompt=str(messages),
-                    completion=response.content,
-                    latency_ms=latency_ms,
-                    input_tokens=getattr(response, 'usage', {}).get('prompt_tokens'),
-                    output_tokens=getattr(response, 'usage', {}).get('completion_tokens'),
-                    metadata={
-                        "agent": "judge",
-                        "temperature": self.temperature,
-                        "max_tokens": self.max_tokens
-                    }
-                )
-                
-                return response
-                
-            except Exception as e:
-                msg = str(e).lower()
-                last_err = e
-                print(f"⚠️ Judge model '{model}' failed: {e}")
-                if ("rate limit" in msg) or ("429" in msg) or ("limit" in msg and "token" in msg) or ("decommission" in msg) or ("invalid" in msg):
-                    print("↪️ Trying next Groq model due to rate limit or model issue...")
-                    continue
-                else:
-                    break
-        raise last_err if last_err else RuntimeError("All Groq models failed for judge")
     
-    def evaluate_story(self, title: str, content: str) -> Dict:
+    def evaluate_story(
+        self,
+        title: str,
+        content: str,
+        target_word_count: Optional[str] = None,
+        target_paragraphs: Optional[int] = None
+    ) -> Dict:
         """
         Evaluate a story's quality across multiple dimensions
         
+        Stories that fail the local pre-checks (see _local_prechecks) are
+        scored without calling the LLM.
+        
         Args:
             title: Story title
             content: Story content
+            target_word_count: Optional word range like "150-220" to check
+            target_paragraphs: Optional paragraph count to check
             
         Returns:
             Dict containing scores and feedback:
@@ -335,41 +838,265 @@ class JudgeAgent:
                 'feedback': str
             }
         """
+        failed = self._local_prechecks(title, content, target_word_count, target_paragraphs)
+        if failed:
+            return failed
+            
+        cache_key = content_hash(title, content)
+        cached = self._lookup_cached_evaluation(cache_key, title)
+        if cached:
+            return cached
+            
+        messages = self._build_evaluation_messages(title, content)
+        
+        logger.info("Judge Agent: Evaluating story '%s'...", title)
+        response = self._invoke_with_fallback(messages)
+        
+        return self._finish_evaluation(cache_key, response.content)
+    
+    async def aevaluate_story(
+        self,
+        title: str,
+        content: str,
+        target_word_count: Optional[str] = None,
+        target_paragraphs: Optional[int] = None
+    ) -> Dict:
+        """
+        Async version of evaluate_story (batched with concurrent calls)
+        
+        Returns:
+            Dict containing scores and feedback (see evaluate_story)
+        """
+        failed = self._local_prechecks(title, content, target_word_count, target_paragraphs)
+        if failed:
+            return failed
+            
+        cache_key = content_hash(title, content)
+        cached = self._lookup_cached_evaluation(cache_key, title)
+        if cached:
+            return cached
+            
+        messages = self._build_evaluation_messages(title, content)
+        
+        logger.info("Judge Agent: Evaluating story '%s' (async)...", title)
+        response = await self._ainvoke_with_fallback(messages)
+        
+        return self._finish_evaluation(cache_key, response.content)
+    
+    def evaluate_stories(self, stories: List[Dict]) -> List[Dict]:
+        """
+        Evaluate several stories with one LLM call
+        
+        The judge instructions are sent once for the whole batch instead of
+        once per story. Cached evaluations are reused, and if the response
+        does not contain one evaluation per story, each story is evaluated
+        separately.
+        
+        Args:
+            stories: List of dicts with 'title' and 'content'
+            
+        Returns:
+            List of evaluation dicts (see evaluate_story), in input order
+        """
+        cache_keys = [content_hash(s['title'], s['content']) for s in stories]
+        evaluations = [self._lookup_cached_evaluation(k, s['title']) for k, s in zip(cache_keys, stories)]
+        pending = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+        
+        if len(pending) == 1:
+            i = pending[0]
+            evaluations[i] = self.evaluate_story(stories[i]['title'], stories[i]['content'])
+        elif pending:
+            messages = [
+                _system_message(JudgePrompts.get_system_prompt()),
+                HumanMessage(content=JudgePrompts.get_batch_evaluation_prompt([stories[i] for i in pending]))
+            ]
+            
+            logger.info("Judge Agent: Evaluating %s stories in one call...", len(pending))
+            response = self._invoke_with_fallback(messages, max_tokens=self.max_tokens * len(pending))
+            parsed = self._parse_batch_evaluation(response.content, len(pending))
+            
+            for n, i in enumerate(pending):
+                if parsed is None:
+                    evaluations[i] = self.evaluate_story(stories[i]['title'], stories[i]['content'])
+                else:
+                    evaluations[i] = parsed[n]
+                    if FeatureFlags.ENABLE_STORY_CACHING:
+                        _cache_evaluation(cache_keys[i], parsed[n])
+        
+        return evaluations
+    
+    def _local_prechecks(
+        self,
+        title: str,
+        content: str,
+        target_word_count: Optional[str] = None,
+        target_paragraphs: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Deterministic checks that need no LLM
+        
+        A story with unsafe words, a word count far outside the target range,
+        sentences too long or too choppy for young readers, or the wrong
+        number of paragraphs needs another pass whatever the judge would
+        say, so it gets a failing evaluation right away.
+        
+        Returns:
+            Failing evaluation dict (see evaluate_story), or None if all checks pass
+        """
+        problems = []
+        age_appropriateness = QualityMetrics.MIN_AGE_APPROPRIATENESS_SCORE - 1
+        
+        unsafe = sorted({m.group(0).lower() for m in _UNSAFE_WORDS_RE.finditer(content)})
+        if unsafe:
+            problems.append(f"Remove words that are not suitable for bedtime: {', '.join(unsafe)}.")
+            age_appropriateness = QualityMetrics.MIN_SCORE
+            
+        word_range = _word_range(target_word_count)
+        if word_range:
+            words = count_words(content)
+            tolerance = QualityMetrics.WORD_COUNT_TOLERANCE
+            if words < word_range[0] * (1 - tolerance):
+                problems.append(f"The story is too short ({words} words); aim for {target_word_count} words.")
+            elif words > word_range[1] * (1 + tolerance):
+                problems.append(f"The story is too long ({words} words); aim for {target_word_count} words.")
+                
+        sentence_lengths = sentence_word_counts(content)
+        if sentence_lengths:
+            longest = max(sentence_lengths)
+            average = sum(sentence_lengths) / len(sentence_lengths)
+            if longest > QualityMetrics.MAX_SENTENCE_WORDS:
+                problems.append(
+                    f"Split long sentences (one has {longest} words); keep each under "
+                    f"{QualityMetrics.MAX_SENTENCE_WORDS} words."
+                )
+            elif average < QualityMetrics.MIN_AVERAGE_SENTENCE_WORDS:
+                problems.append("Join very short, choppy sentences into smoother ones.")
+                
+        if target_paragraphs:
+            paragraphs = count_paragraphs(content)
+            if paragraphs != target_paragraphs:
+                problems.append(
+                    f"Use exactly {target_paragraphs} paragraphs separated by blank lines (found {paragraphs})."
+                )
+                
+        if not problems:
+            return None
+            
+        logger.info("Judge Agent: '%s' failed local checks, skipping LLM evaluation", title)
+        below_pass = QualityMetrics.MIN_OVERALL_SCORE - 1
+        return {
+            "clarity": below_pass,
+            "moralValue": below_pass,
+            "ageAppropriateness": age_appropriateness,
+            "score": min(below_pass, age_appropriateness),
+            "approved": False,
+            "feedback": " ".join(problems)
+        }
+    
+    def _lookup_cached_evaluation(self, cache_key: str, title: str) -> Optional[Dict]:
+        """Return a cached evaluation for this exact story, if any"""
+        # Evaluation runs at low temperature, so an exact match is a safe reuse
+        if not FeatureFlags.ENABLE_STORY_CACHING:
+            return None
+            
+        cached = _EVALUATION_CACHE.get(cache_key)
+        if cached:
+            logger.info("Judge Agent: Cache hit for '%s'", title)
+            return dict(cached)
+        
+        cached = _EVALUATION_DISK_CACHE.get(cache_key)
+        if cached:
+            logger.info("Judge Agent: Disk cache hit for '%s'", title)
+            _EVALUATION_CACHE.set(cache_key, dict(cached))
+            return cached
+        return None
+    
+    def _build_evaluation_messages(self, title: str, content: str) -> List:
+        """Build the system + user messages for evaluation"""
         system_prompt = JudgePrompts.get_system_prompt()
         user_prompt = JudgePrompts.get_evaluation_prompt(title=title, content=content)
         
-        messages = [
-            SystemMessage(content=system_prompt),
+        return [
+            _system_message(system_prompt),
             HumanMessage(content=user_prompt)
         ]
+    
+    def _finish_evaluation(self, cache_key: str, response_text: str) -> Dict:
+        """Parse the judge's response and cache the evaluation"""
+        evaluation = self._parse_evaluation(response_text)
         
-        print(f"Judge Agent: Evaluating story '{title}'...")
-        response = self._invoke_with_fallback(messages)
-        
-        # Parse the judge's response
-        return self._parse_evaluation(response.content)
+        if FeatureFlags.ENABLE_STORY_CACHING:
+            _cache_evaluation(cache_key, evaluation)
+            
+        return evaluation
     
     def _parse_evaluation(self, response_text: str) -> Dict:
         """
         Parse judge's evaluation response
         
-        Extracts numerical scores and feedback from the structured response
+        The judge runs in JSON mode; if a model returns malformed JSON the
+        older CLARITY:/MORAL:/... text format is parsed instead. A surrounding
+        markdown code fence (outside JSON mode) is ignored.
         """
-        # Extract scores using regex
-        clarity_match = re.search(r'CLARITY:\s*(\d+)', response_text, re.IGNORECASE)
-        moral_match = re.search(r'MORAL:\s*(\d+)', response_text, re.IGNORECASE)
-        age_match = re.search(r'AGE_APPROPRIATE:\s*(\d+)', response_text, re.IGNORECASE)
-        overall_match = re.search(r'OVERALL:\s*(\d+)', response_text, re.IGNORECASE)
-        approved_match = re.search(r'APPROVED:\s*(YES|NO)', response_text, re.IGNORECASE)
-        feedback_match = re.search(r'FEEDBACK:\s*([\s\S]+)', response_text, re.IGNORECASE)
+        try:
+            return self._evaluation_from_json(json.loads(_CODE_FENCE_RE.sub("", response_text)))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning("⚠️ Judge returned invalid JSON (%s), parsing as text", e)
+            return self._parse_evaluation_text(response_text)
+    
+    def _parse_batch_evaluation(self, response_text: str, count: int) -> Optional[List[Dict]]:
+        """Parse a batch evaluation; None unless it holds exactly count evaluations"""
+        try:
+            items = json.loads(response_text)["evaluations"]
+            if len(items) != count:
+                raise ValueError(f"expected {count} evaluations, got {len(items)}")
+            return [self._evaluation_from_json(item) for item in items]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning("⚠️ Judge returned an invalid batch evaluation (%s), evaluating stories one by one", e)
+            return None
+    
+    def _evaluation_from_json(self, data: Dict) -> Dict:
+        """Convert one JSON evaluation object to the evaluation dict"""
+        approved = data["approved"]
+        if isinstance(approved, str):
+            approved = approved.strip().upper() in ("YES", "TRUE")
+        
+        return {
+            "clarity": int(data["clarity"]),
+            "moralValue": int(data["moralValue"]),
+            "ageAppropriateness": int(data["ageAppropriateness"]),
+            "score": int(data["score"]),
+            "approved": bool(approved),
+            "feedback": str(data.get("feedback") or "Story evaluated.")
+        }
+    
+    def _parse_evaluation_text(self, response_text: str) -> Dict:
+        """
+        Parse a plain-text evaluation response
+        
+        Extracts numerical scores and feedback from the CLARITY:/MORAL:/... format
+        """
+        # Single pass over the lines; FEEDBACK runs to the end of the text
+        fields = {}
+        lines = response_text.splitlines()
+        for i, line in enumerate(lines):
+            key, sep, value = line.partition(":")
+            if not sep:
+                continue
+            key = key.strip(" \t*-#").upper()
+            if key in _EVALUATION_SCORE_KEYS or key == "APPROVED":
+                fields[key] = value.strip()
+            elif key == "FEEDBACK":
+                fields[key] = "\n".join([value.strip(), *lines[i + 1:]]).strip()
+                break
         
         # Parse scores (default to 7 if not found)
-        clarity = int(clarity_match.group(1)) if clarity_match else 7
-        moral = int(moral_match.group(1)) if moral_match else 7
-        age_appropriate = int(age_match.group(1)) if age_match else 7
-        overall = int(overall_match.group(1)) if overall_match else 7
-        approved = approved_match.group(1).upper() == "YES" if approved_match else False
-        feedback = feedback_match.group(1).strip() if feedback_match else "Story evaluated."
+        clarity = _leading_int(fields.get("CLARITY"), 7)
+        moral = _leading_int(fields.get("MORAL"), 7)
+        age_appropriate = _leading_int(fields.get("AGE_APPROPRIATE"), 7)
+        overall = _leading_int(fields.get("OVERALL"), 7)
+        approved = fields.get("APPROVED", "").strip(" *").upper().startswith("YES")
+        feedback = fields.get("FEEDBACK") or "Story evaluated."
         
         return {
             "clarity": clarity,
@@ -379,3 +1106,135 @@ class JudgeAgent:
             "approved": approved,
             "feedback": feedback
         }
+
+
+class Orchestrator:
+    """
+    Creates a story and scores it with one LLM request
+    
+    The usual flow is storyteller -> judge, two sequential round-trips with
+    their own time-to-first-token. For a first draft the orchestrator asks
+    one model to write the story and then evaluate it in the judge's
+    JSON format. Refinement rounds still use the separate
+    agents, and if the evaluation section is missing the judge is called.
+    """
+    
+    def __init__(self, storyteller: StorytellerAgent, judge: JudgeAgent):
+        """
+        Initialize the Orchestrator
+        
+        Args:
+            storyteller: Agent used for the combined request and story parsing
+            judge: Agent used for evaluation parsing and the two-call fallback
+        """
+        self.storyteller = storyteller
+        self.judge = judge
+    
+    def create_and_evaluate(
+        self,
+        prompt: str,
+        target_word_count: str,
+        length_type: str,
+        previous_stories: List[Dict] = None,
+        target_paragraphs: Optional[int] = None
+    ) -> Dict:
+        """
+        Create a new story and evaluate it
+        
+        The judge's local pre-checks run on the story first; if one fails,
+        its failing evaluation replaces the model's self-score.
+        
+        Args:
+            prompt: What the user wants the story to be about
+            target_word_count: Target range like "300-400"
+            length_type: "short", "medium", or "long"
+            previous_stories: List of previous stories for context
+            target_paragraphs: Optional paragraph count to check
+            
+        Returns:
+            Dict with 'title', 'content' and 'evaluation' (same shape as
+            JudgeAgent.evaluate_story)
+        """
+        cached = self.storyteller._lookup_cached_story(prompt, target_word_count, length_type)
+        if cached:
+            cached["evaluation"] = self.judge.evaluate_story(
+                cached["title"], cached["content"], target_word_count, target_paragraphs
+            )
+            return cached
+            
+        user_prompt = OrchestratorPrompts.get_create_and_evaluate_prompt(
+            prompt=prompt,
+            target_word_count=target_word_count,
+            length_type=length_type,
+            previous_context=self.storyteller._build_previous_context(prompt, previous_stories)
+        )
+        messages = [
+            _system_message(OrchestratorPrompts.get_system_prompt()),
+            HumanMessage(content=user_prompt)
+        ]
+        
+        logger.info("Orchestrator: Creating and evaluating story for '%s'...", prompt)
+        response = self.storyteller._invoke_with_fallback(
+            messages,
+            agent_name="orchestrator",
+            max_tokens=self.storyteller._max_tokens_for(length_type, target_word_count=target_word_count) + EVALUATION_MAX_TOKENS
+        )
+        
+        story_text, separator, evaluation_text = response.content.partition(
+            OrchestratorPrompts.EVALUATION_SEPARATOR
+        )
+        story = self.storyteller._finish_story(prompt, target_word_count, length_type, story_text)
+        
+        failed = self.judge._local_prechecks(
+            story["title"], story["content"], target_word_count, target_paragraphs
+        )
+        if failed:
+            evaluation = failed
+        elif separator:
+            evaluation = self.judge._parse_evaluation(evaluation_text.strip())
+            if FeatureFlags.ENABLE_STORY_CACHING:
+                _cache_evaluation(content_hash(story["title"], story["content"]), evaluation)
+        else:
+            logger.warning("⚠️ Orchestrator: No evaluation in response, asking the judge")
+            evaluation = self.judge.evaluate_story(story["title"], story["content"])
+            
+        return {**story, "evaluation": evaluation}
+    
+    async def acreate_then_evaluate(
+        self,
+        prompt: str,
+        target_word_count: str,
+        length_type: str,
+        previous_stories: List[Dict] = None
+    ) -> Dict:
+        """
+        Create a story and evaluate it with the agents' async (batched) calls
+        
+        Returns:
+            Dict with 'title', 'content' and 'evaluation'
+        """
+        story = await self.storyteller.acreate_story(prompt, target_word_count, length_type, previous_stories)
+        story["evaluation"] = await self.judge.aevaluate_story(
+            story["title"], story["content"], target_word_count
+        )
+        return story
+    
+    async def acreate_many(
+        self,
+        prompts: List[str],
+        target_word_count: str,
+        length_type: str
+    ) -> List[Dict]:
+        """
+        Create and evaluate several stories concurrently
+        
+        The Groq calls overlap (and are micro-batched), so the total time is
+        roughly that of the slowest story rather than the sum.
+        
+        Returns:
+            One result per prompt, in order (see acreate_then_evaluate)
+        """
+        return await asyncio.gather(*[
+            self.acreate_then_evaluate(prompt, target_word_count, length_type)
+            for prompt in prompts
+        ])
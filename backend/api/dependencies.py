@@ -5,11 +5,14 @@ Provides dependency injection for agents and services.
 This centralizes agent initialization and makes testing easier.
 """
 
+import asyncio
+import threading
 from functools import lru_cache
+from fastapi import HTTPException
 from agents import StorytellerAgent, JudgeAgent
 from conversational_agent import ConversationalAgent
 from storage import storage
-from config import settings
+from config import settings, HTTPStatus, APIMessages
 from utils import setup_logger
 
 logger = setup_logger(__name__)
@@ -21,6 +24,10 @@ _conversational_agent = None
 _storyteller_agent = None
 _judge_agent = None
 
+# Guards first construction so concurrent cold requests (agents are also
+# built from worker threads) never create an agent twice
+_agent_init_lock = threading.Lock()
+
 
 def get_conversational_agent() -> ConversationalAgent:
     """
@@ -31,11 +38,13 @@ def get_conversational_agent() -> ConversationalAgent:
     """
     global _conversational_agent
     if _conversational_agent is None:
-        logger.info("🤖 Initializing ConversationalAgent...")
-        _conversational_agent = ConversationalAgent(
-            groq_api_key=settings.api.GROQ_API_KEY,
-            langsmith_api_key=settings.api.LANGSMITH_API_KEY
-        )
+        with _agent_init_lock:
+            if _conversational_agent is None:
+                logger.info("🤖 Initializing ConversationalAgent...")
+                _conversational_agent = ConversationalAgent(
+                    groq_api_key=settings.api.GROQ_API_KEY,
+                    langsmith_api_key=settings.api.LANGSMITH_API_KEY
+                )
     return _conversational_agent
 
 
@@ -48,11 +57,13 @@ def get_storyteller_agent() -> StorytellerAgent:
     """
     global _storyteller_agent
     if _storyteller_agent is None:
-        logger.info("📖 Initializing StorytellerAgent...")
-        _storyteller_agent = StorytellerAgent(
-            groq_api_key=settings.api.GROQ_API_KEY,
-            langsmith_api_key=settings.api.LANGSMITH_API_KEY
-        )
+        with _agent_init_lock:
+            if _storyteller_agent is None:
+                logger.info("📖 Initializing StorytellerAgent...")
+                _storyteller_agent = StorytellerAgent(
+                    groq_api_key=settings.api.GROQ_API_KEY,
+                    langsmith_api_key=settings.api.LANGSMITH_API_KEY
+                )
     return _storyteller_agent
 
 
@@ -65,14 +76,77 @@ def get_judge_agent() -> JudgeAgent:
     """
     global _judge_agent
     if _judge_agent is None:
-        logger.info("⚖️ Initializing JudgeAgent...")
-        _judge_agent = JudgeAgent(
-            groq_api_key=settings.api.GROQ_API_KEY,
-            langsmith_api_key=settings.api.LANGSMITH_API_KEY
-        )
+        with _agent_init_lock:
+            if _judge_agent is None:
+                logger.info("⚖️ Initializing JudgeAgent...")
+                _judge_agent = JudgeAgent(
+                    groq_api_key=settings.api.GROQ_API_KEY,
+                    langsmith_api_key=settings.api.LANGSMITH_API_KEY
+                )
     return _judge_agent
 
 
+def init_agents() -> None:
+    """
+    Create all agent singletons up front.
+    
+    Called from the application lifespan so client and model setup is paid
+    at boot instead of by the first request. The getters above still
+    create agents lazily if this was skipped or failed.
+    """
+    get_conversational_agent()
+    get_storyteller_agent()
+    get_judge_agent()
+
+
+# ===== LLM Admission Control =====
+
+# Bounds requests doing Groq work at once. Past the limit new requests are
+# turned away immediately instead of queueing into a wall of 429s.
+_LLM_SLOTS = asyncio.Semaphore(settings.api.MAX_CONCURRENT_LLM_REQUESTS)
+
+
+async def try_acquire_llm_slot() -> bool:
+    """
+    Take an LLM slot without waiting.
+    
+    Returns:
+        True if a slot was taken (release it with release_llm_slot)
+    """
+    if _LLM_SLOTS.locked():
+        logger.warning("🚦 All LLM slots busy, rejecting request")
+        return False
+    await _LLM_SLOTS.acquire()
+    return True
+
+
+def release_llm_slot() -> None:
+    """Return a slot taken with try_acquire_llm_slot."""
+    _LLM_SLOTS.release()
+
+
+async def llm_slot():
+    """
+    Hold an LLM slot for the duration of a request.
+    
+    Use as a route dependency for non-streaming LLM routes; streaming
+    routes take the slot inside their generator instead.
+    
+    Raises:
+        HTTPException: 503 when every slot is taken
+    """
+    if not await try_acquire_llm_slot():
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail=APIMessages.SERVER_BUSY,
+            headers={"Retry-After": "1"}
+        )
+    try:
+        yield
+    finally:
+        release_llm_slot()
+
+
 @lru_cache()
 def get_database():
     """
@@ -0,0 +1,42 @@
+"""
+API Responses Module
+
+Shared response classes and helpers for JSON routes.
+"""
+
+import hashlib
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from config import HTTPStatus
+
+try:
+    import orjson  # noqa: F401 - ORJSONResponse needs it at render time
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    from fastapi.responses import JSONResponse as DefaultResponse
+
+
+def etag_json_response(request: Request, payload: dict) -> Response:
+    """
+    Serialize payload once and answer repeat polls with 304 Not Modified.
+    
+    Returning the response directly skips FastAPI's jsonable_encoder pass;
+    the ETag is a short hash of the serialized body.
+    
+    Args:
+        request: Incoming request (for If-None-Match)
+        payload: JSON-safe dict to return
+        
+    Returns:
+        JSON response with an ETag header, or an empty 304 response
+    """
+    response = DefaultResponse(payload)
+    etag = f'"{hashlib.blake2b(response.body, digest_size=8).hexdigest()}"'
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+        
+    response.headers["ETag"] = etag
+    return response
@@ -5,18 +5,42 @@ Handles text-to-speech audio generation.
 """
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
-from io import BytesIO
+from pathlib import Path
+from typing import Iterator, List, Optional
+import asyncio
+import os
 import re
+import tempfile
 
 from gtts import gTTS
-from utils import setup_logger
-from config import HTTPStatus, APIMessages, TextLimits
+from cache import TTLCache, content_hash
+from utils import setup_logger, run_blocking
+from config import HTTPStatus, APIMessages, TextLimits, CacheConfig
 
 logger = setup_logger(__name__)
 
+# Syntheses by (lang, slow, text), shared while running and replayed after
+_TTS_SYNTHESES = TTLCache(maxsize=CacheConfig.TTS_CACHE_SIZE, ttl=CacheConfig.TTS_CACHE_TTL_SECONDS)
+
+# Content-addressed MP3 files that survive restarts
+_TTS_DISK_DIR = Path(__file__).resolve().parents[2] / CacheConfig.TTS_DISK_CACHE_DIR
+
+# Keep proxies (e.g. nginx) from buffering the MP3 stream until it ends
+_STREAM_HEADERS = {"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+
+# Segments synthesized ahead of playback (first one kept short for fast start)
+TTS_FIRST_SEGMENT_CHARS = 700
+TTS_SEGMENT_CHARS = 4000
+TTS_PARALLEL_SEGMENTS = 3
+
+# Speech normalization patterns, compiled once
+_WHITESPACE_RE = re.compile(r"\s+")
+_MISSING_SPACE_RE = re.compile(r"([\.!?])([^ \n])")
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+_SENTENCE_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+")
+
 router = APIRouter(prefix="/api", tags=["audio"])
 
 
@@ -42,17 +66,165 @@ def normalize_text_for_speech(text: str) -> str:
         Normalized text suitable for TTS
     """
     # Normalize whitespace
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _WHITESPACE_RE.sub(" ", text).strip()
     
     # Add space after punctuation if missing
-    text = re.sub(r"([\.!?])([^ \n])", r"\1 \2", text)
+    text = _MISSING_SPACE_RE.sub(r"\1 \2", text)
     
     # Replace paragraph breaks with pauses
-    text = re.sub(r"\n\s*\n", ". . . ", text)
+    text = _PARAGRAPH_BREAK_RE.sub(". . . ", text)
     
     return text
 
 
+def chunk_for_tts(
+    text: str,
+    first_limit: int = TTS_FIRST_SEGMENT_CHARS,
+    limit: int = TTS_SEGMENT_CHARS
+) -> List[str]:
+    """
+    Split normalized text into sentence groups for progressive synthesis.
+    
+    The first group is kept short so its audio is ready quickly; later
+    groups are larger. A sentence longer than the limit forms its own group
+    (gTTS splits it further internally).
+    
+    Args:
+        text: Normalized text
+        first_limit: Max characters of the first group
+        limit: Max characters of later groups
+        
+    Returns:
+        Non-empty list of text segments, in order
+    """
+    segments: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_BOUNDARY_RE.split(text):
+        cap = limit if segments else first_limit
+        if current and len(current) + 1 + len(sentence) > cap:
+            segments.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current or not segments:
+        segments.append(current)
+    return segments
+
+
+def _synthesize_segment(text: str, lang: str, slow: bool) -> List[bytes]:
+    """Synthesize one segment completely (blocking)"""
+    return list(gTTS(text=text, lang=lang, slow=slow).stream())
+
+
+def _write_disk_cache(path: Path, chunks: List[bytes]) -> None:
+    """
+    Atomically write a finished MP3 to the disk cache, then enforce its size cap.
+    
+    Args:
+        path: Target file
+        chunks: MP3 chunks in order
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+        for chunk in chunks:
+            tmp.write(chunk)
+    os.replace(tmp.name, path)
+    
+    # Evict least recently played files (mtime is refreshed on every hit)
+    files = [(f.stat(), f) for f in path.parent.glob("*.mp3")]
+    total = sum(st.st_size for st, _ in files)
+    for st, f in sorted(files, key=lambda item: item[0].st_mtime):
+        if total <= CacheConfig.TTS_DISK_CACHE_MAX_BYTES:
+            break
+        f.unlink(missing_ok=True)
+        total -= st.st_size
+
+
+class _SharedSynthesis:
+    """
+    One gTTS synthesis that any number of /tts responses stream from.
+    
+    gTTS synthesizes one text part per HTTP request. The text is split
+    into sentence groups (see chunk_for_tts): the first group is streamed
+    part by part while the later groups are synthesized concurrently in the
+    shared thread pool, then appended in order. Concurrent or repeated
+    requests for the same text replay the finished chunks and then wait for
+    the rest instead of starting another Google TTS round-trip per part.
+    A completed synthesis is also written to the disk cache.
+    """
+    
+    def __init__(self, text: str, lang: str, slow: bool, disk_path: Optional[Path] = None):
+        self.chunks: List[bytes] = []
+        self.done = False
+        self.error: Optional[Exception] = None
+        self._disk_path = disk_path
+        self._changed = asyncio.Event()
+        segments = chunk_for_tts(text)
+        # Built here so an unsupported language fails the request right away
+        first = gTTS(text=segments[0], lang=lang, slow=slow)
+        self._task = asyncio.create_task(self._produce(first.stream(), segments[1:], lang, slow))
+    
+    async def _produce(self, chunks: Iterator[bytes], later_segments: List[str], lang: str, slow: bool):
+        """Stream the first segment, then append the concurrently synthesized rest in order"""
+        slots = asyncio.Semaphore(TTS_PARALLEL_SEGMENTS)
+        
+        async def synthesize(segment: str) -> List[bytes]:
+            async with slots:
+                return await run_blocking(_synthesize_segment, segment, lang, slow)
+                
+        pending = [asyncio.create_task(synthesize(segment)) for segment in later_segments]
+        try:
+            while True:
+                chunk = await run_blocking(next, chunks, None)
+                if chunk is None:
+                    break
+                self.chunks.append(chunk)
+                self._notify()
+                
+            for task in pending:
+                self.chunks.extend(await task)
+                self._notify()
+        except Exception as e:
+            self.error = e
+            logger.error(f"❌ TTS synthesis failed after {len(self.chunks)} chunk(s): {e}")
+        finally:
+            for task in pending:
+                task.cancel()
+            self.done = True
+            self._notify()
+            
+        if self.error is None and self.chunks and self._disk_path:
+            try:
+                await run_blocking(_write_disk_cache, self._disk_path, self.chunks)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not write TTS disk cache: {e}")
+    
+    def _notify(self):
+        """Wake every waiting response"""
+        self._changed.set()
+        self._changed = asyncio.Event()
+    
+    async def wait_started(self):
+        """Wait for the first chunk; raise the synthesis error if none came"""
+        while not self.chunks and not self.done:
+            await self._changed.wait()
+        if not self.chunks and self.error:
+            raise self.error
+    
+    async def iter_chunks(self):
+        """Yield every chunk, waiting for the ones not synthesized yet"""
+        sent = 0
+        while True:
+            if sent < len(self.chunks):
+                yield self.chunks[sent]
+                sent += 1
+            elif self.done:
+                # Headers are already sent; a failed synthesis ends the stream early
+                return
+            else:
+                await self._changed.wait()
+
+
 # ===== Routes =====
 
 @router.post("/tts")
@@ -86,15 +258,29 @@ async def text_to_speech(request: TTSRequest):
         normalized_text = normalize_text_for_speech(request.text)
         logger.info(f"🔊 Generating TTS audio ({len(normalized_text)} chars, lang={request.lang})")
         
-        # Generate audio
-        mp3_buffer = BytesIO()
-        tts = gTTS(text=normalized_text, lang=request.lang, slow=request.slow)
-        tts.write_to_fp(mp3_buffer)
-        mp3_buffer.seek(0)
+        # Share the synthesis with identical requests (failed ones are redone)
+        cache_key = content_hash(request.lang, request.slow, normalized_text)
+        synthesis = _TTS_SYNTHESES.get(cache_key)
+        disk_path = _TTS_DISK_DIR / f"{cache_key}.mp3"
+        if synthesis is None or synthesis.error is not None:
+            if disk_path.exists():
+                logger.info("💿 Serving TTS audio from disk cache")
+                # Refresh mtime so eviction treats this file as recently played
+                disk_path.touch()
+                return FileResponse(disk_path, media_type="audio/mpeg")
+                
+            synthesis = _SharedSynthesis(normalized_text, request.lang, request.slow, disk_path=disk_path)
+            _TTS_SYNTHESES.set(cache_key, synthesis)
+        else:
+            logger.info("♻️ Reusing TTS audio for identical text")
+        
+        # Audio streams chunk by chunk; the first chunk is awaited before the
+        # response starts so synthesis errors still map to an HTTP error
+        await synthesis.wait_started()
         
-        logger.info("✅ TTS audio generated successfully")
+        logger.info("✅ TTS audio streaming started")
         
-        return StreamingResponse(mp3_buffer, media_type="audio/mpeg")
+        return StreamingResponse(synthesis.iter_chunks(), media_type="audio/mpeg", headers=_STREAM_HEADERS)
         
     except HTTPException:
         raise
@@ -7,17 +7,19 @@ Handles conversational interactions with users.
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional, List
-import os
 
 from langchain_core.tracers.context import tracing_v2_enabled
 
-from api.dependencies import get_conversational_agent
+from api.dependencies import get_conversational_agent, llm_slot
 from conversational_agent import ConversationalAgent
 from utils import validate_message, sanitize_input, setup_logger
-from config import HTTPStatus, APIMessages
+from config import settings, HTTPStatus, APIMessages, FeatureFlags
 
 logger = setup_logger(__name__)
 
+# Tracing settings are fixed at startup, so decide once instead of per request
+_LANGSMITH_ENABLED = FeatureFlags.ENABLE_LANGSMITH_TRACING and settings.api.LANGCHAIN_TRACING_V2
+
 router = APIRouter(prefix="/api", tags=["conversation"])
 
 
@@ -41,7 +43,7 @@ class ConversationResponse(BaseModel):
 
 # ===== Routes =====
 
-@router.post("/chat", response_model=ConversationResponse)
+@router.post("/chat", response_model=ConversationResponse, dependencies=[Depends(llm_slot)])
 async def chat(
     request: ConversationRequest,
     agent: ConversationalAgent = Depends(get_conversational_agent)
@@ -78,23 +80,20 @@ async def chat(
         clean_message = sanitize_input(request.message)
         logger.info(f"💬 Chat message: '{clean_message[:50]}...'")
         
-        # Check if LangSmith tracing is enabled
-        langsmith_enabled = os.getenv("LANGCHAIN_TRACING_V2", "false").lower() == "true"
-        
         # Process message with session-level tracing
-        if langsmith_enabled:
+        if _LANGSMITH_ENABLED:
             # One trace for the entire conversation session
             with tracing_v2_enabled(
-                project_name=os.getenv("LANGCHAIN_PROJECT", "bedtime-stories")
+                project_name=settings.api.LANGCHAIN_PROJECT
             ):
-                result = agent.process_message(
+                result = await agent.aprocess_message(
                     message=clean_message,
                     conversation_history=request.conversation_history,
                     session_id=request.session_id,
                 )
         else:
             # No tracing
-            result = agent.process_message(
+            result = await agent.aprocess_message(
                 message=clean_message,
                 conversation_history=request.conversation_history,
                 session_id=request.session_id,
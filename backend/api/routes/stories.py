@@ -2,30 +2,64 @@
 Stories Routes Module
 
 Handles story generation, retrieval, and management.
+
+SSE generators here never pace output with asyncio.sleep: each event is
+sent as soon as it exists, and blocking work (LLM calls, storage writes)
+goes through run_blocking, which already yields to the event loop.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Literal, List
-import os
+from typing import Dict, Optional, Literal, List, Tuple
+import asyncio
+import json
+import re
 from datetime import datetime
 
 from langchain_core.tracers.context import tracing_v2_enabled
 
-from api.dependencies import get_storyteller_agent, get_judge_agent, get_database
-from agents import StorytellerAgent, JudgeAgent
-from langgraph_workflow import create_complete_workflow, run_story_generation
+from api.dependencies import (
+    get_storyteller_agent,
+    get_judge_agent,
+    get_database,
+    llm_slot,
+    try_acquire_llm_slot,
+    release_llm_slot,
+)
+from api.responses import etag_json_response
+from agents import StorytellerAgent, JudgeAgent, Orchestrator
+from cache import SemanticCache, content_hash
+from langgraph_workflow import astream_story_generation, get_compiled_story_app, run_story_generation
 from utils import (
     validate_prompt, 
     sanitize_input,
     count_paragraphs,
     setup_logger,
     compress_prompt_to_keywords,
+    run_blocking,
 )
-from config import settings, HTTPStatus, APIMessages
+from config import settings, HTTPStatus, APIMessages, ValidationRules, FeatureFlags, CacheConfig, StoryMarkers
 
 logger = setup_logger(__name__)
 
+# Approved workflow results keyed by prompt (exact or paraphrased) and
+# length, so a repeated request skips the whole multi-agent run
+_GENERATED_STORY_CACHE = SemanticCache(
+    threshold=CacheConfig.GENERATED_STORY_SIMILARITY_THRESHOLD,
+    maxsize=CacheConfig.STORY_CACHE_SIZE,
+    ttl=CacheConfig.STORY_CACHE_TTL_SECONDS
+)
+
+# Running workflow tasks by (length, prompt), shared by identical requests
+_INFLIGHT_WORKFLOWS: Dict[str, asyncio.Task] = {}
+
+# Tracing settings are fixed at startup, so decide once instead of per request
+_LANGSMITH_ENABLED = FeatureFlags.ENABLE_LANGSMITH_TRACING and settings.api.LANGCHAIN_TRACING_V2
+
+# "LENGTH: short|medium|long" line inside MODIFY_STORY requests
+_LENGTH_OVERRIDE_RE = re.compile(r"^\s*LENGTH:\s*(short|medium|long)\s*$", re.MULTILINE | re.IGNORECASE)
+
 router = APIRouter(prefix="/api", tags=["stories"])
 
 
@@ -39,6 +73,13 @@ class StoryRequest(BaseModel):
     session_id: Optional[str] = None
 
 
+class BatchStoryRequest(BaseModel):
+    """Request model for generating several stories at once."""
+    prompts: List[str]
+    lengthType: Literal["short", "medium", "long"] = "short"
+    session_id: Optional[str] = None
+
+
 class StoryFeedback(BaseModel):
     """Quality feedback from the Judge Agent."""
     clarity: int
@@ -64,9 +105,100 @@ class Story(BaseModel):
     updated_at: str
 
 
+# ===== Helper Functions =====
+
+def _is_modification_prompt(prompt: str) -> bool:
+    """True for MODIFY_STORY requests, which embed the previous story."""
+    return StoryMarkers.MODIFY in prompt or StoryMarkers.PREVIOUS_STORY in prompt
+
+
+def _prepare_story_prompt(request: StoryRequest) -> Tuple[str, str]:
+    """
+    Sanitize, compress and validate a story prompt.
+    
+    Args:
+        request: StoryRequest containing prompt and length preference
+        
+    Returns:
+        Tuple of (clean_prompt, final_length)
+        
+    Raises:
+        HTTPException: If the prompt is invalid
+    """
+    # Sanitize input
+    clean_prompt = sanitize_input(request.prompt)
+    
+    # Extract length override from MODIFY_STORY requests
+    length_override = None
+    length_match = _LENGTH_OVERRIDE_RE.search(clean_prompt)
+    if length_match:
+        length_override = length_match.group(1).lower()
+        logger.info(f"📏 Length override detected: {length_override}")
+    
+    # Use length override if found, otherwise use request.lengthType
+    final_length = length_override or request.lengthType
+    
+    # Modification requests carry the previous story: they are neither
+    # compressed nor validated (they can be longer)
+    if not _is_modification_prompt(clean_prompt):
+        clean_prompt = compress_prompt_to_keywords(clean_prompt, max_words=12)
+        
+        is_valid, error_message = validate_prompt(clean_prompt)
+        if not is_valid:
+            logger.warning(f"❌ Invalid prompt: {error_message}")
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=error_message
+            )
+    
+    return clean_prompt, final_length
+
+
+async def _save_generated_story(request: StoryRequest, clean_prompt: str, final_story: dict, db) -> dict:
+    """
+    Save a finished workflow story for the requesting session.
+    
+    Args:
+        request: StoryRequest the story was generated for
+        clean_prompt: Prompt the workflow ran with
+        final_story: final_story dict produced by the workflow
+        db: Database instance
+        
+    Returns:
+        The saved story
+    """
+    # One timestamp for both fields (they must match on creation anyway)
+    now = datetime.utcnow().isoformat()
+    story_data = {
+        "title": final_story["title"],
+        "content": final_story["content"],
+        "prompt": clean_prompt,
+        "length_type": request.lengthType,
+        "iterations": final_story["iterations"],
+        "final_score": {
+            "clarity": final_story["final_scores"]["clarity"],
+            "moralValue": final_story["final_scores"]["moral_value"],
+            "ageAppropriateness": final_story["final_scores"]["age_appropriateness"],
+            "score": final_story["overall_score"],
+            "approved": True,
+            "feedback": f"Story approved after {final_story['iterations']} iterations"
+        },
+        "session_id": request.session_id,
+        "created_at": now,
+        "updated_at": now
+    }
+    
+    # JSON storage rewrites the whole file; keep that off the event loop
+    saved_story = await run_blocking(db.save_story, story_data)
+    
+    logger.info(f"💾 Story saved to database with ID: {saved_story.get('id', 'N/A')}")
+    
+    return saved_story
+
+
 # ===== Routes =====
 
-@router.post("/generate-story", response_model=dict)
+@router.post("/generate-story", dependencies=[Depends(llm_slot)])
 async def generate_story(
     request: StoryRequest,
     storyteller: StorytellerAgent = Depends(get_storyteller_agent),
@@ -95,50 +227,17 @@ async def generate_story(
         dict: Success status and generated story data
     """
     try:
-        # Sanitize input
-        clean_prompt = sanitize_input(request.prompt)
-        
-        # Extract length override from MODIFY_STORY requests
-        length_override = None
-        if "LENGTH:" in clean_prompt:
-            lines = clean_prompt.split('\n')
-            for line in lines:
-                if line.strip().startswith("LENGTH:"):
-                    extracted_length = line.replace("LENGTH:", "").strip().lower()
-                    if extracted_length in ["short", "medium", "long"]:
-                        length_override = extracted_length
-                        logger.info(f"📏 Length override detected: {length_override}")
-                    break
-        
-        # Use length override if found, otherwise use request.lengthType
-        final_length = length_override or request.lengthType
-        
-        # Only compress if it's NOT a modification request (which contains PREVIOUS_STORY)
-        if "MODIFY_STORY:" not in clean_prompt and "PREVIOUS_STORY:" not in clean_prompt:
-            clean_prompt = compress_prompt_to_keywords(clean_prompt, max_words=12)
-
-        # Validate prompt (skip validation for modification requests as they can be longer)
-        if "MODIFY_STORY:" not in clean_prompt and "PREVIOUS_STORY:" not in clean_prompt:
-            is_valid, error_message = validate_prompt(clean_prompt)
-            if not is_valid:
-                logger.warning(f"❌ Invalid prompt: {error_message}")
-                raise HTTPException(
-                    status_code=HTTPStatus.BAD_REQUEST,
-                    detail=error_message
-                )
+        clean_prompt, final_length = _prepare_story_prompt(request)
 
         logger.info(
             f"📖 Generating story for prompt: '{clean_prompt[:50]}...' "
             f"(length: {final_length})"
         )
         
-        # Check if LangSmith tracing is enabled
-        langsmith_enabled = os.getenv("LANGCHAIN_TRACING_V2", "false").lower() == "true"
-        
         # Wrap the entire story generation process in one trace
-        if langsmith_enabled:
+        if _LANGSMITH_ENABLED:
             with tracing_v2_enabled(
-                project_name=os.getenv("LANGCHAIN_PROJECT", "bedtime-stories")
+                project_name=settings.api.LANGCHAIN_PROJECT
             ):
                 return await _generate_story_internal(
                     request, clean_prompt, storyteller, judge, db, final_length
@@ -177,79 +276,341 @@ async def _generate_story_internal(
     Args:
         request: StoryRequest
         clean_prompt: Sanitized prompt
-        storyteller: StorytellerAgent (not used directly, kept for compatibility)
-        judge: JudgeAgent (not used directly, kept for compatibility)
+        storyteller: StorytellerAgent used by the compiled graph
+        judge: JudgeAgent used by the compiled graph
         db: Database instance
         
     Returns:
         dict with story data
     """
-    logger.info(f"🎨 Generating story via LangGraph workflow")
-    
-    # Get API keys
-    groq_api_key = os.getenv("GROQ_API_KEY")
-    langsmith_api_key = os.getenv("LANGSMITH_API_KEY")
-    
-    # Create LangGraph workflow (this creates the beautiful graph structure!)
-    _, story_app = create_complete_workflow(
-        groq_api_key=groq_api_key,
-        langsmith_api_key=langsmith_api_key
-    )
-    
-    # Run story generation through the graph
-    logger.info(f"🚀 Running story generation graph for prompt: '{clean_prompt[:50]}...'")
-    final_story = run_story_generation(
-        graph=story_app,
-        prompt=clean_prompt,
-        length_type=final_length or request.lengthType,
-        session_id=request.session_id or "default"
-    )
-    
-    # Check if we got a valid result
-    if not final_story or not isinstance(final_story, dict):
-        raise HTTPException(
-            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
-            detail="Story generation failed to produce a valid result"
-        )
+    length_type = final_length or request.lengthType
     
-    logger.info(
-        f"✅ Story generated in {final_story.get('iterations', 0)} iterations "
-        f"(score: {final_story.get('overall_score', 0)}/10)"
-    )
+    # Modification requests depend on the previous story, so never reuse them
+    cacheable = FeatureFlags.ENABLE_STORY_CACHING and not _is_modification_prompt(clean_prompt)
+    final_story = _GENERATED_STORY_CACHE.lookup(clean_prompt, namespace=length_type) if cacheable else None
+    
+    if final_story:
+        logger.info(f"♻️ Reusing generated story for prompt: '{clean_prompt[:50]}...'")
+    else:
+        logger.info(f"🎨 Generating story via LangGraph workflow")
+        
+        # The graph is compiled once for the shared agents and reused
+        story_app = get_compiled_story_app(storyteller, judge)
+        
+        # Identical requests already running share that run instead of
+        # starting another one
+        inflight_key = content_hash(length_type, clean_prompt)
+        workflow = _INFLIGHT_WORKFLOWS.get(inflight_key)
+        if workflow is None:
+            # Run story generation through the graph
+            logger.info(f"🚀 Running story generation graph for prompt: '{clean_prompt[:50]}...'")
+            # The graph runs blocking LLM calls; keep them off the event loop
+            workflow = asyncio.create_task(run_blocking(
+                run_story_generation,
+                graph=story_app,
+                prompt=clean_prompt,
+                length_type=length_type,
+                session_id=request.session_id or "default"
+            ))
+            _INFLIGHT_WORKFLOWS[inflight_key] = workflow
+            workflow.add_done_callback(lambda _: _INFLIGHT_WORKFLOWS.pop(inflight_key, None))
+        else:
+            logger.info(f"🔗 Joining in-flight story generation for prompt: '{clean_prompt[:50]}...'")
+        
+        # Shielded so one cancelled request does not cancel the others' run
+        final_story = await asyncio.shield(workflow)
+        
+        # Check if we got a valid result
+        if not final_story or not isinstance(final_story, dict):
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail="Story generation failed to produce a valid result"
+            )
+        
+        logger.info(
+            f"✅ Story generated in {final_story.get('iterations', 0)} iterations "
+            f"(score: {final_story.get('overall_score', 0)}/10)"
+        )
+        
+        if cacheable:
+            _GENERATED_STORY_CACHE.store(clean_prompt, dict(final_story), namespace=length_type)
     
     # Save to database
-    story_data = {
-        "title": final_story["title"],
-        "content": final_story["content"],
-        "prompt": clean_prompt,
-        "length_type": request.lengthType,
-        "iterations": final_story["iterations"],
-        "final_score": {
-            "clarity": final_story["final_scores"]["clarity"],
-            "moralValue": final_story["final_scores"]["moral_value"],
-            "ageAppropriateness": final_story["final_scores"]["age_appropriateness"],
-            "score": final_story["overall_score"],
-            "approved": True,
-            "feedback": f"Story approved after {final_story['iterations']} iterations"
-        },
-        "session_id": request.session_id,
-        "created_at": datetime.utcnow().isoformat(),
-        "updated_at": datetime.utcnow().isoformat()
+    saved_story = await _save_generated_story(request, clean_prompt, final_story, db)
+    
+    return {
+        "success": True,
+        "story": saved_story,
+        "message": "Story generated successfully via LangGraph workflow!"
     }
+
+
+@router.post("/generate-story/stream")
+async def generate_story_stream(
+    request: StoryRequest,
+    storyteller: StorytellerAgent = Depends(get_storyteller_agent),
+    judge: JudgeAgent = Depends(get_judge_agent),
+    db = Depends(get_database)
+):
+    """
+    Run the /generate-story workflow, streaming its progress as Server-Sent Events.
     
-    saved_story = db.save_story(story_data)
+    Every draft and judge verdict is sent as soon as its graph node
+    finishes, so the client can show (and start reading aloud) the first
+    draft instead of waiting for the whole refine loop.
     
-    logger.info(f"💾 Story saved to database with ID: {saved_story.get('id', 'N/A')}")
+    Events (each sent as "data: <json>"):
+    - {"type": "draft", "iteration": n, "title": ..., "content": ...}
+    - {"type": "evaluation", "iteration": n, "evaluation": {...judge scores...}}
+    - {"type": "done", "story": {...saved story...}}
+    - {"type": "error", "message": ...}
+    
+    Args:
+        request: StoryRequest containing prompt and length preference
+        storyteller: StorytellerAgent dependency
+        judge: JudgeAgent dependency
+        db: Database dependency
+        
+    Returns:
+        StreamingResponse with text/event-stream content
+    """
+    clean_prompt, final_length = _prepare_story_prompt(request)
+    story_app = get_compiled_story_app(storyteller, judge)
+    
+    logger.info(f"📡 Streaming story workflow for prompt: '{clean_prompt[:50]}...' (length: {final_length})")
+    
+    async def event_stream():
+        if not await try_acquire_llm_slot():
+            yield f"data: {json.dumps({'type': 'error', 'message': APIMessages.SERVER_BUSY})}\n\n"
+            return
+        iteration = 1
+        try:
+            async for node_name, update in astream_story_generation(
+                story_app,
+                prompt=clean_prompt,
+                length_type=final_length,
+                session_id=request.session_id or "default"
+            ):
+                iteration = update.get("iteration", iteration)
+                if node_name in ("story_creator", "paragraph_formatter") and "story_content" in update:
+                    event = {
+                        "type": "draft",
+                        "iteration": iteration,
+                        "title": update["story_title"],
+                        "content": update["story_content"]
+                    }
+                elif node_name == "story_evaluator":
+                    scores = update["quality_scores"]
+                    event = {
+                        "type": "evaluation",
+                        "iteration": iteration,
+                        "evaluation": {
+                            "clarity": scores["clarity"],
+                            "moralValue": scores["moral_value"],
+                            "ageAppropriateness": scores["age_appropriateness"],
+                            "score": update["overall_score"],
+                            "approved": update["approved"],
+                            "feedback": update["evaluation_feedback"]
+                        }
+                    }
+                elif node_name == "finalize_story":
+                    event = {
+                        "type": "done",
+                        "story": await _save_generated_story(request, clean_prompt, update["final_story"], db)
+                    }
+                else:
+                    continue
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.error(f"❌ Error streaming story workflow: {e}", exc_info=True)
+            error_event = {"type": "error", "message": APIMessages.ERROR_STORY_GENERATION}
+            yield f"data: {json.dumps(error_event)}\n\n"
+        finally:
+            release_llm_slot()
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.post("/stream-story")
+async def stream_story(
+    request: StoryRequest,
+    storyteller: StorytellerAgent = Depends(get_storyteller_agent),
+    judge: JudgeAgent = Depends(get_judge_agent),
+    db = Depends(get_database)
+):
+    """
+    Stream a single storyteller draft as Server-Sent Events.
+    
+    Unlike /generate-story this skips the judge/refine loop, so the first
+    words reach the client as soon as the model produces them. The judge
+    is started the moment the story is complete and runs while the story
+    is saved and read; its score follows on the same stream.
+    
+    Events (each sent as "data: <json>"):
+    - {"type": "title", "title": ...}
+    - {"type": "story_chunk", "content": ...}
+    - {"type": "done", "story": {...saved story...}}
+    - {"type": "evaluation", "evaluation": {...judge scores...}}
+    - {"type": "error", "message": ...}
+    
+    Args:
+        request: StoryRequest containing prompt and length preference
+        storyteller: StorytellerAgent dependency
+        judge: JudgeAgent dependency (speculative evaluation)
+        db: Database dependency
+        
+    Returns:
+        StreamingResponse with text/event-stream content
+    """
+    clean_prompt = compress_prompt_to_keywords(sanitize_input(request.prompt), max_words=12)
+    
+    is_valid, error_message = validate_prompt(clean_prompt)
+    if not is_valid:
+        logger.warning(f"❌ Invalid prompt: {error_message}")
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=error_message
+        )
+    
+    word_config = settings.story.WORD_COUNTS[request.lengthType]
+    target_word_count = f"{word_config['min']}-{word_config['max']}"
+    
+    logger.info(f"📡 Streaming story for prompt: '{clean_prompt[:50]}...' (length: {request.lengthType})")
+    
+    async def event_stream():
+        if not await try_acquire_llm_slot():
+            yield f"data: {json.dumps({'type': 'error', 'message': APIMessages.SERVER_BUSY})}\n\n"
+            return
+        judge_task = None
+        try:
+            async for event in storyteller.astream_story(
+                prompt=clean_prompt,
+                target_word_count=target_word_count,
+                length_type=request.lengthType
+            ):
+                if event["type"] == "done":
+                    if FeatureFlags.ENABLE_STREAM_EVALUATION:
+                        judge_task = asyncio.create_task(
+                            judge.aevaluate_story(
+                                event["story"]["title"],
+                                event["story"]["content"],
+                                target_word_count=target_word_count
+                            )
+                        )
+                    now = datetime.utcnow().isoformat()
+                    # Off the event loop, so other streams keep flowing during the save
+                    saved_story = await run_blocking(db.save_story, {
+                        "title": event["story"]["title"],
+                        "content": event["story"]["content"],
+                        "prompt": clean_prompt,
+                        "length_type": request.lengthType,
+                        "iterations": 1,
+                        "final_score": None,
+                        "session_id": request.session_id,
+                        "created_at": now,
+                        "updated_at": now
+                    })
+                    event = {"type": "done", "story": saved_story}
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+            
+            if judge_task:
+                evaluation_event = {"type": "evaluation", "evaluation": await judge_task}
+                yield f"data: {json.dumps(evaluation_event, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            logger.error(f"❌ Error streaming story: {e}", exc_info=True)
+            error_event = {"type": "error", "message": APIMessages.ERROR_STORY_GENERATION}
+            yield f"data: {json.dumps(error_event)}\n\n"
+        finally:
+            if judge_task and not judge_task.done():
+                judge_task.cancel()
+            release_llm_slot()
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.post("/generate-stories", dependencies=[Depends(llm_slot)])
+async def generate_stories(
+    request: BatchStoryRequest,
+    storyteller: StorytellerAgent = Depends(get_storyteller_agent),
+    judge: JudgeAgent = Depends(get_judge_agent),
+    db = Depends(get_database)
+):
+    """
+    Generate and evaluate several single-draft stories concurrently.
+    
+    Each prompt gets one storyteller draft and one judge evaluation; all
+    LLM calls run at the same time (asyncio.gather), so the request takes
+    about as long as the slowest story.
+    
+    Args:
+        request: BatchStoryRequest with prompts and length preference
+        storyteller: StorytellerAgent dependency
+        judge: JudgeAgent dependency
+        db: Database dependency
+        
+    Returns:
+        dict: Success status and the saved stories, in prompt order
+    """
+    if not request.prompts or len(request.prompts) > ValidationRules.MAX_BATCH_PROMPTS:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Provide between 1 and {ValidationRules.MAX_BATCH_PROMPTS} prompts"
+        )
+    
+    clean_prompts = []
+    for prompt in request.prompts:
+        clean_prompt = compress_prompt_to_keywords(sanitize_input(prompt), max_words=12)
+        is_valid, error_message = validate_prompt(clean_prompt)
+        if not is_valid:
+            logger.warning(f"❌ Invalid prompt: {error_message}")
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=error_message
+            )
+        clean_prompts.append(clean_prompt)
+    
+    word_config = settings.story.WORD_COUNTS[request.lengthType]
+    target_word_count = f"{word_config['min']}-{word_config['max']}"
+    
+    logger.info(f"📚 Generating {len(clean_prompts)} stories concurrently (length: {request.lengthType})")
+    
+    try:
+        results = await Orchestrator(storyteller, judge).acreate_many(
+            clean_prompts,
+            target_word_count=target_word_count,
+            length_type=request.lengthType
+        )
+    except Exception as e:
+        logger.error(f"❌ Error generating stories: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+            detail=APIMessages.ERROR_STORY_GENERATION
+        )
+    
+    saved_stories = []
+    for clean_prompt, result in zip(clean_prompts, results):
+        now = datetime.utcnow().isoformat()
+        saved_stories.append(await run_blocking(db.save_story, {
+            "title": result["title"],
+            "content": result["content"],
+            "prompt": clean_prompt,
+            "length_type": request.lengthType,
+            "iterations": 1,
+            "final_score": result["evaluation"],
+            "session_id": request.session_id,
+            "created_at": now,
+            "updated_at": now
+        }))
     
     return {
         "success": True,
-        "story": saved_story,
-        "message": "Story generated successfully via LangGraph workflow!"
+        "stories": saved_stories
     }
 
 
-@router.get("/stories", response_model=dict)
+@router.get("/stories")
 async def get_stories(
+    http_request: Request,
     limit: int = 10,
     session_id: Optional[str] = None,
     db = Depends(get_database)
@@ -258,23 +619,23 @@ async def get_stories(
     Get previous stories from database.
     
     Args:
+        http_request: Incoming request (If-None-Match is honored)
         limit: Maximum number of stories to return (default: 10)
         session_id: Optional session id to scope stories
         db: Database dependency
         
     Returns:
-        dict: Success status and list of stories
+        JSON response with success status and list of stories (ETag-tagged)
     """
     try:
-        all_stories = db.get_all_stories(session_id=session_id)
-        recent_stories = all_stories[:limit]
+        recent_stories = db.get_all_stories(session_id=session_id, limit=limit)
         
         logger.info(f"📚 Retrieved {len(recent_stories)} stories")
         
-        return {
+        return etag_json_response(http_request, {
             "success": True,
             "stories": recent_stories
-        }
+        })
     except Exception as e:
         logger.error(f"❌ Error retrieving stories: {e}")
         raise HTTPException(
@@ -283,9 +644,10 @@ async def get_stories(
         )
 
 
-@router.get("/stories/{story_id}", response_model=dict)
+@router.get("/stories/{story_id}")
 async def get_story(
     story_id: str,
+    http_request: Request,
     db = Depends(get_database)
 ):
     """
@@ -293,10 +655,11 @@ async def get_story(
     
     Args:
         story_id: Unique ID of the story
+        http_request: Incoming request (If-None-Match is honored)
         db: Storage dependency
         
     Returns:
-        dict: Success status and story data
+        JSON response with success status and story data (ETag-tagged)
     """
     try:
         story = db.get_story_by_id(story_id)
@@ -310,10 +673,10 @@ async def get_story(
         
         logger.info(f"📖 Retrieved story: {story_id}")
         
-        return {
+        return etag_json_response(http_request, {
             "success": True,
             "story": story
-        }
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,26 @@
+"""
+Cache Package
+
+In-process caches that let the agents and routes skip a Groq round-trip
+when an equivalent request has already been answered.
+"""
+
+from .semantic_cache import (
+    TTLCache,
+    SemanticCache,
+    normalize_text,
+    embed_text,
+    cosine_similarity,
+    content_hash,
+)
+from .disk_cache import DiskCache
+
+__all__ = [
+    'TTLCache',
+    'SemanticCache',
+    'normalize_text',
+    'embed_text',
+    'cosine_similarity',
+    'content_hash',
+    'DiskCache',
+]
@@ -0,0 +1,79 @@
+"""
+Persistent Response Cache
+
+A small SQLite-backed key/value cache for answers that are worth keeping
+across restarts (e.g. judge evaluations). Values are stored as JSON with an
+expiry time; expired rows are ignored on read and purged when the database
+is opened.
+
+The database is opened lazily on first use, in WAL mode so that reads do
+not wait for writes, and every access goes through one lock so the cache
+can be shared between the event loop and the blocking thread pool.
+"""
+
+from pathlib import Path
+from typing import Any, Optional, Union
+import json
+import sqlite3
+import threading
+import time
+
+
+class DiskCache:
+    """
+    Exact-match cache persisted in a SQLite file, with time-to-live expiry.
+    """
+
+    def __init__(self, path: Union[str, Path], ttl: float = 86400):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database (once), creating the table and purging expired rows."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on miss/expiry/error."""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT value FROM cache WHERE key = ? AND expires_at >= ?",
+                    (key, time.time())
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key (errors are ignored)."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time() + self.ttl)
+                )
+                conn.commit()
+        except sqlite3.Error:
+            pass
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM cache")
+            conn.commit()
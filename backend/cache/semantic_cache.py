@@ -0,0 +1,239 @@
+"""
+Semantic Response Cache
+
+Provides two small, thread-safe caches used in front of the Groq calls:
+
+1. TTLCache - exact-match LRU cache with per-entry expiry
+2. SemanticCache - similarity lookup over lightweight text vectors, so that
+   "a story about a brave bunny" and "story about the brave bunny" share
+   one cached answer
+
+Vectors are sparse term-frequency embeddings built from the normalized
+text, over words and adjacent word pairs. The pairs keep word order, so
+"a cat who is afraid of the dog" and "a dog who is afraid of the cat" do
+not match. They need no model download and are good enough to catch
+reworded children's prompts; a different embedder can be passed in if needed.
+"""
+
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import math
+import re
+import threading
+import time
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+# Words that carry no meaning for story similarity
+_STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "of", "to", "for", "in", "on", "at",
+    "with", "about", "me", "my", "please", "can", "you", "i", "is", "it",
+    "that", "this", "some", "tell", "write", "make", "create",
+})
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache keys.
+
+    Args:
+        text: Raw text
+
+    Returns:
+        Lowercased text with punctuation removed and whitespace collapsed
+    """
+    if not text:
+        return ""
+    return " ".join(_TOKEN_RE.findall(text.lower()))
+
+
+def embed_text(text: str) -> Dict[str, float]:
+    """
+    Build a unit-length term-frequency vector for text.
+
+    Terms are the content words plus each pair of adjacent content words,
+    so prompts with the same words in swapped roles score below 1.0.
+
+    Args:
+        text: Text to embed
+
+    Returns:
+        Sparse vector as {term: weight}
+    """
+    tokens = [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+    counts = Counter(tokens)
+    counts.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+    norm = math.sqrt(sum(c * c for c in counts.values()))
+    if not norm:
+        return {}
+    return {term: count / norm for term, count in counts.items()}
+
+
+def cosine_similarity(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """
+    Cosine similarity between two unit-length sparse vectors.
+
+    Args:
+        a: First vector
+        b: Second vector
+
+    Returns:
+        Similarity between 0.0 and 1.0
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    SHA256 hex digest of the given parts, joined with NUL separators.
+
+    Args:
+        *parts: Values to hash (converted with str())
+
+    Returns:
+        Hex digest string
+    """
+    return hashlib.sha256("\0".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+    """
+    Exact-match LRU cache with time-to-live expiry.
+
+    Entries are evicted least-recently-used once maxsize is reached, and
+    ignored (then dropped) once older than ttl seconds.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on miss/expiry."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, evicting the oldest entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache:
+    """
+    Similarity-based cache for free-form prompts.
+
+    Each entry is stored under a namespace (e.g. "short|150-220") so that
+    prompts only match answers produced with the same generation settings.
+    A lookup returns the best entry whose cosine similarity reaches the
+    threshold.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        maxsize: int = 512,
+        ttl: float = 3600,
+        embedder: Callable[[str], Dict[str, float]] = embed_text
+    ):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.embedder = embedder
+        self._entries: "OrderedDict[str, tuple[float, str, Dict[str, float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, text: str, namespace: str = "") -> Optional[Any]:
+        """
+        Find a cached value for text (or a close paraphrase of it).
+
+        Args:
+            text: Prompt text to look up
+            namespace: Generation settings the value must have been stored under
+
+        Returns:
+            Cached value or None on miss
+        """
+        key = content_hash(namespace, normalize_text(text))
+        vector = self.embedder(text)
+        now = time.monotonic()
+
+        with self._lock:
+            exact = self._entries.get(key)
+            if exact is not None and exact[0] >= now:
+                self._entries.move_to_end(key)
+                return exact[3]
+
+            if not vector:
+                return None
+
+            best_key, best_score = None, self.threshold
+            expired: List[str] = []
+            for entry_key, (expires_at, entry_ns, entry_vec, _) in self._entries.items():
+                if expires_at < now:
+                    expired.append(entry_key)
+                    continue
+                if entry_ns != namespace:
+                    continue
+                score = cosine_similarity(vector, entry_vec)
+                if score >= best_score:
+                    best_key, best_score = entry_key, score
+
+            for entry_key in expired:
+                del self._entries[entry_key]
+
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][3]
+
+    def store(self, text: str, value: Any, namespace: str = "") -> None:
+        """
+        Cache value for text under namespace.
+
+        Args:
+            text: Prompt text the value answers
+            value: Value to cache
+            namespace: Generation settings the value was produced with
+        """
+        key = content_hash(namespace, normalize_text(text))
+        entry = (time.monotonic() + self.ttl, namespace, self.embedder(text), value)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
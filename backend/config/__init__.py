@@ -9,13 +9,15 @@ from .constants import (
     HTTPStatus,
     APIMessages,
     StoryLength,
+    StoryMarkers,
     QualityMetrics,
     TextLimits,
     RegexPatterns,
     LogMessages,
     ValidationRules,
     RetryConfig,
-    FeatureFlags
+    FeatureFlags,
+    CacheConfig
 )
 
 __all__ = [
@@ -28,6 +30,7 @@ __all__ = [
     'HTTPStatus',
     'APIMessages',
     'StoryLength',
+    'StoryMarkers',
     'QualityMetrics',
     'TextLimits',
     'RegexPatterns',
@@ -35,4 +38,5 @@ __all__ = [
     'ValidationRules',
     'RetryConfig',
     'FeatureFlags',
+    'CacheConfig',
 ]
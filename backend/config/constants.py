@@ -5,7 +5,8 @@ Centralizes all hardcoded strings, magic numbers, and constant values
 used throughout the application.
 """
 
-from enum import Enum
+import re
+import sys
 from typing import Dict, List
 
 
@@ -13,10 +14,12 @@ class HTTPStatus:
     """HTTP status code constants."""
     OK = 200
     CREATED = 201
+    NOT_MODIFIED = 304
     BAD_REQUEST = 400
     NOT_FOUND = 404
     INTERNAL_SERVER_ERROR = 500
     TOO_MANY_REQUESTS = 429
+    SERVICE_UNAVAILABLE = 503
 
 
 class APIMessages:
@@ -36,14 +39,18 @@ class APIMessages:
     ERROR_API_KEY_MISSING = "API key configuration missing"
     INTERNAL_ERROR = "An internal server error occurred"
     RATE_LIMIT_ERROR = "Rate limit reached for the current Groq model(s). Please try again in a few minutes."
+    SERVER_BUSY = "The storyteller is busy right now. Please try again in a moment."
 
 
 
-class StoryLength(str, Enum):
+class StoryLength:
     """Allowed story length types."""
     SHORT = "short"
     MEDIUM = "medium"
     LONG = "long"
+    
+    # All allowed values, for membership checks
+    ALL = (SHORT, MEDIUM, LONG)
 
 
 class QualityMetrics:
@@ -56,6 +63,14 @@ class QualityMetrics:
     
     MAX_SCORE = 10
     MIN_SCORE = 1
+    
+    # Word count may miss the target range by this fraction before the
+    # local pre-check fails a story without asking the LLM judge
+    WORD_COUNT_TOLERANCE = 0.25
+    # Sentence length bounds for young readers: no single sentence longer
+    # than the maximum, and no choppy average below the minimum
+    MAX_SENTENCE_WORDS = 35
+    MIN_AVERAGE_SENTENCE_WORDS = 4
 
 
 class PromptPaths:
@@ -76,31 +91,43 @@ class TextLimits:
     MAX_MESSAGE_LENGTH = 1000
     MAX_TITLE_LENGTH = 100
     MAX_STORY_CONTENT_LENGTH = 10000
-    MAX_STORY_CONTENT = 10000  # Alias for compatibility
+    MAX_STORY_CONTENT = MAX_STORY_CONTENT_LENGTH  # Alias for compatibility
     
     # Name extraction
     MAX_NAME_LENGTH = 50
     MIN_NAME_LENGTH = 2
+    
+    # Token estimation (English text averages ~4 characters per LLM token)
+    CHARS_PER_TOKEN = 4
 
 
 class RegexPatterns:
-    """Common regex patterns."""
+    """Common regex patterns, compiled once at import."""
+    
+    # Name extraction (matched against lowercased messages): one alternation
+    # so each message is scanned once
+    NAME_PATTERN = re.compile(r"(?:my name is|i'm|i am|call me|this is) (\w+)")
     
-    # Name extraction patterns
+    # Individual name patterns, kept for compatibility (use NAME_PATTERN)
     NAME_PATTERNS = [
-        r"my name is (\w+)",
-        r"i'm (\w+)",
-        r"i am (\w+)",
-        r"call me (\w+)",
-        r"this is (\w+)"
+        re.compile(r"my name is (\w+)"),
+        re.compile(r"i'm (\w+)"),
+        re.compile(r"i am (\w+)"),
+        re.compile(r"call me (\w+)"),
+        re.compile(r"this is (\w+)")
     ]
     
-    # Age extraction
-    AGE_PATTERN = r"i(?:'m| am) (\d+) years? old"
+    # Age extraction (matched against lowercased messages)
+    AGE_PATTERN = re.compile(r"i(?:'m| am) (\d+) years? old")
     
     # Story validation
-    PARAGRAPH_SPLIT = r'\n\s*\n'
-    WORD_COUNT_PATTERN = r'\b\w+\b'
+    PARAGRAPH_SPLIT = re.compile(r'\n\s*\n')
+    WORD_COUNT_PATTERN = re.compile(r'\b\w+\b')
+    # Words a bedtime story must never contain (checked before the LLM judge)
+    UNSAFE_STORY_WORDS = re.compile(
+        r'\b(kill(?:s|ed|ing)?|blood(?:y)?|guns?|murder(?:s|ed)?|stab(?:s|bed)?|gore|corpse)\b',
+        re.IGNORECASE
+    )
 
 
 
@@ -119,6 +146,17 @@ class StorageKeys:
     UPDATED_AT = "updated_at"
 
 
+class StoryMarkers:
+    """
+    Markers embedded in story prompts and chat history.
+    
+    Interned once so the many per-request checks share one string object.
+    """
+    MODIFY = sys.intern("MODIFY_STORY:")
+    PREVIOUS_STORY = sys.intern("PREVIOUS_STORY:")
+    STORY_CONTENT = sys.intern("STORY_CONTENT:")
+
+
 
 class LogMessages:
     """Standard log messages."""
@@ -168,7 +206,13 @@ class FeatureFlags:
     """Feature toggle flags."""
     
     ENABLE_LANGSMITH_TRACING = True
-    ENABLE_STORY_CACHING = False
+    ENABLE_STORY_CACHING = True
+    ENABLE_RESPONSE_CACHING = True  # Exact-match cache of raw LLM responses
+    ENABLE_COMBINED_CREATE_EVALUATE = True  # First draft + score in one LLM call
+    ENABLE_STREAM_EVALUATION = True  # Judge a streamed story while the client reads it
+    ENABLE_MODEL_PROBE = True  # Drop model candidates Groq no longer lists at startup
+    ENABLE_HEDGED_REQUESTS = False  # Race the top two models on async calls (doubles Groq spend)
+    ENABLE_CLASSIFIER_PREAMBLE = False  # Shared rules block lifting classifier prompts over the prompt-cache minimum
     ENABLE_RATE_LIMITING = False
     ENABLE_AUDIO_GENERATION = True
     ENABLE_IMAGE_GENERATION = False  # Future feature
@@ -190,6 +234,43 @@ class RetryConfig:
     API_TIMEOUT_SECONDS = 30
 
 
+class CacheConfig:
+    """Sizes, lifetimes and match thresholds of the in-process caches."""
+    
+    # Stories, matched by prompt similarity within one length setting
+    STORY_SIMILARITY_THRESHOLD = 0.92  # Cosine similarity needed for a hit
+    STORY_CACHE_SIZE = 512
+    STORY_CACHE_TTL_SECONDS = 3600
+    # Finished /generate-story results (whole workflow), same size and TTL
+    GENERATED_STORY_SIMILARITY_THRESHOLD = 0.95
+    
+    # Evaluations, matched on the exact title and content
+    EVALUATION_CACHE_SIZE = 1024
+    EVALUATION_CACHE_TTL_SECONDS = 3600
+    # Evaluations also persisted to SQLite (relative to backend/), kept a day
+    EVALUATION_DISK_CACHE_PATH = "data/judge_cache.sqlite"
+    EVALUATION_DISK_CACHE_TTL_SECONDS = 86400
+    
+    # Yes/no classifier verdicts (safety, story request, self inquiry),
+    # matched on the message ignoring case and whitespace
+    CLASSIFIER_CACHE_SIZE = 4096
+    CLASSIFIER_CACHE_TTL_SECONDS = 3600
+    
+    # Raw LLM responses, matched on the exact request
+    RESPONSE_CACHE_SIZE = 2048
+    RESPONSE_CACHE_TTL_SECONDS = 86400
+    
+    # Text-to-speech audio, matched on the exact text, language and speed
+    TTS_CACHE_SIZE = 32
+    TTS_CACHE_TTL_SECONDS = 3600
+    # Finished MP3s on disk (relative to backend/), oldest evicted past the cap
+    TTS_DISK_CACHE_DIR = "data/tts"
+    TTS_DISK_CACHE_MAX_BYTES = 200 * 1024 * 1024
+    
+    # Groq model list used to skip unavailable model candidates
+    MODEL_LIST_TTL_SECONDS = 300
+
+
 
 class ValidationRules:
     """Input validation rules."""
@@ -205,24 +286,29 @@ class ValidationRules:
     # Session
     SESSION_ID_LENGTH = 36  # UUID length
     
-    # Feedback scores
-    MIN_FEEDBACK_SCORE = 1
-    MAX_FEEDBACK_SCORE = 10
+    # Batch story generation
+    MAX_BATCH_PROMPTS = 5
+    
+    # Feedback scores use the same 1-10 scale as the judge
+    MIN_FEEDBACK_SCORE = QualityMetrics.MIN_SCORE
+    MAX_FEEDBACK_SCORE = QualityMetrics.MAX_SCORE
 
 
 __all__ = [
     'HTTPStatus',
     'APIMessages',
     'StoryLength',
+    'StoryMarkers',
     'QualityMetrics',
     'PromptPaths',
     'TextLimits',
     'RegexPatterns',
-    'CollectionNames',
-    'IndexNames',
+    'StorageFiles',
+    'StorageKeys',
     'LogMessages',
     'UIMessages',
     'FeatureFlags',
     'RetryConfig',
+    'CacheConfig',
     'ValidationRules',
 ]
@@ -5,7 +5,36 @@ This module centralizes all system prompts used by the storytelling agents.
 All prompts are managed here to ensure consistency and ease of modification.
 """
 
-from typing import Tuple
+import sys
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .constants import FeatureFlags, StoryMarkers
+
+
+# Short single-message probes (safety, message classification) are
+# repeated often ("yes", "no", retries), so their prompts are memoized
+PROMPT_CACHE_SIZE = 256
+
+# Providers only cache prompt prefixes above a minimum length (about 1,024
+# tokens); the classifier preamble is sized to clear it
+PROMPT_CACHE_MIN_TOKENS = 1024
+
+
+def _split_template(template: str, field: str, preamble: str = "") -> Tuple[str, str]:
+    """
+    Split a one-field template into its static prefix and suffix.
+    
+    Args:
+        template: format_map template containing {field} exactly once
+        field: Name of the placeholder
+        preamble: Literal text placed before the template (not formatted)
+        
+    Returns:
+        Tuple of (prefix, suffix), unescaped and interned
+    """
+    prefix, suffix = template.format_map({field: "\0"}).split("\0")
+    return sys.intern(preamble + prefix), sys.intern(suffix)
 
 
 # ============================================================================
@@ -15,18 +44,8 @@ from typing import Tuple
 class ConversationalPrompts:
     """Prompts for the conversational agent (Storybuddy)."""
     
-    @staticmethod
-    def get_content_safety_prompt(message: str) -> str:
-        """
-        Prompt for checking if content is appropriate for children.
-        
-        Args:
-            message: The user's message to check
-            
-        Returns:
-            Formatted content safety prompt
-        """
-        return f"""Is this story request appropriate for children aged 5-14?
+    # Static templates, built once (interned) and filled with format_map
+    _CONTENT_SAFETY_TEMPLATE = sys.intern("""Is this story request appropriate for children aged 5-14?
 
 INAPPROPRIATE ONLY IF it contains:
 - Explicit violence, gore, death, killing
@@ -46,7 +65,183 @@ APPROPRIATE (these are GOOD for kids):
 
 Message: "{message}"
 
-Answer APPROPRIATE or INAPPROPRIATE (default to APPROPRIATE if uncertain):"""
+Answer APPROPRIATE or INAPPROPRIATE (default to APPROPRIATE if uncertain):""")
+    
+    # The age-dependent header only changes with the configured age range,
+    # so it is built once per range; context and history are appended per call
+    _CONVERSATIONAL_HEADER_TEMPLATE = """You are Storybuddy, a friendly AI storytelling companion for kids aged {min_age}-{max_age}.
+
+Be warm, encouraging, and brief (2-3 sentences). Use simple words and occasional emojis 😊✨
+
+When they want a story, respond with excitement: "Great idea! Let me create that for you! ✨"
+
+REFUSE inappropriate content (violence, scary, adult themes) and redirect positively:
+"That's too scary! How about friendly dragons or space adventure instead? 🐉🚀"
+
+"""
+    
+    # Context analyzer prompt, one template per mode: the caller already knows
+    # whether the history holds a story, so the model only sees one mode.
+    # Instructions come first and the conversation last, so the provider's
+    # prefix cache covers the instructions
+    _CONTEXT_MODIFY_TEMPLATE = sys.intern("""ANALYZE CONTEXT AND FORMAT OUTPUT - DO NOT EXPLAIN OR DISCUSS
+
+The conversation below contains "STORY_CONTENT:", so the user request is a MODIFICATION.
+
+Format:
+MODIFY_STORY: [the user request, exactly as written]
+LENGTH: [extract length: "short", "medium", or "long" based on request, default "short"]
+
+PREVIOUS_STORY:
+[copy full story after STORY_CONTENT:]
+
+Length detection rules:
+- "longer", "long", "make it long", "more paragraphs" → "long"
+- "shorter", "short", "make it short" → "short"
+- "medium", "medium length" → "medium"
+- No mention → "short"
+
+Conversation:
+{conversation}
+
+User request: "{request}"
+
+OUTPUT FORMAT ONLY - NO EXPLANATIONS OR REASONING:""")
+    
+    _CONTEXT_KEYWORDS_TEMPLATE = sys.intern("""ANALYZE CONTEXT AND FORMAT OUTPUT - DO NOT EXPLAIN OR DISCUSS
+
+Return 2-10 keywords only.
+
+Conversation:
+{conversation}
+
+User request: "{request}"
+
+OUTPUT FORMAT ONLY - NO EXPLANATIONS OR REASONING:""")
+    
+    # Story request, self-inquiry and user info in one round trip; static
+    # rules first so consecutive turns share the cached prefix, the message last
+    _COMBINED_CLASSIFICATION_TEMPLATE = sys.intern("""Classify the user's message for a children's storytelling chat.
+
+story_request: true if the user wants a story told, changed or continued
+- "tell me a story", "add a lion", "change the ending", "continue"
+
+self_inquiry: true if the user asks about their own information (name, age, etc.)
+- "what is my name?", "do you remember me?", "who am I?"
+
+user_info: fill ONLY if the user is introducing THEMSELVES
+- "My name is John", "I'm Sarah", "Call me Alex", "I am 7 years old"
+- NOT story requests about someone ("tell me a story about Justin")
+- NOT story characters ("add a boy named Vamshi") or other people
+
+Return ONLY this JSON, nothing else:
+{{"story_request": true/false, "self_inquiry": true/false, "user_info": {{"name": "name or null", "age": number or null}}}}
+
+Message: "{message}\"""")
+    
+    # Rules shared by every classifier prompt below. Off by default; with
+    # ENABLE_CLASSIFIER_PREAMBLE it is prepended verbatim, making each short
+    # classifier prompt long enough for the provider's prompt cache, so after
+    # the first call this identical prefix is not billed or prefilled again
+    _SHARED_CLASSIFIER_PREAMBLE = sys.intern("""You are the message classifier of Storybuddy, a bedtime storytelling app for children aged 5-14.
+You never chat with the user. You read ONE message from a child (or a parent helping them) and answer
+exactly the question asked in the TASK section at the end, in exactly the output format that task asks for.
+
+GENERAL RULES
+- Judge only the message given in the task; do not invent context that is not there.
+- Children write informally: typos, missing punctuation, all caps, emojis and run-on sentences are normal.
+- Be generous to imaginative play. Dragons, monsters that turn out friendly, pirates, witches, ghosts
+  who want friends, space battles without gore and "scary but safe" adventures are fine for children.
+- Never explain your answer, never add reasoning, never wrap the answer in quotes or code blocks
+  unless the task's format requires it.
+- When the task asks for YES/NO or APPROPRIATE/INAPPROPRIATE, answer with that single word.
+- When the task asks for JSON, return one JSON object with exactly the requested keys; use true/false
+  for booleans, numbers for ages and null for anything not stated.
+
+CONTENT SAFETY
+A message is INAPPROPRIATE only if it asks for or describes:
+- Explicit violence, gore, torture, death or killing described in detail
+- Weapons used to hurt people or animals (guns, knives, bombs used for violence)
+- Horror meant to frighten: jump scares, demons, possession, body horror
+- Adult or sexual content, romance beyond a simple crush, nudity
+- Drugs, alcohol, smoking, gambling
+- Real-world crime, self-harm, abuse or dangerous stunts a child could copy
+- Hate, bullying or insults aimed at real people or groups
+Everything else is APPROPRIATE, including friendly animals, magic, quests, robots, dinosaurs, space,
+sports, school, family, friendship, kindness, facing fears and learning lessons. If unsure: APPROPRIATE.
+
+STORY REQUESTS
+A message is a story request when the user wants a story told, changed or continued:
+- Asking for a new story, with or without details ("tell me a story", "a story about a brave cat")
+- Changing the current story ("add a lion", "make it funnier", "change the ending", "make it shorter")
+- Continuing it ("continue", "what happens next?", "part two please")
+It is NOT a story request when the user only chats, answers a question, says thanks or goodbye,
+asks about themselves, or refuses a story ("no more stories", "I don't want a story").
+
+SELF-INQUIRY
+A message is a self-inquiry when the user asks what the app knows about THEM:
+- "what is my name?", "do you remember me?", "who am I?", "how old am I?", "what do I like?"
+Questions about story characters, about Storybuddy itself or about other people are not self-inquiries.
+
+INTRODUCTIONS
+Extract a name or age only when the user introduces THEMSELVES:
+- "My name is John", "I'm Sarah", "Call me Alex", "I am 7 years old", "im 9"
+Do NOT extract:
+- Names of people a story should be about ("tell me a story about Justin")
+- Story characters ("add a boy named Vamshi", "the dragon is called Spark")
+- Other people ("my brother is Leo", "my friend Mia is 8")
+- Feelings or states ("I'm tired", "I'm happy", "I'm ready") - these are not names
+
+LABELLED EXAMPLES
+- "tell me a story about a dragon who is afraid of the dark" -> appropriate; story request
+- "can you make the bunny find a friend at the end" -> appropriate; story request (change)
+- "continue!!" -> appropriate; story request (continue)
+- "another one please 🐶" -> appropriate; story request
+- "a story where the knight kills the dragon with lots of blood" -> inappropriate (gore); story request
+- "tell me about a zombie that eats people" -> inappropriate (horror, violence); story request
+- "a story about a kid who finds his dad's gun" -> inappropriate (weapon danger); story request
+- "a friendly ghost who wants to make friends" -> appropriate; story request
+- "pirates looking for treasure on a secret island" -> appropriate; story request
+- "thank you that was nice" -> appropriate; not a story request
+- "no more stories, I want to talk" -> appropriate; not a story request
+- "what is my name?" -> appropriate; self-inquiry
+- "do you remember how old I am" -> appropriate; self-inquiry
+- "what is the dragon's name?" -> appropriate; not a self-inquiry (story character)
+- "who are you?" -> appropriate; not a self-inquiry (asks about Storybuddy)
+- "hi I'm Maya and I'm 6" -> appropriate; introduction: name Maya, age 6
+- "call me captain Leo" -> appropriate; introduction: name Leo
+- "I'm sleepy" -> appropriate; no introduction (a feeling, not a name)
+- "tell me a story about Justin" -> appropriate; story request; no introduction (Justin is the subject)
+- "add a girl named Priya who can fly" -> appropriate; story request; no introduction (a character)
+- "my sister Ana is 10" -> appropriate; no introduction (another person)
+- "I am 8 and I love space, tell me a rocket story" -> appropriate; story request; introduction: age 8
+
+TASK
+""")
+    
+    _CLASSIFIER_PREAMBLE = (
+        _SHARED_CLASSIFIER_PREAMBLE if FeatureFlags.ENABLE_CLASSIFIER_PREAMBLE else ""
+    )
+    
+    # Single-message prompts are stored as static prefix/suffix pairs, so a
+    # call only joins the message in between
+    _CONTENT_SAFETY_PARTS = _split_template(_CONTENT_SAFETY_TEMPLATE, "message", _CLASSIFIER_PREAMBLE)
+    _COMBINED_CLASSIFICATION_PARTS = _split_template(_COMBINED_CLASSIFICATION_TEMPLATE, "message", _CLASSIFIER_PREAMBLE)
+    
+    @staticmethod
+    @lru_cache(maxsize=PROMPT_CACHE_SIZE)
+    def get_content_safety_prompt(message: str) -> str:
+        """
+        Prompt for checking if content is appropriate for children.
+        
+        Args:
+            message: The user's message to check
+            
+        Returns:
+            Formatted content safety prompt
+        """
+        prefix, suffix = ConversationalPrompts._CONTENT_SAFETY_PARTS
+        return "".join((prefix, message, suffix))
     
     @staticmethod
     def get_conversational_prompt(
@@ -65,60 +260,59 @@ Answer APPROPRIATE or INAPPROPRIATE (default to APPROPRIATE if uncertain):"""
         Returns:
             Formatted conversational agent prompt
         """
+        return "".join((
+            ConversationalPrompts.get_conversational_header(age_range),
+            context or "",
+            "\n\nRecent chat:\n",
+            history,
+            "\n\nBe helpful and fun! ✨"
+        ))
+    
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def get_conversational_header(age_range: Tuple[int, int]) -> str:
+        """
+        Age-dependent opening of the conversational prompt, built once per range.
+        
+        Args:
+            age_range: Tuple of (min_age, max_age)
+            
+        Returns:
+            Static prompt header for that age range
+        """
         min_age, max_age = age_range
-        return f"""You are Storybuddy, a friendly AI storytelling companion for kids aged {min_age}-{max_age}.
-
-Be warm, encouraging, and brief (2-3 sentences). Use simple words and occasional emojis 😊✨
-
-When they want a story, respond with excitement: "Great idea! Let me create that for you! ✨"
-
-REFUSE inappropriate content (violence, scary, adult themes) and redirect positively:
-"That's too scary! How about friendly dragons or space adventure instead? 🐉🚀"
-
-{context if context else ""}
-
-Recent chat:
-{history}
-
-Be helpful and fun! ✨"""
+        return sys.intern(ConversationalPrompts._CONVERSATIONAL_HEADER_TEMPLATE.format_map({
+            "min_age": min_age,
+            "max_age": max_age
+        }))
     
     @staticmethod
-    def get_context_analyzer_prompt(conversation: str, request: str) -> str:
+    def get_context_analyzer_prompt(
+        conversation: str,
+        request: str,
+        has_story_content: Optional[bool] = None
+    ) -> str:
         """
         Prompt for analyzing conversation context to enhance story requests.
         
         Args:
             conversation: Recent conversation history
             request: Current story request
+            has_story_content: Whether the history holds a previous story
+                (checked in the conversation text if not given)
             
         Returns:
             Formatted context analyzer prompt
         """
-        return f"""ANALYZE CONTEXT AND FORMAT OUTPUT - DO NOT EXPLAIN OR DISCUSS
-
-Conversation:
-{conversation}
-
-User request: "{request}"
-
-IF conversation contains "STORY_CONTENT:", this is a MODIFICATION:
-
-Format:
-MODIFY_STORY: {request}
-LENGTH: [extract length: "short", "medium", or "long" based on request, default "short"]
-
-PREVIOUS_STORY:
-[copy full story after STORY_CONTENT:]
-
-Length detection rules:
-- "longer", "long", "make it long", "more paragraphs" → "long"
-- "shorter", "short", "make it short" → "short"
-- "medium", "medium length" → "medium"
-- No mention → "short"
-
-IF NO "STORY_CONTENT:", return 2-10 keywords only.
-
-OUTPUT FORMAT ONLY - NO EXPLANATIONS OR REASONING:"""
+        if has_story_content is None:
+            has_story_content = StoryMarkers.STORY_CONTENT in conversation
+        
+        if has_story_content:
+            template = ConversationalPrompts._CONTEXT_MODIFY_TEMPLATE
+        else:
+            template = ConversationalPrompts._CONTEXT_KEYWORDS_TEMPLATE
+        
+        return template.format_map({"conversation": conversation, "request": request})
 
 
 
@@ -127,75 +321,63 @@ OUTPUT FORMAT ONLY - NO EXPLANATIONS OR REASONING:"""
         """
         Prompt for extracting user information (name, age) from messages.
         
+        Kept for existing callers; delegates to the combined classification
+        prompt, whose JSON answer holds the info under "user_info".
+        
         Args:
             message: User's message
             
         Returns:
-            Formatted extraction prompt
+            Formatted classification prompt
         """
-        return f"""Extract user information ONLY if the user is introducing THEMSELVES.
-
-DO NOT extract names if:
-- Requesting a story about someone ("tell me a story about Justin")
-- Mentioning story characters ("add a boy named Vamshi")
-- Talking about other people
-
-ONLY extract if user introduces themselves:
-- "My name is John"
-- "I'm Sarah"
-- "Call me Alex"
-- "I am 7 years old"
-
-Message: "{message}"
-
-Return JSON:
-{{
-  "name": "user's name ONLY if introducing themselves, null otherwise",
-  "age": "user's age as number if mentioned, null otherwise"
-}}
-
-Return ONLY the JSON, nothing else."""
+        return ConversationalPrompts.get_combined_classification_prompt(message)
 
     @staticmethod
     def get_story_request_detection_prompt(message: str) -> str:
         """
         Prompt for detecting if message is requesting a story.
         
+        Kept for existing callers; delegates to the combined classification
+        prompt, whose JSON answer holds the verdict under "story_request".
+        
         Args:
             message: User's message
             
         Returns:
-            Formatted detection prompt
+            Formatted classification prompt
         """
-        return f"""Is this a story request?
-
-Message: "{message}"
-
-Story requests: "tell me a story", "add a lion", "change the ending", "continue"
-
-Answer YES or NO:"""
+        return ConversationalPrompts.get_combined_classification_prompt(message)
 
     @staticmethod
     def get_self_inquiry_detection_prompt(message: str) -> str:
         """
         Prompt for detecting if user is asking about themselves.
         
+        Kept for existing callers; delegates to the combined classification
+        prompt, whose JSON answer holds the verdict under "self_inquiry".
+        
         Args:
             message: User's message
             
         Returns:
-            Formatted detection prompt
+            Formatted classification prompt
         """
-        return f"""Is this message asking about the user's own information (name, age, etc.)?
-
-Examples:
-- "what is my name?"
-- "do you remember me?"
-- "who am I?"
-
-Message: "{message}"
+        return ConversationalPrompts.get_combined_classification_prompt(message)
 
-Answer with ONLY "yes" or "no"."""
+    @staticmethod
+    @lru_cache(maxsize=PROMPT_CACHE_SIZE)
+    def get_combined_classification_prompt(message: str) -> str:
+        """
+        Prompt for story-request, self-inquiry and user-info detection in one call.
+        
+        Args:
+            message: User's message
+            
+        Returns:
+            Formatted classification prompt (answer is a JSON object)
+        """
+        prefix, suffix = ConversationalPrompts._COMBINED_CLASSIFICATION_PARTS
+        return "".join((prefix, message, suffix))
 
 
 # ============================================================================
@@ -205,15 +387,8 @@ Answer with ONLY "yes" or "no"."""
 class StorytellerPrompts:
     """Prompts for the storyteller agent."""
     
-    @staticmethod
-    def get_system_prompt() -> str:
-        """
-        System prompt for storyteller agent.
-        
-        Returns:
-            Storyteller system prompt
-        """
-        return """You are a master children's storyteller who creates magical, engaging stories for kids aged 5-14 years old.
+    # Static templates, built once (interned) and filled with format_map
+    _SYSTEM_PROMPT = sys.intern("""You are a master children's storyteller who creates magical, engaging stories for kids aged 5-14 years old.
 
 Your storytelling style:
 - Warm, engaging, and imaginative
@@ -222,85 +397,30 @@ Your storytelling style:
 - Builds exciting but age-appropriate adventures
 - Includes positive messages and gentle life lessons
 - Perfect for reading aloud or bedtime
-- Always appropriate and safe for children"""
-
-    @staticmethod
-    def get_story_creation_prompt(
-        prompt: str,
-        target_word_count: str,
-        length_type: str,
-        previous_context: str = ""
-    ) -> str:
-        """
-        Prompt for creating a new story or modifying an existing one.
-        
-        Args:
-            prompt: Story idea/theme OR modification request with PREVIOUS_STORY
-            target_word_count: Target word count range (e.g., "300-400")
-            length_type: "short", "medium", or "long"
-            previous_context: Optional context from previous stories
-            
-        Returns:
-            Formatted story creation prompt
-        """
-        # Check if this is a modification request
-        if "MODIFY_STORY:" in prompt and "PREVIOUS_STORY:" in prompt:
-            # Extract modification request and previous story
-            parts = prompt.split("PREVIOUS_STORY:")
-            modification_request = parts[0].replace("MODIFY_STORY:", "").strip()
-            previous_story = parts[1].strip()
-            
-            # Paragraph structure requirements based on length type
-            if length_type == "short":
-                structure = "EXACTLY 2 paragraphs"
-            else:
-                structure = "EXACTLY 3 paragraphs"
-            
-            return f"""MODIFY the following story based on the user's request.
-
-USER'S MODIFICATION REQUEST: "{modification_request}"
-
-PREVIOUS STORY:
-{previous_story}
-
-CRITICAL INSTRUCTIONS:
-✓ Keep the SAME title, characters, setting, and plot structure
-✓ Only ADD or CHANGE what the user specifically requested
-✓ Maintain the same tone, style, and moral
-✓ Keep it {structure} with single blank line separators
-✓ Target word count: {target_word_count} words
-✓ Age range: 5-14 years old
-
-Example modifications:
-- "add a boy named Vamshi" → Insert Vamshi as a new character, keep everything else
-- "add a lion" → Introduce a lion into the existing story without changing the plot
-- "change the ending" → Keep the story the same but write a different conclusion
-
-📝 FORMAT:
-TITLE: [Keep the SAME title]
-STORY: [Modified story with user's changes incorporated]"""
-        
-        # Regular new story creation
-        # Paragraph structure requirements based on length type
-        if length_type == "short":
-            structure = """
+- Always appropriate and safe for children""")
+    
+    _REFINEMENT_SYSTEM_PROMPT = sys.intern("""You are a master children's storyteller who creates magical, engaging stories for kids aged 5-14 years old.
+You excel at taking feedback and improving stories while keeping what makes them special.""")
+    
+    _CREATION_STRUCTURES = {
+        "short": sys.intern("""
 STRUCTURE (IMPORTANT):
 - Write the story in EXACTLY 2 paragraphs.
   1) Introduction (setup characters and setting)
   2) Conclusion (resolve and state the gentle moral)
 - Separate paragraphs with a single blank line.
-"""
-        else:
-            structure = """
+"""),
+        "long": sys.intern("""
 STRUCTURE (IMPORTANT):
 - Write the story in EXACTLY 3 paragraphs.
   1) Introduction (setup characters and setting)
   2) Extension/Development (the adventure or challenge grows)
   3) Conclusion (resolution and gentle moral)
 - Separate paragraphs with a single blank line.
-"""
-
-        return f"""Create a wonderful story based on this idea: "{prompt}"
+"""),
+    }
+    
+    _CREATION_TEMPLATE = sys.intern("""Create a wonderful story based on the story idea given at the end.
 
 📖 STORY REQUIREMENTS:
 ✓ Word count: {target_word_count} words
@@ -324,12 +444,164 @@ STRUCTURE (IMPORTANT):
 - Keep sentences short and clear
 - Include moments of excitement or wonder
 - End on a positive, satisfying note
-- Make it memorable!{previous_context}
+- Make it memorable!
 {structure}
 
 📝 FORMAT (IMPORTANT):
 TITLE: [Your creative story title]
-STORY: [Your complete story here]"""
+STORY: [Your complete story here]{previous_context}
+
+STORY IDEA: "{prompt}"
+""")
+    
+    # Creation template with the paragraph structure filled in per length
+    _CREATION_TEMPLATES = {
+        "short": sys.intern(_CREATION_TEMPLATE.replace("{structure}", _CREATION_STRUCTURES["short"])),
+        "long": sys.intern(_CREATION_TEMPLATE.replace("{structure}", _CREATION_STRUCTURES["long"])),
+    }
+    
+    # Instructions first, the request and previous story last (prefix cache)
+    _MODIFICATION_TEMPLATE = """MODIFY the previous story below based on the user's request.
+
+CRITICAL INSTRUCTIONS:
+✓ Keep the SAME title, characters, setting, and plot structure
+✓ Only ADD or CHANGE what the user specifically requested
+✓ Maintain the same tone, style, and moral
+✓ Keep it {paragraphs} with single blank line separators
+✓ Target word count: {target_word_count} words
+✓ Age range: 5-14 years old
+
+Example modifications:
+- "add a boy named Vamshi" → Insert Vamshi as a new character, keep everything else
+- "add a lion" → Introduce a lion into the existing story without changing the plot
+- "change the ending" → Keep the story the same but write a different conclusion
+
+📝 FORMAT:
+TITLE: [Keep the SAME title]
+STORY: [Modified story with user's changes incorporated]
+
+USER'S MODIFICATION REQUEST: "{modification_request}"
+
+PREVIOUS STORY:
+{previous_story}"""
+    
+    _MODIFICATION_TEMPLATES = {
+        "short": sys.intern(_MODIFICATION_TEMPLATE.replace("{paragraphs}", "EXACTLY 2 paragraphs")),
+        "long": sys.intern(_MODIFICATION_TEMPLATE.replace("{paragraphs}", "EXACTLY 3 paragraphs")),
+    }
+    
+    # (is_modification, length_type) -> template; medium uses the 3-paragraph layout
+    _STORY_PROMPT_TEMPLATES = {
+        (False, "short"): _CREATION_TEMPLATES["short"],
+        (False, "medium"): _CREATION_TEMPLATES["long"],
+        (False, "long"): _CREATION_TEMPLATES["long"],
+        (True, "short"): _MODIFICATION_TEMPLATES["short"],
+        (True, "medium"): _MODIFICATION_TEMPLATES["long"],
+        (True, "long"): _MODIFICATION_TEMPLATES["long"],
+    }
+    
+    _REFINEMENT_STRUCTURES = {
+        "short": sys.intern("""
+STRUCTURE (KEEP THIS):
+- Keep EXACTLY 2 paragraphs: Introduction, then Conclusion.
+- Separate paragraphs with a single blank line.
+"""),
+        "long": sys.intern("""
+STRUCTURE (KEEP THIS):
+- Keep EXACTLY 3 paragraphs: Introduction, Extension/Development, Conclusion.
+- Separate paragraphs with a single blank line.
+"""),
+    }
+    
+    # Static guidance first, the story and its feedback last, so the
+    # provider's prefix cache covers the instructions
+    _REFINEMENT_TEMPLATE = sys.intern("""📝 YOUR TASK:
+Revise the story below to address the feedback while keeping the core idea and what makes it special.
+
+GUIDELINES FOR REVISION:
+- Fix any issues mentioned in feedback
+- Keep the story fun and engaging
+- Maintain child-appropriate language (ages 5-14)
+- Ensure the moral/lesson is clear but not preachy
+- Keep the magical feeling of the story
+- Make improvements without changing the main idea
+{structure}
+
+FORMAT YOUR RESPONSE:
+TITLE: [improved story title]
+STORY: [improved story content]
+
+CURRENT STORY:
+TITLE: {title}
+STORY: {content}
+
+The story needs improvement based on this feedback:
+
+{feedback}""")
+    
+    # Refinement template per length type, with the structure guidance baked
+    # in ("" when no length type is given); medium uses the 3-paragraph layout
+    _REFINEMENT_TEMPLATES = {
+        "": sys.intern(_REFINEMENT_TEMPLATE.replace("{structure}", "")),
+        "short": sys.intern(_REFINEMENT_TEMPLATE.replace("{structure}", _REFINEMENT_STRUCTURES["short"])),
+        "long": sys.intern(_REFINEMENT_TEMPLATE.replace("{structure}", _REFINEMENT_STRUCTURES["long"])),
+    }
+    _REFINEMENT_TEMPLATES["medium"] = _REFINEMENT_TEMPLATES["long"]
+    
+    @staticmethod
+    def get_system_prompt() -> str:
+        """
+        System prompt for storyteller agent.
+        
+        Returns:
+            Storyteller system prompt
+        """
+        return StorytellerPrompts._SYSTEM_PROMPT
+
+    @staticmethod
+    def get_story_creation_prompt(
+        prompt: str,
+        target_word_count: str,
+        length_type: str,
+        previous_context: str = ""
+    ) -> str:
+        """
+        Prompt for creating a new story or modifying an existing one.
+        
+        Args:
+            prompt: Story idea/theme OR modification request with PREVIOUS_STORY
+            target_word_count: Target word count range (e.g., "300-400")
+            length_type: "short", "medium", or "long"
+            previous_context: Optional context from previous stories
+            
+        Returns:
+            Formatted story creation prompt
+        """
+        # Paragraph structure is baked into the templates, so picking the
+        # template is a single lookup
+        is_modification = StoryMarkers.MODIFY in prompt and StoryMarkers.PREVIOUS_STORY in prompt
+        templates = StorytellerPrompts._STORY_PROMPT_TEMPLATES
+        template = templates.get((is_modification, length_type)) or templates[(is_modification, "long")]
+        
+        if is_modification:
+            # Everything after the first marker is the previous story
+            request_part, _, previous_story = prompt.partition(StoryMarkers.PREVIOUS_STORY)
+            
+            return template.format_map({
+                "modification_request": request_part.replace(StoryMarkers.MODIFY, "").strip(),
+                "previous_story": previous_story.strip(),
+                "target_word_count": target_word_count
+            })
+        
+        # Regular new story creation
+        # Everything that only depends on the length settings comes first and
+        # the per-request parts (previous stories, the idea) come last, so
+        # the provider's prefix cache covers the instructions
+        return template.format_map({
+            "prompt": prompt,
+            "target_word_count": target_word_count,
+            "previous_context": previous_context
+        })
 
     @staticmethod
     def get_refinement_prompt(
@@ -350,45 +622,15 @@ STORY: [Your complete story here]"""
         Returns:
             Formatted refinement prompt
         """
-        # Structure guidance for revision if provided
-        structure = ""
-        if length_type:
-            if length_type == "short":
-                structure = """
-STRUCTURE (KEEP THIS):
-- Keep EXACTLY 2 paragraphs: Introduction, then Conclusion.
-- Separate paragraphs with a single blank line.
-"""
-            else:
-                structure = """
-STRUCTURE (KEEP THIS):
-- Keep EXACTLY 3 paragraphs: Introduction, Extension/Development, Conclusion.
-- Separate paragraphs with a single blank line.
-"""
-
-        return f"""The story needs improvement based on this feedback:
-
-{feedback}
-
-📝 YOUR TASK:
-Revise the story to address the feedback while keeping the core idea and what makes it special.
-
-CURRENT STORY:
-TITLE: {title}
-STORY: {content}
-
-GUIDELINES FOR REVISION:
-- Fix any issues mentioned in feedback
-- Keep the story fun and engaging
-- Maintain child-appropriate language (ages 5-14)
-- Ensure the moral/lesson is clear but not preachy
-- Keep the magical feeling of the story
-- Make improvements without changing the main idea
-{structure}
-
-FORMAT YOUR RESPONSE:
-TITLE: [improved story title]
-STORY: [improved story content]"""
+        # Structure guidance for revision is baked into the template
+        templates = StorytellerPrompts._REFINEMENT_TEMPLATES
+        template = templates.get(length_type or "", templates["long"])
+        
+        return template.format_map({
+            "title": title,
+            "content": content,
+            "feedback": feedback
+        })
 
     @staticmethod
     def get_refinement_system_prompt() -> str:
@@ -398,8 +640,7 @@ STORY: [improved story content]"""
         Returns:
             Refinement system prompt
         """
-        return """You are a master children's storyteller who creates magical, engaging stories for kids aged 5-14 years old.
-You excel at taking feedback and improving stories while keeping what makes them special."""
+        return StorytellerPrompts._REFINEMENT_SYSTEM_PROMPT
 
 
 # ============================================================================
@@ -409,6 +650,54 @@ You excel at taking feedback and improving stories while keeping what makes them
 class JudgePrompts:
     """Prompts for the judge agent."""
     
+    # Static templates, built once (interned) and filled with format_map
+    _SYSTEM_PROMPT = sys.intern("You are a children's content quality judge.")
+    
+    # Static rubric first, the story last, so the provider's prefix cache
+    # covers the instructions
+    _EVALUATION_TEMPLATE = sys.intern("""Evaluate the bedtime story below for ages 5-10.
+
+Evaluate this story on:
+1. Clarity (1-10): Is the language simple and clear for 5-10 year olds?
+2. Moral Value (1-10): Does it teach a gentle, positive lesson?
+3. Age Appropriateness (1-10): Is it suitable and engaging for the target age?
+
+Respond ONLY with a JSON object with these keys:
+{{
+  "clarity": [score 1-10],
+  "moralValue": [score 1-10],
+  "ageAppropriateness": [score 1-10],
+  "score": [overall score 1-10],
+  "approved": [true or false],
+  "feedback": "[specific suggestions for improvement if not approved, or praise if approved]"
+}}
+
+Story Title: {title}
+Story Content:
+{content}""")
+    
+    _BATCH_EVALUATION_INSTRUCTIONS = sys.intern("""Evaluate each of the bedtime stories below for ages 5-10.
+
+Evaluate each story on:
+1. Clarity (1-10): Is the language simple and clear for 5-10 year olds?
+2. Moral Value (1-10): Does it teach a gentle, positive lesson?
+3. Age Appropriateness (1-10): Is it suitable and engaging for the target age?
+
+Respond ONLY with a JSON object holding one evaluation per story, in story order:
+{
+  "evaluations": [
+    {
+      "story": [story number],
+      "clarity": [score 1-10],
+      "moralValue": [score 1-10],
+      "ageAppropriateness": [score 1-10],
+      "score": [overall score 1-10],
+      "approved": [true or false],
+      "feedback": "[specific suggestions for improvement if not approved, or praise if approved]"
+    }
+  ]
+}""")
+    
     @staticmethod
     def get_system_prompt() -> str:
         """
@@ -417,7 +706,7 @@ class JudgePrompts:
         Returns:
             Judge system prompt
         """
-        return "You are a children's content quality judge."
+        return JudgePrompts._SYSTEM_PROMPT
 
     @staticmethod
     def get_evaluation_prompt(title: str, content: str) -> str:
@@ -431,29 +720,111 @@ class JudgePrompts:
         Returns:
             Formatted evaluation prompt
         """
-        return f"""Evaluate this bedtime story for ages 5-10.
+        return JudgePrompts._EVALUATION_TEMPLATE.format_map({"title": title, "content": content})
 
-Story Title: {title}
-Story Content:
-{content}
+    @staticmethod
+    def get_batch_evaluation_prompt(stories: List[Dict]) -> str:
+        """
+        Prompt for evaluating several stories in one request.
+        
+        Args:
+            stories: List of dicts with 'title' and 'content'
+            
+        Returns:
+            Formatted batch evaluation prompt
+        """
+        story_blocks = "\n\n".join(
+            f"### STORY {i}\nStory Title: {story['title']}\nStory Content:\n{story['content']}"
+            for i, story in enumerate(stories, start=1)
+        )
+        
+        return "".join((
+            JudgePrompts._BATCH_EVALUATION_INSTRUCTIONS,
+            f"\n\nThere are {len(stories)} stories.\n\n",
+            story_blocks
+        ))
 
-Evaluate this story on:
+
+
+# ============================================================================
+# ORCHESTRATOR PROMPTS (create + evaluate in one request)
+# ============================================================================
+
+class OrchestratorPrompts:
+    """Prompts for writing and scoring a story in a single LLM call."""
+    
+    # Line separating the story from its self-evaluation in the response
+    EVALUATION_SEPARATOR = "=== EVALUATION ==="
+    
+    # Self-evaluation instructions; they are static, so they live in the
+    # system prompt and stay ahead of the per-request story idea
+    _EVALUATION_INSTRUCTIONS = sys.intern(f"""After writing the story, as the judge, evaluate it for ages 5-10 on:
 1. Clarity (1-10): Is the language simple and clear for 5-10 year olds?
 2. Moral Value (1-10): Does it teach a gentle, positive lesson?
 3. Age Appropriateness (1-10): Is it suitable and engaging for the target age?
 
-Provide your evaluation in this exact format:
-CLARITY: [score]
-MORAL: [score]
-AGE_APPROPRIATE: [score]
-OVERALL: [score out of 10]
-APPROVED: [YES or NO]
-FEEDBACK: [specific suggestions for improvement if not approved, or praise if approved]"""
+Write the evaluation after the story: first this exact line, then ONLY a JSON object with these keys:
+{EVALUATION_SEPARATOR}
+{{
+  "clarity": [score 1-10],
+  "moralValue": [score 1-10],
+  "ageAppropriateness": [score 1-10],
+  "score": [overall score 1-10],
+  "approved": [true or false],
+  "feedback": "[one or two sentences: specific suggestions if not approved, or praise if approved]"
+}}""")
+    
+    # Both role prompts are static, so the combined prompt is built once
+    _SYSTEM_PROMPT = sys.intern(f"""=== ROLE 1: STORYTELLER ===
+{StorytellerPrompts.get_system_prompt()}
+
+=== ROLE 2: JUDGE ===
+{JudgePrompts.get_system_prompt()}
+After writing a story, you review it honestly and strictly, as an independent judge would.
 
+=== OUTPUT ===
+{_EVALUATION_INSTRUCTIONS}""")
+    
+    @staticmethod
+    def get_system_prompt() -> str:
+        """
+        Combined storyteller + judge system prompt.
+        
+        Returns:
+            Orchestrator system prompt
+        """
+        return OrchestratorPrompts._SYSTEM_PROMPT
+
+    @staticmethod
+    def get_create_and_evaluate_prompt(
+        prompt: str,
+        target_word_count: str,
+        length_type: str,
+        previous_context: str = ""
+    ) -> str:
+        """
+        Prompt asking for a story; the system prompt asks for the evaluation.
+        
+        Args:
+            prompt: Story idea/theme OR modification request with PREVIOUS_STORY
+            target_word_count: Target word count range (e.g., "300-400")
+            length_type: "short", "medium", or "long"
+            previous_context: Optional context from previous stories
+            
+        Returns:
+            Formatted create-and-evaluate prompt
+        """
+        return StorytellerPrompts.get_story_creation_prompt(
+            prompt=prompt,
+            target_word_count=target_word_count,
+            length_type=length_type,
+            previous_context=previous_context
+        )
 
 
 __all__ = [
     'ConversationalPrompts',
     'StorytellerPrompts',
     'JudgePrompts',
+    'OrchestratorPrompts',
 ]
@@ -6,13 +6,34 @@ API settings, and application constants.
 """
 
 import os
-from typing import List, Optional
+import sys
+from typing import List, Optional, Tuple
 from dataclasses import dataclass, field
 from dotenv import load_dotenv
-load_dotenv()
 
+# backend/.env, the documented location. Loaded by explicit path (no
+# directory walk) and skipped when the environment is provided externally
+# (SKIP_DOTENV=1) or the file does not exist; real env vars always win.
+_DOTENV_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env")
+if os.getenv("SKIP_DOTENV") != "1" and os.path.isfile(_DOTENV_PATH):
+    load_dotenv(_DOTENV_PATH, override=False, interpolate=False)
 
-@dataclass
+
+def _env_model_list(name: str) -> Optional[List[str]]:
+    """
+    Read a comma-separated model list from the environment.
+    
+    Args:
+        name: Environment variable name
+        
+    Returns:
+        Model names in order, or None if the variable is unset or empty
+    """
+    models = [m.strip() for m in os.getenv(name, "").split(",")]
+    return [m for m in models if m] or None
+
+
+@dataclass(frozen=True, slots=True)
 class APIConfig:
     """API and service configuration."""
     
@@ -22,7 +43,19 @@ class APIConfig:
     
     # LangSmith Configuration
     LANGSMITH_PROJECT: str = field(default_factory=lambda: os.getenv("LANGSMITH_PROJECT", "bedtime-stories"))
-    LANGCHAIN_TRACING_V2: str = "true"
+    # Resolved once; the agents turn tracing on (into LANGSMITH_PROJECT)
+    # whenever a LangSmith key is configured
+    LANGCHAIN_TRACING_V2: bool = field(default_factory=lambda: (
+        os.getenv("LANGCHAIN_TRACING_V2", "false").lower() == "true"
+        or bool(os.getenv("LANGSMITH_API_KEY"))
+    ))
+    LANGCHAIN_PROJECT: str = field(default_factory=lambda: (
+        os.getenv("LANGSMITH_PROJECT", "bedtime-stories") if os.getenv("LANGSMITH_API_KEY")
+        else os.getenv("LANGCHAIN_PROJECT", "bedtime-stories")
+    ))
+    
+    # Requests running LLM work at once; more are rejected with 503
+    MAX_CONCURRENT_LLM_REQUESTS: int = field(default_factory=lambda: int(os.getenv("MAX_CONCURRENT_LLM_REQUESTS", "16")))
     
     def __post_init__(self):
         """Validate required configuration."""
@@ -30,7 +63,7 @@ class APIConfig:
             raise ValueError("GROQ_API_KEY environment variable is required")
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LLMConfig:
     """LLM model configuration."""
     
@@ -44,26 +77,29 @@ class LLMConfig:
     # Storyteller Configuration
     STORYTELLER_TEMPERATURE: float = 0.8
     STORYTELLER_MAX_TOKENS: int = 700
-    STORYTELLER_MODELS: Optional[List[str]] = field(default_factory=lambda: (
-        [m.strip() for m in os.getenv("GROQ_MODEL_STORYTELLER", "").split(",") if m.strip()]
-        or None
-    ))
+    STORYTELLER_MODELS: Optional[List[str]] = field(default_factory=lambda: _env_model_list("GROQ_MODEL_STORYTELLER"))
     
     # Judge Configuration  
     JUDGE_TEMPERATURE: float = 0.3
     JUDGE_MAX_TOKENS: int = 300
-    JUDGE_MODELS: Optional[List[str]] = field(default_factory=lambda: (
-        [m.strip() for m in os.getenv("GROQ_MODEL_JUDGE", "").split(",") if m.strip()]
-        or None
-    ))
+    JUDGE_MODELS: Optional[List[str]] = field(default_factory=lambda: _env_model_list("GROQ_MODEL_JUDGE"))
     
     # Conversational Agent Configuration
     CONVERSATION_TEMPERATURE: float = 0.7
     CONVERSATION_MAX_TOKENS: int = 300
-    CONVERSATION_MODELS: Optional[List[str]] = field(default_factory=lambda: (
-        [m.strip() for m in os.getenv("GROQ_MODEL_CONVERSATION", "").split(",") if m.strip()]
-        or None
-    ))
+    CONVERSATION_MODELS: Optional[List[str]] = field(default_factory=lambda: _env_model_list("GROQ_MODEL_CONVERSATION"))
+    
+    # Filled in by __post_init__
+    _models_by_type: dict = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Resolve each agent type's model list (with fallback) once."""
+        # Frozen dataclass: set the derived field through object.__setattr__
+        object.__setattr__(self, "_models_by_type", {
+            "storyteller": self.STORYTELLER_MODELS or self.DEFAULT_MODELS,
+            "judge": self.JUDGE_MODELS or self.DEFAULT_MODELS,
+            "conversation": self.CONVERSATION_MODELS or self.DEFAULT_MODELS,
+        })
     
     def get_models(self, agent_type: str) -> List[str]:
         """
@@ -75,16 +111,10 @@ class LLMConfig:
         Returns:
             List of model names to try
         """
-        if agent_type == "storyteller":
-            return self.STORYTELLER_MODELS or self.DEFAULT_MODELS
-        elif agent_type == "judge":
-            return self.JUDGE_MODELS or self.DEFAULT_MODELS
-        elif agent_type == "conversation":
-            return self.CONVERSATION_MODELS or self.DEFAULT_MODELS
-        return self.DEFAULT_MODELS
+        return self._models_by_type.get(agent_type, self.DEFAULT_MODELS)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ServerConfig:
     """Server and CORS configuration."""
     
@@ -93,17 +123,18 @@ class ServerConfig:
     PORT: int = 8001
     DEBUG: bool = field(default_factory=lambda: os.getenv("DEBUG", "false").lower() == "true")
     
-    # CORS Settings
-    CORS_ORIGINS: List[str] = field(default_factory=lambda: [
+    # CORS Settings (immutable tuples, so plain shared defaults; the
+    # strings are interned once since the middleware compares them per request)
+    CORS_ORIGINS: Tuple[str, ...] = tuple(map(sys.intern, (
         "http://localhost:5175",
         "http://localhost:3000"
-    ])
+    )))
     CORS_ALLOW_CREDENTIALS: bool = True
-    CORS_ALLOW_METHODS: List[str] = field(default_factory=lambda: ["*"])
-    CORS_ALLOW_HEADERS: List[str] = field(default_factory=lambda: ["*"])
+    CORS_ALLOW_METHODS: Tuple[str, ...] = (sys.intern("*"),)
+    CORS_ALLOW_HEADERS: Tuple[str, ...] = (sys.intern("*"),)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StorageConfig:
     """JSON storage configuration."""
     
@@ -112,7 +143,7 @@ class StorageConfig:
     CONVERSATIONS_FILE: str = "conversations.json"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class StoryConfig:
     """Story generation configuration."""
     
@@ -130,6 +161,8 @@ class StoryConfig:
     # Story Generation
     MAX_ITERATIONS: int = 3
     MIN_QUALITY_SCORE: int = 7
+    # Refinement drafts written concurrently per iteration (best one is kept; 1 disables)
+    REFINEMENT_CANDIDATES: int = 2
     
     # Paragraph Structure
     PARAGRAPH_STRUCTURE: dict = field(default_factory=lambda: {
@@ -146,6 +179,8 @@ class Settings:
     Provides centralized access to all configuration settings.
     """
     
+    __slots__ = ("api", "llm", "server", "storage", "story")
+    
     def __init__(self):
         self.api = APIConfig()
         self.llm = LLMConfig()
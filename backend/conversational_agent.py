@@ -12,6 +12,7 @@ Author: Refactored for production use
 
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
+import json
 import os
 import re
 import uuid
@@ -19,7 +20,57 @@ import uuid
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from cache import TTLCache, content_hash
+from config.constants import CacheConfig, RegexPatterns, StoryMarkers
 from config.prompts import ConversationalPrompts
+from http_pool import get_chat_client
+from utils import run_blocking, setup_logger
+
+logger = setup_logger(__name__)
+
+# Verdicts of the per-message classifier prompts; short replies ("yes",
+# "tell me a story") repeat constantly and each one is a full Groq call
+_CLASSIFIER_CACHE = TTLCache(
+    maxsize=CacheConfig.CLASSIFIER_CACHE_SIZE,
+    ttl=CacheConfig.CLASSIFIER_CACHE_TTL_SECONDS
+)
+
+
+# Messages that plainly ask for a story are classified without the LLM;
+# negated ones ("no more stories") still go to the LLM
+_STORY_REQUEST_RE = re.compile(
+    r"\b(?:tell|read|write|make|create|give|want|another|new)\b[^.?!]{0,30}?"
+    r"\b(?:stor(?:y|ies)|(?:fairy ?)?tales?)\b",
+    re.IGNORECASE
+)
+_NEGATION_RE = re.compile(r"\b(?:no|not|don'?t|do not|stop|never|enough)\b", re.IGNORECASE)
+# Keyword fallback for self-inquiries: questions about the user, not
+# introductions ("my name is Sam")
+_SELF_INQUIRY_RE = re.compile(
+    r"\b(?:what(?:'?s| is) my (?:name|age)|who am i|how old am i|do you (?:remember|know) (?:me|my))\b",
+    re.IGNORECASE
+)
+_CODE_FENCE_RE = re.compile(r'^\s*```(?:json)?|```\s*$', re.IGNORECASE)
+
+
+def _is_plain_story_request(message: str) -> bool:
+    """
+    True for an obvious story request that cannot also be an introduction
+    or a question about the user, so it needs no LLM classification
+    """
+    if not _STORY_REQUEST_RE.search(message) or _NEGATION_RE.search(message):
+        return False
+    message_lower = message.lower()
+    return not (
+        RegexPatterns.NAME_PATTERN.search(message_lower)
+        or RegexPatterns.AGE_PATTERN.search(message_lower)
+        or _SELF_INQUIRY_RE.search(message)
+    )
+
+
+def _classifier_key(kind: str, message: str) -> str:
+    """Cache key for a classifier verdict, ignoring case and whitespace"""
+    return content_hash(kind, " ".join(message.lower().split()))
 
 
 @dataclass
@@ -91,15 +142,16 @@ class ConversationalAgent:
         self._setup_langsmith_tracing(langsmith_api_key)
         self.model_candidates = self._load_model_candidates()
         
-        self.llm = ChatGroq(
-            model=self.model_candidates[0],
-            api_key=self.groq_api_key,
-            temperature=self.config.TEMPERATURE,
-            max_tokens=self.config.MAX_TOKENS
-        )
+        # One client per model, reused across calls and fallbacks
+        self._llm_cache: Dict[str, ChatGroq] = {}
+        self.llm = self._client_for(self.model_candidates[0])
         self.current_model = self.model_candidates[0]
         
         self.sessions: Dict[str, Dict[str, any]] = {}
+        # Fixed for the agent's lifetime; build its prompt header up front so
+        # no chat request pays for it
+        self.age_range = (self.config.MIN_AGE, self.config.MAX_AGE)
+        ConversationalPrompts.get_conversational_header(self.age_range)
         self._log_initialization()
     
     def _setup_langsmith_tracing(self, api_key: Optional[str]) -> None:
@@ -141,11 +193,32 @@ class ConversationalAgent:
     
     def _log_initialization(self) -> None:
         """Log successful initialization with configuration details."""
-        print(
-            f"✅ Conversational Agent initialized (Groq) with model fallback: "
-            f"{', '.join(self.model_candidates)}"
+        logger.info(
+            "✅ Conversational Agent initialized (Groq) with model fallback: %s",
+            ", ".join(self.model_candidates)
         )
     
+    def _client_for(self, model_name: str) -> ChatGroq:
+        """
+        Return the shared ChatGroq client for a model.
+        
+        Args:
+            model_name: Groq model name
+            
+        Returns:
+            ChatGroq client bound to the shared HTTP pool
+        """
+        llm = self._llm_cache.get(model_name)
+        if llm is None:
+            llm = get_chat_client(
+                model_name,
+                self.groq_api_key,
+                self.config.TEMPERATURE,
+                self.config.MAX_TOKENS
+            )
+            self._llm_cache[model_name] = llm
+        return llm
+    
     def _get_session(self, session_id: Optional[str] = None) -> Dict[str, any]:
         """
         Retrieve or create a session context.
@@ -196,13 +269,8 @@ class ConversationalAgent:
         for attempt, model_name in enumerate(self.model_candidates, start=1):
             try:
                 if model_name != self.current_model:
-                    print(f"Conversational Agent switching to model: {model_name}")
-                    self.llm = ChatGroq(
-                        model=model_name,
-                        api_key=self.groq_api_key,
-                        temperature=self.config.TEMPERATURE,
-                        max_tokens=self.config.MAX_TOKENS
-                    )
+                    logger.info("Conversational Agent switching to model: %s", model_name)
+                    self.llm = self._client_for(model_name)
                     self.current_model = model_name
                 
                 return self.llm.invoke(messages)
@@ -211,7 +279,7 @@ class ConversationalAgent:
                 last_error = e
                 error_msg = str(e).lower()
                 
-                print(f"⚠️ Model '{model_name}' failed (attempt {attempt}/{len(self.model_candidates)}): {e}")
+                logger.warning("⚠️ Model '%s' failed (attempt %s/%s): %s", model_name, attempt, len(self.model_candidates), e)
                 
                 is_retryable = any(
                     keyword in error_msg 
@@ -219,7 +287,7 @@ class ConversationalAgent:
                 )
                 
                 if is_retryable and attempt < len(self.model_candidates):
-                    print("↪️ Trying next Groq model...")
+                    logger.info("↪️ Trying next Groq model...")
                     continue
                 else:
                     break
@@ -228,45 +296,96 @@ class ConversationalAgent:
         raise last_error or RuntimeError("All Groq models failed for conversation")
     
     
-    def extract_user_info(self, message: str, session_id: Optional[str] = None) -> None:
+    def classify_message(self, message: str, session_id: Optional[str] = None) -> Dict:
         """
-        Extract and store user information (name, age) from message.
+        Classify a message with one LLM call: story request, self-inquiry
+        and self-introduction details.
         
-        Uses regex patterns to detect when users introduce themselves or
-        mention their age. Updates the session context accordingly.
+        The verdict is cached per message, so extract_user_info,
+        is_question_about_self and should_generate_story share the call.
+        Obvious story requests with no possible introduction skip the LLM.
         
         Args:
             message: User's message text
-            session_id: Session ID to update
+            session_id: Optional session ID for context
+            
+        Returns:
+            Dictionary with 'story_request' (bool), 'self_inquiry' (bool)
+            and 'user_info' ({'name', 'age'}, either may be None)
         """
-        ctx = self._get_session(session_id)
+        # Plain story requests are decided locally, without a Groq call
+        if _is_plain_story_request(message):
+            return {
+                "story_request": True,
+                "self_inquiry": False,
+                "user_info": {"name": None, "age": None}
+            }
         
-        # Use LLM to extract user information intelligently
-        extraction_prompt = ConversationalPrompts.get_user_info_extraction_prompt(message)
+        cache_key = _classifier_key("classification", message)
+        cached = _CLASSIFIER_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        prompt = ConversationalPrompts.get_combined_classification_prompt(message)
         
         try:
             messages = [
-                SystemMessage(content=extraction_prompt),
-                HumanMessage(content="Extract the information")
+                SystemMessage(content=prompt),
+                HumanMessage(content="Classify the message")
             ]
             
             response = self._invoke_with_fallback(messages, session_id=session_id)
+            data = json.loads(_CODE_FENCE_RE.sub("", response.content.strip()))
+            user_info = data.get("user_info") or {}
             
-            # Parse JSON response
-            import json
-            info = json.loads(response.content.strip())
-            
-            if info.get('name'):
-                ctx['name'] = info['name'].capitalize()
-                print(f"📝 Learned user's name: {ctx['name']}")
+            classification = {
+                "story_request": data.get("story_request") is True,
+                "self_inquiry": data.get("self_inquiry") is True,
+                "user_info": {
+                    "name": user_info.get("name"),
+                    "age": user_info.get("age")
+                }
+            }
+        except Exception as e:
+            logger.warning("⚠️ Failed to classify message: %s", e)
+            # Fallback: simple keyword checks if the LLM fails (not cached)
+            message_lower = message.lower()
+            return {
+                "story_request": 'story' in message_lower or 'tale' in message_lower,
+                "self_inquiry": bool(_SELF_INQUIRY_RE.search(message)),
+                "user_info": {"name": None, "age": None}
+            }
+        
+        _CLASSIFIER_CACHE.set(cache_key, classification)
+        return classification
+    
+    def extract_user_info(self, message: str, session_id: Optional[str] = None) -> None:
+        """
+        Extract and store user information (name, age) from message.
+        
+        Uses the combined message classification to detect when users
+        introduce themselves or mention their age. Updates the session
+        context accordingly.
+        
+        Args:
+            message: User's message text
+            session_id: Session ID to update
+        """
+        ctx = self._get_session(session_id)
+        info = self.classify_message(message, session_id)["user_info"]
+        
+        try:
+            name = info.get('name')
+            if name and str(name).lower() != 'null':
+                ctx['name'] = str(name).capitalize()
+                logger.info("📝 Learned user's name: %s", ctx['name'])
             
             if info.get('age'):
                 ctx['age'] = int(info['age'])
-                print(f"📝 Learned user's age: {ctx['age']}")
+                logger.info("📝 Learned user's age: %s", ctx['age'])
                 
-        except Exception as e:
-            # ✅ FIX: Log errors instead of silently hiding them
-            print(f"⚠️ Failed to extract user info: {e}")
+        except (TypeError, ValueError) as e:
+            logger.warning("⚠️ Failed to extract user info: %s", e)
     
     
     def is_inappropriate_content(
@@ -287,6 +406,18 @@ class ConversationalAgent:
         Returns:
             True if content is inappropriate for children, False otherwise
         """
+        # Local screen first: plainly unsafe words are rejected without the LLM
+        if RegexPatterns.UNSAFE_STORY_WORDS.search(message):
+            logger.warning("⚠️ Content filter: Message flagged as inappropriate")
+            return True
+        
+        cache_key = _classifier_key("safety", message)
+        cached = _CLASSIFIER_CACHE.get(cache_key)
+        if cached is not None:
+            if cached:
+                logger.warning("⚠️ Content filter: Message flagged as inappropriate")
+            return cached
+        
         prompt = ConversationalPrompts.get_content_safety_prompt(message)
         
         try:
@@ -299,14 +430,15 @@ class ConversationalAgent:
             result = response.content.strip().upper()
             
             is_inappropriate = "INAPPROPRIATE" in result
+            _CLASSIFIER_CACHE.set(cache_key, is_inappropriate)
             
             if is_inappropriate:
-                print(f"⚠️ Content filter: Message flagged as inappropriate")
+                logger.warning("⚠️ Content filter: Message flagged as inappropriate")
             
             return is_inappropriate
             
         except Exception as e:
-            print(f"⚠️ Error in content filtering: {e}")
+            logger.warning("⚠️ Error in content filtering: %s", e)
             # Conservative: allow message if filtering fails
             # Main system prompt will still provide safety guidance
             return False
@@ -322,22 +454,11 @@ class ConversationalAgent:
         Returns:
             True if message contains story request
         """
-        detection_prompt = ConversationalPrompts.get_story_request_detection_prompt(message)
+        # Obvious requests need no LLM round trip
+        if _STORY_REQUEST_RE.search(message) and not _NEGATION_RE.search(message):
+            return True
         
-        try:
-            messages = [
-                SystemMessage(content=detection_prompt),
-                HumanMessage(content="Is this a story request?")
-            ]
-            
-            response = self._invoke_with_fallback(messages)
-            answer = response.content.strip().lower()
-            
-            return 'yes' in answer
-        except:
-            # Fallback: simple keyword check if LLM fails
-            message_lower = message.lower()
-            return 'story' in message_lower or 'tale' in message_lower
+        return self.classify_message(message)["story_request"]
     
     def is_question_about_self(self, message: str) -> bool:
         """
@@ -349,22 +470,7 @@ class ConversationalAgent:
         Returns:
             True if message is a self-inquiry
         """
-        detection_prompt = ConversationalPrompts.get_self_inquiry_detection_prompt(message)
-        
-        try:
-            messages = [
-                SystemMessage(content=detection_prompt),
-                HumanMessage(content="Is this asking about self?")
-            ]
-            
-            response = self._invoke_with_fallback(messages)
-            answer = response.content.strip().lower()
-            
-            return 'yes' in answer
-        except:
-            # Fallback
-            message_lower = message.lower()
-            return 'my name' in message_lower or 'who am i' in message_lower
+        return self.classify_message(message)["self_inquiry"]
     
     
     def generate_conversational_response(
@@ -398,11 +504,10 @@ class ConversationalAgent:
         history_text = self._format_conversation_history(recent_history)
         
         # Get conversational prompt
-        age_range = (self.config.MIN_AGE, self.config.MAX_AGE)
         system_prompt = ConversationalPrompts.get_conversational_prompt(
             context=context,
             history=history_text,
-            age_range=age_range
+            age_range=self.age_range
         )
         
         # Generate response
@@ -457,13 +562,14 @@ class ConversationalAgent:
         if not recent_history:
             return message
         
-        has_story_content = any("STORY_CONTENT:" in msg.get("content", "") for msg in recent_history)
-        print(f"🔍 Context analysis - Has STORY_CONTENT: {has_story_content}, History length: {len(recent_history)}")
+        has_story_content = any(StoryMarkers.STORY_CONTENT in msg.get("content", "") for msg in recent_history)
+        logger.info("🔍 Context analysis - Has STORY_CONTENT: %s, History length: %s", has_story_content, len(recent_history))
         
         conversation_text = self._format_conversation_history(recent_history)
         prompt = ConversationalPrompts.get_context_analyzer_prompt(
             conversation=conversation_text,
-            request=message
+            request=message,
+            has_story_content=has_story_content
         )
         
         try:
@@ -478,12 +584,12 @@ class ConversationalAgent:
             if context_aware_prompt.startswith("Since the conversation") or \
                context_aware_prompt.startswith("This is a") or \
                "this is a modification" in context_aware_prompt.lower()[:100]:
-                print(f"⚠️ LLM returned explanation, manually building modification format")
+                logger.warning("⚠️ LLM returned explanation, manually building modification format")
                 
                 story_content = ""
                 for entry in recent_history:
-                    if "STORY_CONTENT:" in entry.get("content", ""):
-                        story_content = entry["content"].split("STORY_CONTENT:")[-1].strip()
+                    if StoryMarkers.STORY_CONTENT in entry.get("content", ""):
+                        story_content = entry["content"].split(StoryMarkers.STORY_CONTENT)[-1].strip()
                         break
                 
                 if story_content:
@@ -491,10 +597,10 @@ class ConversationalAgent:
                 else:
                     return message
             
-            print(f"💡 Context-aware prompt generated: '{context_aware_prompt[:100]}...'")
+            logger.info("💡 Context-aware prompt generated: '%s...'", context_aware_prompt[:100])
             return context_aware_prompt
         except Exception as e:
-            print(f"⚠️ Error building context-aware prompt: {e}")
+            logger.warning("⚠️ Error building context-aware prompt: %s", e)
             return message
     
    
@@ -545,6 +651,23 @@ class ConversationalAgent:
         # Regular conversation
         return self._handle_conversation(message, conversation_history, session_id)
     
+    async def aprocess_message(
+        self, 
+        message: str, 
+        conversation_history: Optional[List[dict]] = None, 
+        session_id: Optional[str] = None
+    ) -> Dict:
+        """
+        Async version of process_message for async route handlers.
+        
+        The classification and reply calls are blocking, so they run in the
+        shared bounded thread pool instead of on the event loop.
+        
+        Returns:
+            Same dictionary as process_message
+        """
+        return await run_blocking(self.process_message, message, conversation_history, session_id)
+    
     def _handle_inappropriate_content(self, session_id: Optional[str]) -> Dict:
         """Generate response for inappropriate content requests."""
         ctx = self._get_session(session_id)
@@ -0,0 +1,622 @@
+"""
+Groq Plumbing Shared by the Storyteller and Judge Agents
+
+Both agents call Groq the same way; this module holds that logic once:
+
+- GroqFallbackMixin - per (model, API key) ChatGroq clients, the blocking
+  model/key fallback loop and the async micro-batched path
+- Exact-match cache of raw LLM responses
+- Error classification (rate limit vs. try-next-model)
+- API key pool and async micro-batcher
+"""
+
+from langchain_groq import ChatGroq
+from langchain_core.messages import AIMessage
+from typing import Dict, Iterator, List, Optional, Tuple
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import weakref
+
+from cache import TTLCache, content_hash
+from config.constants import CacheConfig, FeatureFlags
+from http_pool import SHARED_CLIENT, get_chat_client
+from opik_config import get_opik_tracer
+from telemetry import log_llm_call_async
+from utils import setup_logger
+
+logger = setup_logger(__name__)
+
+# Raw LLM responses keyed on everything that determines them (models,
+# sampling settings, exact messages), so identical requests - retried
+# refinements, repeated demo prompts - cost no tokens
+_RESPONSE_CACHE = TTLCache(
+    maxsize=CacheConfig.RESPONSE_CACHE_SIZE,
+    ttl=CacheConfig.RESPONSE_CACHE_TTL_SECONDS
+)
+# Model ids served by Groq, per API key, so re-created agents do not re-probe
+_LIVE_MODELS_CACHE = TTLCache(maxsize=16, ttl=CacheConfig.MODEL_LIST_TTL_SECONDS)
+
+# Groq error classification: rate limits can succeed on another key,
+# anything retryable can succeed on another model
+_RATE_LIMIT_PATTERN = r"rate[ _-]?limit|\b429\b|limit.*token|token.*limit"
+_RATE_LIMIT_RE = re.compile(_RATE_LIMIT_PATTERN, re.IGNORECASE | re.DOTALL)
+_RETRYABLE_RE = re.compile(_RATE_LIMIT_PATTERN + r"|decommission|invalid", re.IGNORECASE | re.DOTALL)
+# When the Groq SDK error carries an HTTP status, it decides without any
+# string matching: 429 and 413 (request over the per-minute token limit)
+# are rate limits; 400/404 (invalid or retired model) and 5xx are worth
+# another model
+_RATE_LIMIT_STATUSES = frozenset({413, 429})
+_RETRYABLE_STATUSES = _RATE_LIMIT_STATUSES | {400, 404, 500, 502, 503}
+
+# API key pooling: a key rate limited on a model is avoided for this long
+RATE_LIMIT_COOLDOWN_SECONDS = 30
+
+# Async micro-batching: calls queued within the window are sent as one abatch
+MAX_BATCH = 8
+BATCH_WINDOW_MS = 20
+
+
+def _response_cache_key(agent, messages, max_tokens: Optional[int] = None) -> str:
+    """Exact-match cache key for an agent's LLM request"""
+    return content_hash(json.dumps([
+        type(agent).__name__,
+        agent.model_candidates,
+        agent.temperature,
+        max_tokens or agent.max_tokens,
+        [[m.type, m.content] for m in messages]
+    ]))
+
+
+def _cached_response(cache_key: str) -> Optional[AIMessage]:
+    """Return the cached response for cache_key, if response caching is on"""
+    if not FeatureFlags.ENABLE_RESPONSE_CACHING:
+        return None
+    content = _RESPONSE_CACHE.get(cache_key)
+    if content is None:
+        return None
+    logger.info("LLM response cache hit")
+    return AIMessage(content=content)
+
+
+def _cache_response(cache_key: str, response) -> None:
+    """Remember a successful response's text under cache_key"""
+    if FeatureFlags.ENABLE_RESPONSE_CACHING and response.content:
+        _RESPONSE_CACHE.set(cache_key, response.content)
+
+
+def token_usage(response) -> Tuple[Optional[int], Optional[int]]:
+    """
+    (input_tokens, output_tokens) reported for an LLM response, if any.
+    
+    LangChain messages carry usage as usage_metadata (a dict); older
+    integrations only fill response_metadata['token_usage'].
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return usage.get("input_tokens"), usage.get("output_tokens")
+    token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+    return token_usage.get("prompt_tokens"), token_usage.get("completion_tokens")
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    """HTTP status code of a Groq/httpx error, if it carries one"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _live_model_candidates(candidates: List[str], api_key: str) -> List[str]:
+    """
+    Drop candidates Groq does not serve, so no request pays for a dead model
+    
+    The model list is fetched once per API key (cached for a few minutes).
+    Fails open: if the probe fails, or no candidate is listed, the
+    candidates are returned unchanged.
+    
+    Args:
+        candidates: Model names in fallback order
+        api_key: Groq API key used for the probe
+        
+    Returns:
+        Candidates that are currently available, in the same order
+    """
+    if not FeatureFlags.ENABLE_MODEL_PROBE:
+        return candidates
+        
+    cache_key = content_hash(api_key)
+    live = _LIVE_MODELS_CACHE.get(cache_key)
+    if live is None:
+        try:
+            from groq import Groq
+            
+            client = Groq(api_key=api_key, http_client=SHARED_CLIENT)
+            live = frozenset(model.id for model in client.models.list().data)
+            _LIVE_MODELS_CACHE.set(cache_key, live)
+        except Exception as e:
+            logger.warning("⚠️ Could not list Groq models (%s), keeping all candidates", e)
+            return candidates
+            
+    available = [m for m in candidates if m in live]
+    if not available:
+        logger.warning("⚠️ None of %s is listed by Groq, keeping all candidates", ', '.join(candidates))
+        return candidates
+    if len(available) < len(candidates):
+        logger.info("Skipping unavailable Groq models: %s", ', '.join(m for m in candidates if m not in live))
+    return available
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Return True if a Groq error means the next model candidate should be tried"""
+    status = _error_status(error)
+    if status is not None:
+        return status in _RETRYABLE_STATUSES
+    return _RETRYABLE_RE.search(str(error)) is not None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Return True if a Groq error is a per-key rate limit (another key may succeed)"""
+    status = _error_status(error)
+    if status is not None:
+        return status in _RATE_LIMIT_STATUSES
+    return _RATE_LIMIT_RE.search(str(error)) is not None
+
+
+def _load_api_keys(groq_api_key: str) -> List[str]:
+    """API keys from GROQ_API_KEYS (comma-separated), defaulting to groq_api_key"""
+    env_keys = os.getenv("GROQ_API_KEYS") or ""
+    return [k.strip() for k in env_keys.split(",") if k.strip()] or [groq_api_key]
+
+
+class _KeyPool:
+    """
+    Spreads calls across several Groq API keys.
+    
+    Groq rate-limits per key and model, so each call goes to the key with
+    the fewest calls in flight (least recently used on ties, i.e.
+    round-robin when idle). A key that hits a rate limit on a model cools
+    down for that model, and callers only move to the next model once
+    every key has been tried.
+    """
+    
+    def __init__(self, keys: List[str]):
+        self.keys = list(keys)
+        self._in_flight = {key: 0 for key in self.keys}
+        self._last_used = {key: 0 for key in self.keys}
+        self._cooldown_until: Dict[tuple, float] = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+    
+    def candidates(self, model: str) -> Iterator[str]:
+        """
+        Yield keys to try for model, best first.
+        
+        Each yielded key is counted as in flight; the caller must call
+        release(key) once the request finishes. Keys cooling down for model
+        are only used if no other key has been tried yet.
+        """
+        tried = set()
+        while len(tried) < len(self.keys):
+            with self._lock:
+                now = time.monotonic()
+                ranked = sorted(
+                    (key for key in self.keys if key not in tried),
+                    key=lambda k: (
+                        self._cooldown_until.get((model, k), 0) > now,
+                        self._in_flight[k],
+                        self._last_used[k]
+                    )
+                )
+                key = ranked[0]
+                if tried and self._cooldown_until.get((model, key), 0) > now:
+                    return
+                self._sequence += 1
+                self._last_used[key] = self._sequence
+                self._in_flight[key] += 1
+            tried.add(key)
+            yield key
+    
+    def release(self, key: str) -> None:
+        """Mark one call on key as finished"""
+        with self._lock:
+            self._in_flight[key] -= 1
+    
+    def penalize(self, model: str, key: str) -> None:
+        """Steer traffic away from a key that was rate limited on model"""
+        with self._lock:
+            self._cooldown_until[(model, key)] = time.monotonic() + RATE_LIMIT_COOLDOWN_SECONDS
+
+
+class _LLMBatcher:
+    """
+    Coalesces concurrent async LLM calls for one agent into abatch requests.
+    
+    Calls submitted within BATCH_WINDOW_MS of each other (up to MAX_BATCH)
+    are sent together. Items that fail with a retryable error are retried
+    as a group on the next model candidate; other failures are raised to
+    their own caller only.
+    """
+    
+    def __init__(self, agent, agent_name: str):
+        self.agent = agent
+        self.agent_name = agent_name
+        # Queues are bound to their event loop, so each loop gets its own
+        # queue and worker
+        self._workers = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+    
+    async def submit(self, messages, max_tokens: Optional[int] = None):
+        """Queue messages for the next batch and wait for the response"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            queue, worker = self._workers.get(loop, (None, None))
+            if worker is None or worker.done():
+                queue = asyncio.Queue()
+                worker = loop.create_task(self._run(queue))
+                self._workers[loop] = (queue, worker)
+            
+        future = loop.create_future()
+        await queue.put((messages, future, max_tokens))
+        return await future
+    
+    async def _run(self, queue: asyncio.Queue):
+        """Drain the queue into batches and dispatch them without blocking the next batch"""
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await queue.get()]
+            deadline = loop.time() + BATCH_WINDOW_MS / 1000
+            while len(items) < MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # One abatch shares its call kwargs, so group by output cap
+            groups: Dict[Optional[int], List] = {}
+            for messages, future, max_tokens in items:
+                groups.setdefault(max_tokens, []).append((messages, future))
+            for max_tokens, group in groups.items():
+                loop.create_task(self._dispatch(group, max_tokens))
+    
+    async def _dispatch(self, items, max_tokens: Optional[int] = None):
+        """Send one batch, trying each API key and then each model for retryable failures"""
+        agent = self.agent
+        pending = [(messages, future) for messages, future in items if not future.done()]
+        invoke_kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+        last_err = None
+        
+        for model in agent.model_candidates:
+            if not pending:
+                return
+                
+            next_model = []
+            for key in agent._key_pool.candidates(model):
+                llm = agent._client_for(model, key)
+                
+                start_time = time.time()
+                try:
+                    results = await llm.abatch(
+                        [messages for messages, _ in pending],
+                        config=agent._invoke_config,
+                        return_exceptions=True,
+                        **invoke_kwargs
+                    )
+                except Exception as e:
+                    results = [e] * len(pending)
+                finally:
+                    agent._key_pool.release(key)
+                latency_ms = (time.time() - start_time) * 1000
+                
+                rate_limited = []
+                for (messages, future), result in zip(pending, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        last_err = result
+                        logger.warning("⚠️ %s model '%s' failed: %s", self.agent_name.capitalize(), model, result)
+                        if is_rate_limit_error(result):
+                            rate_limited.append((messages, future))
+                        elif is_retryable_error(result):
+                            next_model.append((messages, future))
+                        else:
+                            future.set_exception(result)
+                        continue
+                        
+                    if agent._opik_tracer:
+                        input_tokens, output_tokens = token_usage(result)
+                        log_llm_call_async(
+                            model_name=model,
+                            prompt=messages,
+                            completion=result.content,
+                            latency_ms=latency_ms,
+                            input_tokens=input_tokens,
+                            output_tokens=output_tokens,
+                            metadata={
+                                "agent": self.agent_name,
+                                "temperature": agent.temperature,
+                                "max_tokens": max_tokens or agent.max_tokens,
+                                "batch_size": len(pending)
+                            }
+                        )
+                    future.set_result(result)
+                    
+                pending = rate_limited
+                if not pending:
+                    break
+                agent._key_pool.penalize(model, key)
+                logger.info("↪️ Trying next Groq API key for %s rate-limited request(s)...", len(pending))
+                
+            pending = next_model + pending
+            if pending:
+                logger.info("↪️ Trying next Groq model for %s batched request(s)...", len(pending))
+                
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(
+                    last_err if last_err else RuntimeError(f"All Groq models failed for {self.agent_name}")
+                )
+
+
+class GroqFallbackMixin:
+    """
+    Groq client handling shared by StorytellerAgent and JudgeAgent
+    
+    Subclasses set AGENT_NAME, temperature and max_tokens, then call
+    _init_groq_clients from __init__.
+    """
+    
+    AGENT_NAME = "agent"
+    
+    def _init_groq_clients(
+        self,
+        groq_api_key: str,
+        model_candidates: List[str],
+        model_kwargs: Optional[Dict] = None
+    ) -> None:
+        """
+        Build the clients, key pool, tracer config and batcher
+        
+        Args:
+            groq_api_key: Default Groq API key (GROQ_API_KEYS adds more)
+            model_candidates: Models in fallback order; unavailable ones are dropped
+            model_kwargs: Extra ChatGroq model_kwargs (e.g. JSON mode)
+        """
+        self.groq_api_key = groq_api_key
+        self.model_candidates = _live_model_candidates(model_candidates, groq_api_key)
+        
+        # One client per (model, API key), shared process-wide and on the
+        # HTTP pool, so falling back is a dict lookup on a warm connection
+        self.api_keys = _load_api_keys(groq_api_key)
+        self._key_pool = _KeyPool(self.api_keys)
+        self._llm_by_model_and_key = {
+            (model, key): get_chat_client(
+                model, key, self.temperature, self.max_tokens, model_kwargs
+            )
+            for model in self.model_candidates
+            for key in self.api_keys
+        }
+        self.llm = self._llm_by_model_and_key[(self.model_candidates[0], self.api_keys[0])]
+        self.current_model = self.model_candidates[0]
+        # Resolve the Opik tracer once instead of on every attempt
+        self._opik_tracer = get_opik_tracer()
+        self._invoke_config = {"callbacks": [self._opik_tracer]} if self._opik_tracer else {}
+        self._batcher = _LLMBatcher(self, self.AGENT_NAME)
+        
+        logger.info(
+            "%s Agent initialized (Groq) with model fallback: %s (%s API key(s))",
+            self.AGENT_NAME.capitalize(), ", ".join(self.model_candidates), len(self.api_keys)
+        )
+    
+    def _client_for(self, model: str, key: str) -> ChatGroq:
+        """Return the cached ChatGroq client for model and API key"""
+        if model != self.current_model:
+            logger.info("🔄 %s switching to model: %s", self.AGENT_NAME.capitalize(), model)
+            self.current_model = model
+        self.llm = self._llm_by_model_and_key[(model, key)]
+        return self.llm
+    
+    def _invoke_with_fallback(
+        self,
+        messages,
+        agent_name: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ):
+        """Invoke LLM with fallback and Opik tracking (max_tokens overrides the default cap)"""
+        cache_key = _response_cache_key(self, messages, max_tokens)
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            return cached
+            
+        agent_name = agent_name or self.AGENT_NAME
+        invoke_kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+        last_err = None
+        for model in self.model_candidates:
+            for key in self._key_pool.candidates(model):
+                try:
+                    start_time = time.time()
+                    
+                    llm = self._client_for(model, key)
+                    
+                    response = llm.invoke(messages, config=self._invoke_config, **invoke_kwargs)
+                    
+                    latency_ms = (time.time() - start_time) * 1000
+                    
+                    if self._opik_tracer:
+                        input_tokens, output_tokens = token_usage(response)
+                        log_llm_call_async(
+                            model_name=model,
+                            prompt=messages,
+                            completion=response.content,
+                            latency_ms=latency_ms,
+                            input_tokens=input_tokens,
+                            output_tokens=output_tokens,
+                            metadata={
+                                "agent": agent_name,
+                                "temperature": self.temperature,
+                                "max_tokens": max_tokens or self.max_tokens
+                            }
+                        )
+                    
+                    _cache_response(cache_key, response)
+                    return response
+                    
+                except Exception as e:
+                    last_err = e
+                    logger.warning("⚠️ %s model '%s' failed: %s", self.AGENT_NAME.capitalize(), model, e)
+                    if is_rate_limit_error(e):
+                        self._key_pool.penalize(model, key)
+                        logger.info("↪️ Trying next Groq API key or model due to rate limit...")
+                        continue
+                    if is_retryable_error(e):
+                        logger.info("↪️ Trying next Groq model due to model issue...")
+                        break
+                    raise
+                finally:
+                    self._key_pool.release(key)
+        raise last_err if last_err else RuntimeError(f"All Groq models failed for {self.AGENT_NAME}")
+    
+    def _batch_with_fallback(self, inputs: List, max_tokens: Optional[int] = None) -> List:
+        """
+        Send several message lists in one blocking llm.batch call
+        
+        The whole batch moves to the next API key or model when none of its
+        requests succeed; the response cache is skipped, so identical inputs
+        are sampled separately.
+        
+        Returns:
+            The successful responses (at least one)
+        """
+        invoke_kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+        last_err = None
+        for model in self.model_candidates:
+            for key in self._key_pool.candidates(model):
+                try:
+                    start_time = time.time()
+                    llm = self._client_for(model, key)
+                    results = llm.batch(
+                        inputs,
+                        config=self._invoke_config,
+                        return_exceptions=True,
+                        **invoke_kwargs
+                    )
+                except Exception as e:
+                    results = [e]
+                finally:
+                    self._key_pool.release(key)
+                latency_ms = (time.time() - start_time) * 1000
+                
+                responses = [r for r in results if not isinstance(r, Exception)]
+                if responses:
+                    if self._opik_tracer:
+                        for messages, response in zip(inputs, results):
+                            if isinstance(response, Exception):
+                                continue
+                            input_tokens, output_tokens = token_usage(response)
+                            log_llm_call_async(
+                                model_name=model,
+                                prompt=messages,
+                                completion=response.content,
+                                latency_ms=latency_ms,
+                                input_tokens=input_tokens,
+                                output_tokens=output_tokens,
+                                metadata={
+                                    "agent": self.AGENT_NAME,
+                                    "temperature": self.temperature,
+                                    "max_tokens": max_tokens or self.max_tokens,
+                                    "batch_size": len(inputs)
+                                }
+                            )
+                    return responses
+                    
+                last_err = results[0]
+                logger.warning("⚠️ %s model '%s' failed: %s", self.AGENT_NAME.capitalize(), model, last_err)
+                if is_rate_limit_error(last_err):
+                    self._key_pool.penalize(model, key)
+                    logger.info("↪️ Trying next Groq API key or model due to rate limit...")
+                    continue
+                if is_retryable_error(last_err):
+                    logger.info("↪️ Trying next Groq model due to model issue...")
+                    break
+                raise last_err
+        raise last_err if last_err else RuntimeError(f"All Groq models failed for {self.AGENT_NAME}")
+    
+    async def _ainvoke_with_fallback(self, messages, max_tokens: Optional[int] = None):
+        """Async invoke through the shared micro-batcher (same fallback and caching rules)"""
+        cache_key = _response_cache_key(self, messages, max_tokens)
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            return cached
+            
+        response = None
+        if FeatureFlags.ENABLE_HEDGED_REQUESTS and len(self.model_candidates) > 1:
+            response = await self._ainvoke_hedged(messages, max_tokens)
+        if response is None:
+            response = await self._batcher.submit(messages, max_tokens)
+        _cache_response(cache_key, response)
+        return response
+    
+    async def _ainvoke_hedged(self, messages, max_tokens: Optional[int] = None):
+        """
+        Send the request to the top two models at once and keep the first answer
+        
+        Cuts tail latency when the primary model is slow or rate limited, at
+        the cost of a second request. Returns None if both attempts fail,
+        so the caller can fall back to the normal model/key loop.
+        """
+        tasks = [
+            asyncio.create_task(self._ainvoke_model(model, messages, max_tokens))
+            for model in self.model_candidates[:2]
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    return await next_done
+                except Exception as e:
+                    logger.warning("⚠️ %s hedged request failed: %s", self.AGENT_NAME.capitalize(), e)
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _ainvoke_model(self, model: str, messages, max_tokens: Optional[int] = None):
+        """One async call to a model on its best API key, with Opik logging"""
+        invoke_kwargs = {"max_tokens": max_tokens} if max_tokens else {}
+        keys = self._key_pool.candidates(model)
+        key = next(keys)
+        keys.close()
+        try:
+            start_time = time.time()
+            response = await self._llm_by_model_and_key[(model, key)].ainvoke(
+                messages, config=self._invoke_config, **invoke_kwargs
+            )
+            latency_ms = (time.time() - start_time) * 1000
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self._key_pool.penalize(model, key)
+            raise
+        finally:
+            self._key_pool.release(key)
+            
+        if self._opik_tracer:
+            input_tokens, output_tokens = token_usage(response)
+            log_llm_call_async(
+                model_name=model,
+                prompt=messages,
+                completion=response.content,
+                latency_ms=latency_ms,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                metadata={
+                    "agent": self.AGENT_NAME,
+                    "temperature": self.temperature,
+                    "max_tokens": max_tokens or self.max_tokens,
+                    "hedged": True
+                }
+            )
+        return response
@@ -0,0 +1,121 @@
+"""
+Shared HTTP Connection Pool for Groq Clients
+
+Every ChatGroq instance would otherwise build its own httpx client, so the
+storyteller, judge and conversational agents could not share TLS sessions,
+and each model fallback paid a fresh handshake. This module owns one sync
+and one async httpx client that all agents pass to ChatGroq:
+
+- Keep-alive connections are reused across agents and model fallbacks
+- Concurrent requests are multiplexed over HTTP/2 when 'h2' is installed
+  (httpx[http2]); otherwise the clients use HTTP/1.1 keep-alive
+- ChatGroq clients themselves are cached process-wide (get_chat_client),
+  so agents re-created by the workflow or per-request helpers reuse them
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional
+import json
+
+from langchain_groq import ChatGroq
+import httpx
+
+
+MAX_CONNECTIONS = 50
+MAX_KEEPALIVE_CONNECTIONS = 20
+REQUEST_TIMEOUT_SECONDS = 30
+# Distinct (model, key, sampling settings) combinations kept alive
+CHAT_CLIENT_CACHE_SIZE = 64
+
+
+def _http2_available() -> bool:
+    """Return True if the optional h2 package needed for HTTP/2 is installed"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+_LIMITS = httpx.Limits(
+    max_connections=MAX_CONNECTIONS,
+    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+)
+HTTP2_ENABLED = _http2_available()
+
+SHARED_CLIENT = httpx.Client(
+    http2=HTTP2_ENABLED,
+    timeout=REQUEST_TIMEOUT_SECONDS,
+    limits=_LIMITS
+)
+SHARED_ASYNC_CLIENT = httpx.AsyncClient(
+    http2=HTTP2_ENABLED,
+    timeout=REQUEST_TIMEOUT_SECONDS,
+    limits=_LIMITS
+)
+
+
+def groq_client_kwargs() -> dict:
+    """
+    Keyword arguments that make a ChatGroq instance use the shared pool.
+
+    Returns:
+        Dict with 'http_client' and 'http_async_client'
+    """
+    return {
+        "http_client": SHARED_CLIENT,
+        "http_async_client": SHARED_ASYNC_CLIENT
+    }
+
+
+@lru_cache(maxsize=CHAT_CLIENT_CACHE_SIZE)
+def _cached_chat_client(
+    model: str,
+    api_key: str,
+    temperature: float,
+    max_tokens: int,
+    model_kwargs_json: str
+) -> ChatGroq:
+    """Build the ChatGroq client for one hashable configuration"""
+    client_kwargs = {"model_kwargs": json.loads(model_kwargs_json)} if model_kwargs_json else {}
+    return ChatGroq(
+        api_key=api_key,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        **client_kwargs,
+        **groq_client_kwargs()
+    )
+
+
+def get_chat_client(
+    model: str,
+    api_key: str,
+    temperature: float,
+    max_tokens: int,
+    model_kwargs: Optional[Dict] = None
+) -> ChatGroq:
+    """
+    Return the shared ChatGroq client for a model and its settings.
+    
+    Clients are stateless between calls, so every agent asking for the same
+    configuration gets the same instance on the shared HTTP pool.
+    
+    Args:
+        model: Groq model name
+        api_key: Groq API key the client authenticates with
+        temperature: Sampling temperature
+        max_tokens: Default output token cap
+        model_kwargs: Extra ChatGroq model_kwargs (e.g. JSON mode)
+        
+    Returns:
+        Cached ChatGroq client
+    """
+    model_kwargs_json = json.dumps(model_kwargs, sort_keys=True) if model_kwargs else ""
+    return _cached_chat_client(model, api_key, temperature, max_tokens, model_kwargs_json)
+
+
+async def close_shared_clients() -> None:
+    """Close the pooled connections (called on application shutdown)."""
+    SHARED_CLIENT.close()
+    await SHARED_ASYNC_CLIENT.aclose()
@@ -20,8 +20,9 @@ Architecture:
     -> [not approved?] -> increment_iteration -> story_creator (loop)
 """
 
-from typing import TypedDict, Annotated, Literal, Optional, List, Dict
+from typing import TypedDict, Annotated, AsyncIterator, Literal, Optional, List, Dict, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import operator
 import os
 import time
@@ -32,9 +33,9 @@ from langgraph.checkpoint.memory import MemorySaver
 from pydantic import BaseModel, Field
 
 from conversational_agent import ConversationalAgent
-from agents import StorytellerAgent, JudgeAgent
+from agents import StorytellerAgent, JudgeAgent, Orchestrator
 from utils import count_paragraphs, setup_logger
-from config import settings
+from config import settings, FeatureFlags
 from opik_config import initialize_opik, log_story_evaluation, log_workflow_completion
 
 logger = setup_logger(__name__)
@@ -106,6 +107,8 @@ class StoryGenerationState(TypedDict, total=False):
     structure_correct: bool
     revision_history: Annotated[list[dict], operator.add]
     final_story: Optional[Dict]
+    precomputed_evaluation: Optional[Dict]
+    format_attempts: int
     next_step: Literal["evaluate", "refine", "format_paragraphs", "finalize", "end"]
 
 
@@ -126,7 +129,7 @@ class ConversationNode:
     def __call__(self, state: ConversationState) -> ConversationState:
         """Process user message through conversational agent"""
         
-        logger.info(f"💬 Conversation Node: Processing message")
+        logger.info("💬 Conversation Node: Processing message")
         
         # Process message
         result = self.agent.process_message(
@@ -149,7 +152,7 @@ class ConversationNode:
         if result["should_generate_story"]:
             updates["story_prompt"] = result.get("story_prompt", state["user_message"])
             updates["next_step"] = "generate_story"
-            logger.info(f"📖 Story requested: '{updates['story_prompt']}'")
+            logger.info("📖 Story requested: '%s'", updates['story_prompt'])
         else:
             updates["next_step"] = "end"
         
@@ -163,7 +166,7 @@ def route_after_conversation(state: ConversationState) -> Literal["generate_stor
     Decides whether to move to story generation or end the conversation.
     """
     next_step = state.get("next_step", "end")
-    logger.info(f"🔀 Routing: {next_step}")
+    logger.info("🔀 Routing: %s", next_step)
     return next_step
 
 
@@ -177,10 +180,21 @@ class StoryCreatorNode:
     - Subsequent iterations: Refines story based on judge feedback
     
     Also handles automatic initialization of state fields on first call.
-    """
-    
-    def __init__(self, storyteller: StorytellerAgent):
+    When an orchestrator is given, the first draft is written and scored in
+    one request and the score is handed to the evaluator via state. When a
+    judge is given, refinements write several drafts concurrently and keep
+    the best-scored one (its score is handed over the same way).
+    """
+    
+    def __init__(
+        self,
+        storyteller: StorytellerAgent,
+        orchestrator: Optional[Orchestrator] = None,
+        judge: Optional[JudgeAgent] = None
+    ):
         self.storyteller = storyteller
+        self.orchestrator = orchestrator
+        self.judge = judge
         
     def __call__(self, state: StoryGenerationState) -> StoryGenerationState:
         """Create or refine story"""
@@ -196,9 +210,10 @@ class StoryCreatorNode:
         is_refinement = iteration > 1
         parent_trace = get_current_trace()
         span = None
+        precomputed_evaluation = None
         
         if is_refinement:
-            logger.info(f"🔄 Story Creator (Iteration {iteration}): Refining based on feedback")
+            logger.info("🔄 Story Creator (Iteration %s): Refining based on feedback", iteration)
             
             # Create span for refinement
             if parent_trace:
@@ -210,14 +225,17 @@ class StoryCreatorNode:
                     }
                 )
             
-            result = self.storyteller.refine_story(
-                title=state["story_title"],
-                content=state["story_content"],
-                feedback=state["evaluation_feedback"],
-                length_type=state["length_type"]
-            )
+            if self.judge and settings.story.REFINEMENT_CANDIDATES > 1:
+                result, precomputed_evaluation = self._refine_best_of(state)
+            else:
+                result = self.storyteller.refine_story(
+                    title=state["story_title"],
+                    content=state["story_content"],
+                    feedback=state["evaluation_feedback"],
+                    length_type=state["length_type"]
+                )
         else:
-            logger.info(f"✨ Story Creator (Iteration {iteration}): Creating initial story")
+            logger.info("✨ Story Creator (Iteration %s): Creating initial story", iteration)
             
             # Create span for initial creation
             if parent_trace:
@@ -233,12 +251,22 @@ class StoryCreatorNode:
             word_config = settings.story.WORD_COUNTS[state["length_type"]]
             target_word_count = f"{word_config['min']}-{word_config['max']}"
             
-            result = self.storyteller.create_story(
-                prompt=state["prompt"],
-                target_word_count=target_word_count,
-                length_type=state["length_type"],
-                previous_stories=[]
-            )
+            if self.orchestrator:
+                result = self.orchestrator.create_and_evaluate(
+                    prompt=state["prompt"],
+                    target_word_count=target_word_count,
+                    length_type=state["length_type"],
+                    previous_stories=[],
+                    target_paragraphs=settings.story.PARAGRAPH_STRUCTURE[state["length_type"]]
+                )
+                precomputed_evaluation = result.pop("evaluation")
+            else:
+                result = self.storyteller.create_story(
+                    prompt=state["prompt"],
+                    target_word_count=target_word_count,
+                    length_type=state["length_type"],
+                    previous_stories=[]
+                )
         
         # Update span with output if it exists
         if span:
@@ -269,6 +297,7 @@ class StoryCreatorNode:
             "target_paragraphs": target_paras,
             "structure_correct": actual_paras == target_paras,
             "revision_history": [revision_entry],
+            "precomputed_evaluation": precomputed_evaluation,
             "next_step": "evaluate"
         }
         
@@ -292,6 +321,48 @@ class StoryCreatorNode:
             updates["format_attempts"] = 0
             
         return updates
+    
+    def _refine_best_of(self, state: StoryGenerationState) -> Tuple[Dict, Dict]:
+        """
+        Write refinement drafts concurrently and keep the highest-scoring one
+        
+        Drafts that fail the judge's local checks keep their precheck score;
+        the rest are scored together in one batched judge call.
+        
+        Returns:
+            Tuple of (best draft, its evaluation)
+        """
+        drafts = self.storyteller.refine_candidates(
+            title=state["story_title"],
+            content=state["story_content"],
+            feedback=state["evaluation_feedback"],
+            length_type=state["length_type"],
+            count=settings.story.REFINEMENT_CANDIDATES
+        )
+        
+        word_config = settings.story.WORD_COUNTS[state["length_type"]]
+        can_reformat = state.get("format_attempts", 0) < 2
+        evaluations = [
+            self.judge._local_prechecks(
+                draft["title"],
+                draft["content"],
+                target_word_count=f"{word_config['min']}-{word_config['max']}",
+                target_paragraphs=state.get("target_paragraphs") if can_reformat else None
+            )
+            for draft in drafts
+        ]
+        pending = [i for i, evaluation in enumerate(evaluations) if evaluation is None]
+        if pending:
+            scored = self.judge.evaluate_stories([drafts[i] for i in pending])
+            for i, evaluation in zip(pending, scored):
+                evaluations[i] = evaluation
+                
+        best = max(range(len(drafts)), key=lambda i: evaluations[i]["score"])
+        logger.info(
+            "🏆 Kept refinement draft %s of %s (score %s)",
+            best + 1, len(drafts), evaluations[best]["score"]
+        )
+        return drafts[best], evaluations[best]
 
 
 class StoryEvaluatorNode:
@@ -310,12 +381,22 @@ class StoryEvaluatorNode:
     def __call__(self, state: StoryGenerationState) -> StoryGenerationState:
         """Evaluate story quality"""
         
-        logger.info(f"⚖️ Story Evaluator: Judging story quality")
-        
-        evaluation = self.judge.evaluate_story(
-            title=state["story_title"],
-            content=state["story_content"]
-        )
+        evaluation = state.get("precomputed_evaluation")
+        if evaluation:
+            logger.info("⚖️ Story Evaluator: Using evaluation computed with the draft")
+        else:
+            logger.info("⚖️ Story Evaluator: Judging story quality")
+            
+            # Word count and paragraphs are checked locally first; a wrong
+            # paragraph count only counts while a formatting pass can fix it
+            word_config = settings.story.WORD_COUNTS[state["length_type"]]
+            can_reformat = state.get("format_attempts", 0) < 2
+            evaluation = self.judge.evaluate_story(
+                title=state["story_title"],
+                content=state["story_content"],
+                target_word_count=f"{word_config['min']}-{word_config['max']}",
+                target_paragraphs=state.get("target_paragraphs") if can_reformat else None
+            )
         
         approved = (
             evaluation["score"] >= 9 and
@@ -325,8 +406,8 @@ class StoryEvaluatorNode:
         )
         
         logger.info(
-            f"📊 Evaluation: Score={evaluation['score']}/10, "
-            f"Approved={approved}"
+            "📊 Evaluation: Score=%s/10, Approved=%s",
+            evaluation['score'], approved
         )
         
         # Log evaluation to Opik for metrics tracking
@@ -355,7 +436,7 @@ class StoryEvaluatorNode:
         elif not state["structure_correct"]:
             format_attempts = state.get("format_attempts", 0)
             if format_attempts >= 2:
-                logger.warning(f"⚠️ Gave up on paragraph formatting after {format_attempts} attempts")
+                logger.warning("⚠️ Gave up on paragraph formatting after %s attempts", format_attempts)
                 next_step = "finalize"
             else:
                 next_step = "format_paragraphs"
@@ -369,6 +450,7 @@ class StoryEvaluatorNode:
             "overall_score": evaluation["score"],
             "evaluation_feedback": evaluation["feedback"],
             "approved": approved,
+            "precomputed_evaluation": None,
             "next_step": next_step
         }
 
@@ -394,8 +476,8 @@ class ParagraphFormatterNode:
             return {"next_step": "evaluate"}
         
         logger.info(
-            f"🧩 Paragraph Formatter: Restructuring from "
-            f"{state['actual_paragraphs']} to {state['target_paragraphs']} paragraphs"
+            "🧩 Paragraph Formatter: Restructuring from %s to %s paragraphs",
+            state['actual_paragraphs'], state['target_paragraphs']
         )
         
         target = state["target_paragraphs"]
@@ -427,7 +509,7 @@ class ParagraphFormatterNode:
         
         format_attempts = state.get("format_attempts", 0) + 1
         
-        logger.info(f"📐 After formatting: {actual_paras} paragraphs (attempt {format_attempts})")
+        logger.info("📐 After formatting: %s paragraphs (attempt %s)", actual_paras, format_attempts)
         
         return {
             "story_title": result["title"],
@@ -445,7 +527,7 @@ class IncrementIterationNode:
     def __call__(self, state: StoryGenerationState) -> StoryGenerationState:
         """Increment iteration for next refinement loop"""
         new_iteration = state.get("iteration", 1) + 1
-        logger.info(f"🔢 Incrementing to iteration {new_iteration}")
+        logger.info("🔢 Incrementing to iteration %s", new_iteration)
         
         return {
             "iteration": new_iteration,
@@ -505,7 +587,7 @@ def route_after_evaluation(
     4. Else -> refine (continue improvement loop)
     """
     next_step = state.get("next_step", "finalize")
-    logger.info(f"🔀 Routing after evaluation: {next_step}")
+    logger.info("🔀 Routing after evaluation: %s", next_step)
     return next_step
 
 
@@ -551,7 +633,8 @@ def create_story_generation_graph(
     graph = StateGraph(StoryGenerationState)
     
     # Add nodes
-    story_creator = StoryCreatorNode(storyteller)
+    orchestrator = Orchestrator(storyteller, judge) if FeatureFlags.ENABLE_COMBINED_CREATE_EVALUATE else None
+    story_creator = StoryCreatorNode(storyteller, orchestrator, judge)
     story_evaluator = StoryEvaluatorNode(judge)
     paragraph_formatter = ParagraphFormatterNode(storyteller)
     increment_iteration = IncrementIterationNode()
@@ -640,6 +723,26 @@ def create_complete_workflow(
     return conversation_app, story_app
 
 
+@lru_cache(maxsize=4)
+def get_compiled_story_app(storyteller: StorytellerAgent, judge: JudgeAgent):
+    """
+    Compile the story generation graph once per agent pair.
+    
+    API routes reuse the agent singletons, so the graph is wired and
+    compiled on the first request only. It has no checkpointer: every run
+    starts from its own initial state, which keeps concurrent runs (even
+    for the same session) independent and memory flat.
+    
+    Args:
+        storyteller: StorytellerAgent instance
+        judge: JudgeAgent instance
+        
+    Returns:
+        Compiled story generation graph
+    """
+    logger.info("🧩 Compiling story generation graph")
+    return create_story_generation_graph(storyteller, judge).compile()
+
 
 def run_conversation(
     graph,
@@ -685,25 +788,17 @@ def run_conversation(
     }
 
 
-def run_story_generation(
-    graph,
+def _start_story_generation(
     prompt: str,
-    length_type: str = "medium",
-    session_id: str = "default",
-    max_iterations: int = None
-) -> Dict:
+    length_type: str,
+    session_id: str,
+    max_iterations: Optional[int]
+) -> Tuple[StoryGenerationState, Dict]:
     """
-    Run story generation through the reflection graph.
+    Start the workflow trace and build the initial state and run config.
     
-    Args:
-        graph: Compiled story generation graph
-        prompt: Story prompt/theme
-        length_type: "short", "medium", or "long"
-        session_id: Session identifier
-        max_iterations: Max refinement iterations (default from settings)
-        
     Returns:
-        Final story dict with title, content, and metadata
+        Tuple of (initial_state, config)
     """
     from opik_config import start_workflow_trace
     
@@ -748,11 +843,63 @@ def run_story_generation(
         "next_step": "evaluate"
     }
     
+    return initial_state, config
+
+
+def run_story_generation(
+    graph,
+    prompt: str,
+    length_type: str = "medium",
+    session_id: str = "default",
+    max_iterations: int = None
+) -> Dict:
+    """
+    Run story generation through the reflection graph.
+    
+    Args:
+        graph: Compiled story generation graph
+        prompt: Story prompt/theme
+        length_type: "short", "medium", or "long"
+        session_id: Session identifier
+        max_iterations: Max refinement iterations (default from settings)
+        
+    Returns:
+        Final story dict with title, content, and metadata
+    """
+    initial_state, config = _start_story_generation(prompt, length_type, session_id, max_iterations)
+    
     result = graph.invoke(initial_state, config)
     
     return result.get("final_story", {})
 
 
+async def astream_story_generation(
+    graph,
+    prompt: str,
+    length_type: str = "medium",
+    session_id: str = "default",
+    max_iterations: int = None
+) -> AsyncIterator[Tuple[str, Dict]]:
+    """
+    Run story generation and yield each node's state update as it finishes.
+    
+    The nodes are sync, so LangGraph runs them in its executor while the
+    caller's event loop stays free to forward updates to the client.
+    
+    Args:
+        Same as run_story_generation
+        
+    Yields:
+        Tuples of (node_name, state_update); the "finalize_story" update
+        carries the final story
+    """
+    initial_state, config = _start_story_generation(prompt, length_type, session_id, max_iterations)
+    
+    async for chunk in graph.astream(initial_state, config, stream_mode="updates"):
+        for node_name, update in chunk.items():
+            yield node_name, update or {}
+
+
 
 def get_conversation_graph():
     """
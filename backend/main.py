@@ -8,9 +8,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from api.routes import conversation_router, stories_router, audio_router
+from api.dependencies import init_agents
+from api.responses import DefaultResponse
 from config import settings
-from utils import setup_logger
+from utils import setup_logger, run_blocking
 from opik_config import initialize_opik
+from http_pool import close_shared_clients
 
 logger = setup_logger(__name__)
 
@@ -20,18 +23,17 @@ def create_application() -> FastAPI:
     app = FastAPI(
         title="Bedtime Story API",
         description="AI-powered storytelling for children",
-        version="2.0.0"
+        version="2.0.0",
+        # Story lists are the largest payloads; orjson serializes them much faster
+        default_response_class=DefaultResponse
     )
     
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[
-            "http://localhost:5175",
-            "http://localhost:3000"
-        ],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"]
+        allow_origins=settings.server.CORS_ORIGINS,
+        allow_credentials=settings.server.CORS_ALLOW_CREDENTIALS,
+        allow_methods=settings.server.CORS_ALLOW_METHODS,
+        allow_headers=settings.server.CORS_ALLOW_HEADERS
     )
     
     app.include_router(conversation_router)
@@ -79,11 +81,20 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Opik initialization failed: {e}")
     
+    # Build the agents before the first request; on failure they are
+    # retried lazily so the error surfaces with request context
+    try:
+        await run_blocking(init_agents)
+        logger.info("🤖 Agents initialized")
+    except Exception as e:
+        logger.warning(f"⚠️ Agent initialization failed, will retry on first request: {e}")
+    
     logger.info("✅ Application started successfully")
     
     yield
     
     logger.info("👋 Bedtime Story API shutting down...")
+    await close_shared_clients()
     logger.info("✅ Cleanup complete")
 
 app.router.lifespan_context = lifespan
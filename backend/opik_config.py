@@ -5,6 +5,7 @@ Tracks LLM performance, story quality metrics, and workflow execution traces.
 """
 
 import os
+from functools import lru_cache
 from typing import Optional
 from contextvars import ContextVar
 from opik import Opik, track
@@ -42,6 +43,7 @@ def initialize_opik(project_name: str = "Sleepy-Storybook") -> Opik:
         print("💡 Opik API: http://localhost:8080 | UI: http://localhost:5173")
         
         _opik_tracer = OpikTracer(project_name=project_name)
+        get_opik_tracer.cache_clear()
         print("✅ Opik LangChain tracer initialized")
         return _opik_client
     except Exception as e:
@@ -55,8 +57,14 @@ def get_opik_client() -> Optional[Opik]:
     return _opik_client
 
 
+@lru_cache(maxsize=1)
 def get_opik_tracer() -> Optional[OpikTracer]:
-    """Get the Opik LangChain tracer for automatic LLM call tracking"""
+    """
+    Get the Opik LangChain tracer for automatic LLM call tracking
+    
+    Memoized (lru_cache is thread-safe); initialize_opik clears the cache
+    once the tracer exists.
+    """
     return _opik_tracer
 
 
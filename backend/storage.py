@@ -3,8 +3,10 @@ JSON File Storage for The Sleepy Storybook
 Simple file-based storage for stories and conversations
 """
 
+import heapq
 import json
 import os
+import threading
 from typing import List, Optional, Dict
 from datetime import datetime
 from pathlib import Path
@@ -22,6 +24,8 @@ class JSONStorage:
         self.stories_file = self.storage_dir / "stories.json"
         self.conversations_file = self.storage_dir / "conversations.json"
         self.connected = False
+        # Serializes read-modify-write cycles when routes save from worker threads
+        self._lock = threading.Lock()
         
         try:
             self.storage_dir.mkdir(exist_ok=True)
@@ -71,34 +75,36 @@ class JSONStorage:
             return story
         
         try:
-            stories = self._read_file(self.stories_file)
-            
-            # Add metadata
-            if "_id" not in story:
-                story["_id"] = str(uuid.uuid4())
-            if "created_at" not in story:
-                story["created_at"] = datetime.utcnow().isoformat()
-            
-            # Append and save
-            stories.append(story)
-            self._write_file(self.stories_file, stories)
-            
-            print(f"✅ Story saved with ID: {story['_id']}")
-            return story
+            with self._lock:
+                stories = self._read_file(self.stories_file)
+                
+                # Add metadata
+                if "_id" not in story:
+                    story["_id"] = str(uuid.uuid4())
+                if "created_at" not in story:
+                    story["created_at"] = datetime.utcnow().isoformat()
+                
+                # Append and save
+                stories.append(story)
+                self._write_file(self.stories_file, stories)
+                
+                print(f"✅ Story saved with ID: {story['_id']}")
+                return story
             
         except Exception as e:
             print(f"❌ Failed to save story: {e}")
             return story
     
-    def get_all_stories(self, session_id: Optional[str] = None) -> List[Dict]:
+    def get_all_stories(self, session_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
         """
         Get all stories from storage
         
         Args:
             session_id: Optional session ID to filter by
+            limit: Optional maximum number of (newest) stories to return
             
         Returns:
-            List of stories
+            List of stories, newest first
         """
         if not self.connected:
             print("⚠️  Storage not connected - returning empty list")
@@ -111,8 +117,12 @@ class JSONStorage:
             if session_id:
                 stories = [s for s in stories if s.get("session_id") == session_id]
             
-            # Sort by created_at (newest first)
-            stories.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+            # Sort by created_at (newest first); with a limit only the top
+            # rows are selected instead of sorting every story
+            if limit is not None:
+                stories = heapq.nlargest(limit, stories, key=lambda x: x.get("created_at", ""))
+            else:
+                stories.sort(key=lambda x: x.get("created_at", ""), reverse=True)
             
             print(f"✅ Retrieved {len(stories)} stories")
             return stories
@@ -163,18 +173,19 @@ class JSONStorage:
             return False
         
         try:
-            stories = self._read_file(self.stories_file)
-            
-            # Filter out the story to delete
-            original_count = len(stories)
-            stories = [s for s in stories if s.get("_id") != story_id]
-            
-            if len(stories) < original_count:
-                self._write_file(self.stories_file, stories)
-                print(f"✅ Story {story_id} deleted")
-                return True
-            
-            return False
+            with self._lock:
+                stories = self._read_file(self.stories_file)
+                
+                # Filter out the story to delete
+                original_count = len(stories)
+                stories = [s for s in stories if s.get("_id") != story_id]
+                
+                if len(stories) < original_count:
+                    self._write_file(self.stories_file, stories)
+                    print(f"✅ Story {story_id} deleted")
+                    return True
+                
+                return False
             
         except Exception as e:
             print(f"❌ Failed to delete story: {e}")
@@ -197,38 +208,40 @@ class JSONStorage:
             return False
         
         try:
-            conversations = self._read_file(self.conversations_file)
-            
-            conversation = None
-            for i, conv in enumerate(conversations):
-                if conv.get("session_id") == session_id:
-                    conversation = conv
-                    conversation_index = i
-                    break
-            
-            if conversation:
-                conversation["messages"] = messages
-                conversation["updated_at"] = datetime.utcnow().isoformat()
-                if user_name:
-                    conversation["user_name"] = user_name
-                conversations[conversation_index] = conversation
-                action = "updated"
-            else:
-                conversation = {
-                    "_id": str(uuid.uuid4()),
-                    "session_id": session_id,
-                    "messages": messages,
-                    "created_at": datetime.utcnow().isoformat(),
-                    "updated_at": datetime.utcnow().isoformat()
-                }
-                if user_name:
-                    conversation["user_name"] = user_name
-                conversations.append(conversation)
-                action = "created"
-            
-            self._write_file(self.conversations_file, conversations)
-            print(f"✅ Conversation {action} for session: {session_id}")
-            return True
+            with self._lock:
+                conversations = self._read_file(self.conversations_file)
+                
+                conversation = None
+                for i, conv in enumerate(conversations):
+                    if conv.get("session_id") == session_id:
+                        conversation = conv
+                        conversation_index = i
+                        break
+                
+                if conversation:
+                    conversation["messages"] = messages
+                    conversation["updated_at"] = datetime.utcnow().isoformat()
+                    if user_name:
+                        conversation["user_name"] = user_name
+                    conversations[conversation_index] = conversation
+                    action = "updated"
+                else:
+                    now = datetime.utcnow().isoformat()
+                    conversation = {
+                        "_id": str(uuid.uuid4()),
+                        "session_id": session_id,
+                        "messages": messages,
+                        "created_at": now,
+                        "updated_at": now
+                    }
+                    if user_name:
+                        conversation["user_name"] = user_name
+                    conversations.append(conversation)
+                    action = "created"
+                
+                self._write_file(self.conversations_file, conversations)
+                print(f"✅ Conversation {action} for session: {session_id}")
+                return True
             
         except Exception as e:
             print(f"❌ Failed to save conversation: {e}")
@@ -295,17 +308,18 @@ class JSONStorage:
             return False
         
         try:
-            conversations = self._read_file(self.conversations_file)
-            
-            original_count = len(conversations)
-            conversations = [c for c in conversations if c.get("session_id") != session_id]
-            
-            if len(conversations) < original_count:
-                self._write_file(self.conversations_file, conversations)
-                print(f"✅ Conversation {session_id} deleted")
-                return True
-            
-            return False
+            with self._lock:
+                conversations = self._read_file(self.conversations_file)
+                
+                original_count = len(conversations)
+                conversations = [c for c in conversations if c.get("session_id") != session_id]
+                
+                if len(conversations) < original_count:
+                    self._write_file(self.conversations_file, conversations)
+                    print(f"✅ Conversation {session_id} deleted")
+                    return True
+                
+                return False
             
         except Exception as e:
             print(f"❌ Failed to delete conversation: {e}")
@@ -0,0 +1,91 @@
+"""
+Background Telemetry for LLM Calls
+
+log_llm_call writes spans to Opik, which is network I/O. Doing that inline
+added tracer latency to every agent response, so agents enqueue the record
+here and a daemon worker thread performs the actual write.
+
+- The queue is bounded; when full, the oldest record is dropped so a slow
+  tracing backend can never grow memory without limit
+- Each record carries a copy of the caller's context, so the worker logs
+  under the same parent trace (a ContextVar) the caller was running in
+- Prompts may be passed as message lists; the worker serializes them to
+  compact JSON (orjson when installed) instead of str(messages)
+"""
+
+import contextvars
+import queue
+import threading
+
+from opik_config import log_llm_call
+from utils import setup_logger
+
+logger = setup_logger(__name__)
+
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+
+QUEUE_MAXSIZE = 10000
+
+_Q: "queue.Queue" = queue.Queue(maxsize=QUEUE_MAXSIZE)
+
+
+def _msg_default(message) -> dict:
+    """Minimal JSON form of a LangChain message"""
+    return {"role": message.type, "content": message.content}
+
+
+def _format_prompt(prompt) -> str:
+    """Render a prompt (string or list of messages) for the trace span"""
+    if isinstance(prompt, str):
+        return prompt
+    try:
+        return _dumps([_msg_default(m) for m in prompt])
+    except (AttributeError, TypeError):
+        return str(prompt)
+
+
+def _worker() -> None:
+    """Consume queued records and forward them to Opik."""
+    while True:
+        context, fields = _Q.get()
+        try:
+            fields["prompt"] = _format_prompt(fields["prompt"])
+            context.run(log_llm_call, **fields)
+        except Exception as e:
+            logger.warning("⚠️ Telemetry worker failed to log LLM call: %s", e)
+        finally:
+            _Q.task_done()
+
+
+def log_llm_call_async(**fields) -> None:
+    """
+    Queue an LLM call for logging and return immediately.
+
+    Accepts the same keyword arguments as opik_config.log_llm_call; 'prompt'
+    may also be a list of messages, serialized by the worker.
+    """
+    record = (contextvars.copy_context(), fields)
+    while True:
+        try:
+            _Q.put_nowait(record)
+            return
+        except queue.Full:
+            # Drop the oldest record to make room
+            try:
+                _Q.get_nowait()
+                _Q.task_done()
+            except queue.Empty:
+                pass
+
+
+threading.Thread(target=_worker, name="llm-telemetry", daemon=True).start()
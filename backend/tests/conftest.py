@@ -0,0 +1,14 @@
+"""
+Shared pytest setup for the backend tests.
+
+The backend modules import each other as top-level modules (run from
+backend/), so that directory goes on sys.path. Settings require a Groq key
+at import time; the tests never call Groq, so any value will do.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("GROQ_API_KEY", "test-key")
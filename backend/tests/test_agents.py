@@ -0,0 +1,108 @@
+"""Tests for the judge's local checks, evaluation parsing and system messages"""
+
+import hashlib
+
+import pytest
+
+from agents import JudgeAgent, _system_message
+from config import QualityMetrics
+from config.prompts import JudgePrompts, OrchestratorPrompts, StorytellerPrompts
+
+
+# Two calm paragraphs of 16 sentences, 8 words each (128 words)
+PARAGRAPH = " ".join(["The little bunny hopped slowly home at night."] * 8)
+GOOD_STORY = f"{PARAGRAPH}\n\n{PARAGRAPH}"
+
+
+@pytest.fixture
+def judge():
+    # The checks and the text parser never touch the Groq client
+    return JudgeAgent.__new__(JudgeAgent)
+
+
+def _rendered_sha256(message) -> str:
+    return hashlib.sha256(repr((message.content, message.additional_kwargs)).encode("utf-8")).hexdigest()
+
+
+@pytest.mark.parametrize("prompt", [
+    StorytellerPrompts.get_system_prompt(),
+    JudgePrompts.get_system_prompt(),
+    OrchestratorPrompts.get_system_prompt(),
+])
+def test_system_message_prefix_is_stable(prompt):
+    first = _system_message(prompt)
+    # A separately built copy of the same text must give the same bytes
+    second = _system_message("".join(list(prompt)))
+    
+    assert _rendered_sha256(first) == _rendered_sha256(second)
+    assert first.additional_kwargs == {"cache_control": {"type": "ephemeral"}}
+
+
+def test_local_prechecks_pass_good_story(judge):
+    assert judge._local_prechecks("Bunny", GOOD_STORY, "100-150", 2) is None
+
+
+def test_local_prechecks_fail_unsafe_words(judge):
+    evaluation = judge._local_prechecks("Bunny", GOOD_STORY + " He found a gun.")
+    
+    assert evaluation["approved"] is False
+    assert evaluation["ageAppropriateness"] == QualityMetrics.MIN_SCORE
+    assert "gun" in evaluation["feedback"]
+
+
+def test_local_prechecks_fail_word_count(judge):
+    evaluation = judge._local_prechecks("Bunny", GOOD_STORY, "400-500")
+    
+    assert evaluation["approved"] is False
+    assert "too short" in evaluation["feedback"]
+
+
+def test_local_prechecks_fail_paragraphs(judge):
+    evaluation = judge._local_prechecks("Bunny", GOOD_STORY, target_paragraphs=3)
+    
+    assert evaluation["approved"] is False
+    assert "found 2" in evaluation["feedback"]
+
+
+def test_local_prechecks_fail_long_sentence(judge):
+    long_sentence = " ".join(["and the bunny hopped"] * 10) + "."
+    evaluation = judge._local_prechecks("Bunny", f"{GOOD_STORY} {long_sentence}")
+    
+    assert evaluation["approved"] is False
+    assert "long sentences" in evaluation["feedback"]
+
+
+def test_local_prechecks_fail_choppy_sentences(judge):
+    evaluation = judge._local_prechecks("Bunny", "He ran. She hid. It rained. They slept.")
+    
+    assert evaluation["approved"] is False
+    assert "choppy" in evaluation["feedback"]
+
+
+def test_parse_evaluation_text(judge):
+    response = (
+        "CLARITY: 8/10\n"
+        "MORAL: 9\n"
+        "AGE_APPROPRIATE: 10\n"
+        "OVERALL: 9\n"
+        "APPROVED: Yes\n"
+        "FEEDBACK: A gentle story.\n"
+        "The ending is calm."
+    )
+    
+    assert judge._parse_evaluation_text(response) == {
+        "clarity": 8,
+        "moralValue": 9,
+        "ageAppropriateness": 10,
+        "score": 9,
+        "approved": True,
+        "feedback": "A gentle story.\nThe ending is calm."
+    }
+
+
+def test_parse_evaluation_text_defaults(judge):
+    evaluation = judge._parse_evaluation_text("The story is fine.")
+    
+    assert evaluation["score"] == 7
+    assert evaluation["approved"] is False
+    assert evaluation["feedback"] == "Story evaluated."
@@ -0,0 +1,27 @@
+"""Tests for splitting story text into TTS segments"""
+
+from api.routes.audio import chunk_for_tts
+
+
+def test_chunk_for_tts_keeps_short_text_whole():
+    assert chunk_for_tts("One. Two.") == ["One. Two."]
+
+
+def test_chunk_for_tts_empty_text():
+    assert chunk_for_tts("") == [""]
+
+
+def test_chunk_for_tts_first_segment_is_short():
+    text = " ".join(f"Sentence number {i} is here." for i in range(20))
+    segments = chunk_for_tts(text, first_limit=60, limit=200)
+    
+    assert " ".join(segments) == text
+    assert len(segments[0]) <= 60
+    assert all(len(segment) <= 200 for segment in segments[1:])
+
+
+def test_chunk_for_tts_long_sentence_is_own_segment():
+    long_sentence = "A" * 100 + "."
+    segments = chunk_for_tts(f"Short one. {long_sentence} Short two.", first_limit=20, limit=50)
+    
+    assert segments == ["Short one.", long_sentence, "Short two."]
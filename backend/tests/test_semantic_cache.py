@@ -0,0 +1,67 @@
+"""Tests for the exact-match and semantic caches"""
+
+from cache import SemanticCache, TTLCache, content_hash, cosine_similarity, embed_text
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2, ttl=-1)
+    cache.set("a", 1)
+    
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_content_hash_separates_parts():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("a", 1) == content_hash("a", "1")
+
+
+def test_embed_text_is_order_aware():
+    first = embed_text("a cat who is afraid of the dog")
+    swapped = embed_text("a dog who is afraid of the cat")
+    
+    assert cosine_similarity(first, first) > 0.999
+    assert cosine_similarity(first, swapped) < 0.92
+
+
+def test_semantic_cache_matches_paraphrase():
+    cache = SemanticCache(threshold=0.9)
+    cache.store("a story about a brave bunny", "bunny story")
+    
+    assert cache.lookup("Story about the brave bunny!") == "bunny story"
+
+
+def test_semantic_cache_misses_swapped_roles():
+    cache = SemanticCache()
+    cache.store("a cat who is afraid of the dog", "cat story")
+    
+    assert cache.lookup("a dog who is afraid of the cat") is None
+
+
+def test_semantic_cache_keeps_namespaces_apart():
+    cache = SemanticCache()
+    cache.store("a brave bunny", "short story", namespace="short|150-220")
+    
+    assert cache.lookup("a brave bunny", namespace="long|500-650") is None
+    assert cache.lookup("a brave bunny", namespace="short|150-220") == "short story"
+
+
+def test_semantic_cache_evicts_oldest_entry():
+    cache = SemanticCache(maxsize=1)
+    cache.store("a brave bunny", "bunny story")
+    cache.store("a sleepy dragon", "dragon story")
+    
+    assert len(cache) == 1
+    assert cache.lookup("a brave bunny") is None
@@ -1,7 +1,8 @@
 """
 Utilities Package
 
-Common utility functions for validation, text processing, and logging.
+Common utility functions for validation, text processing, logging, and
+running blocking calls off the event loop.
 """
 
 from .validation import (
@@ -23,7 +24,9 @@ from .text_processing import (
     extract_name_from_message,
     extract_age_from_message,
     count_words,
+    estimate_tokens,
     count_paragraphs,
+    sentence_word_counts,
     truncate_text,
     clean_whitespace,
     extract_title_and_content,
@@ -46,6 +49,8 @@ from .logging_utils import (
     log_context_generated
 )
 
+from .concurrency import run_blocking
+
 __all__ = [
     # Validation
     'ValidationError',
@@ -65,7 +70,9 @@ __all__ = [
     'extract_name_from_message',
     'extract_age_from_message',
     'count_words',
+    'estimate_tokens',
     'count_paragraphs',
+    'sentence_word_counts',
     'truncate_text',
     'clean_whitespace',
     'extract_title_and_content',
@@ -85,4 +92,7 @@ __all__ = [
     'log_user_info_learned',
     'log_content_filtered',
     'log_context_generated',
+    
+    # Concurrency
+    'run_blocking',
 ]
@@ -0,0 +1,46 @@
+"""
+Concurrency Utilities
+
+Blocking LLM calls (ChatGroq.invoke, the LangGraph workflow) take seconds.
+Called directly inside an async route they would block the event loop and
+serialize every user behind one request. run_blocking moves such calls to
+a bounded thread pool instead.
+
+- The pool is capped so concurrent Groq requests stay within the
+  per-key concurrency Groq allows
+- The caller's context is copied into the worker thread, so LangSmith
+  tracing (tracing_v2_enabled) and the Opik trace still apply
+"""
+
+import asyncio
+import atexit
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+
+# Maximum blocking LLM calls running at the same time
+MAX_BLOCKING_WORKERS = 16
+
+T = TypeVar("T")
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_BLOCKING_WORKERS, thread_name_prefix="blocking-llm")
+atexit.register(_EXECUTOR.shutdown, wait=False)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking function in the shared thread pool and await its result.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The value returned by func
+    """
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_EXECUTOR, call)
@@ -2,9 +2,16 @@
 Logging Utilities
 
 Centralized logging configuration and helper functions.
+
+Console output goes through a QueueHandler: request threads only enqueue
+the record, and a single QueueListener thread writes to stdout, so
+concurrent requests never contend on stdout writes.
 """
 
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from typing import Optional
 from datetime import datetime
@@ -15,6 +22,14 @@ from config.constants import LogMessages
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 
+# Shared console pipeline: QueueHandler (per logger) -> queue -> listener thread
+_LOG_QUEUE: "queue.Queue" = queue.Queue(-1)
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter(LOG_FORMAT, DATE_FORMAT))
+_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, _console_handler)
+_LISTENER.start()
+atexit.register(_LISTENER.stop)
+
 
 def setup_logger(
     name: str,
@@ -38,11 +53,9 @@ def setup_logger(
     # Remove existing handlers
     logger.handlers = []
     
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    # Console handler (written by the shared listener thread)
+    console_handler = logging.handlers.QueueHandler(_LOG_QUEUE)
     console_handler.setLevel(level)
-    console_formatter = logging.Formatter(LOG_FORMAT, DATE_FORMAT)
-    console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
     
     # File handler (optional)
@@ -65,6 +78,10 @@ def log_agent_init(logger: logging.Logger, agent_type: str, models: list):
         agent_type: Type of agent (storyteller, judge, conversation)
         models: List of model names
     """
+    # Skip building the message when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     message = LogMessages.AGENT_INITIALIZED.format(
         agent_type=agent_type.capitalize(),
         models=", ".join(models)
@@ -80,6 +97,9 @@ def log_story_generation_start(logger: logging.Logger, prompt: str):
         logger: Logger instance
         prompt: Story prompt
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     message = LogMessages.STORY_GENERATION_START.format(
         prompt=prompt[:100] + "..." if len(prompt) > 100 else prompt
     )
@@ -94,6 +114,9 @@ def log_story_generation_complete(logger: logging.Logger, iterations: int):
         logger: Logger instance
         iterations: Number of iterations taken
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     message = LogMessages.STORY_GENERATION_COMPLETE.format(
         iterations=iterations
     )
@@ -109,6 +132,9 @@ def log_story_refinement(logger: logging.Logger, current: int, max_iter: int):
         current: Current iteration number
         max_iter: Maximum iterations
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     message = LogMessages.STORY_REFINEMENT.format(
         current=current,
         max=max_iter
@@ -155,6 +181,9 @@ def log_user_info_learned(logger: logging.Logger, info_type: str, value: str):
         info_type: Type of info (name, age)
         value: The learned value
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     if info_type == "name":
         message = LogMessages.NAME_LEARNED.format(name=value)
     elif info_type == "age":
@@ -183,6 +212,9 @@ def log_context_generated(logger: logging.Logger, prompt: str):
         logger: Logger instance
         prompt: Generated prompt
     """
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     message = LogMessages.CONTEXT_GENERATED.format(
         prompt=prompt[:100] + "..." if len(prompt) > 100 else prompt
     )
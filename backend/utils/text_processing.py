@@ -9,6 +9,19 @@ from typing import Optional, List, Tuple
 from config.constants import RegexPatterns, TextLimits
 
 
+# Patterns applied to every generated story, compiled once at import
+_MULTI_SPACE_RE = re.compile(r' +')
+_EXTRA_NEWLINES_RE = re.compile(r'\n\s*\n\s*\n+')
+_BOLD_STAR_RE = re.compile(r'\*\*(.*?)\*\*')
+_BOLD_UNDERSCORE_RE = re.compile(r'__(.*?)__')
+_ITALIC_STAR_RE = re.compile(r'\*(.*?)\*')
+_ITALIC_UNDERSCORE_RE = re.compile(r'_(.*?)_')
+_HEADER_RE = re.compile(r'^#+\s+', re.MULTILINE)
+_LINK_RE = re.compile(r'\[(.*?)\]\(.*?\)')
+_SENTENCE_SPLIT_RE = re.compile(r'([.!?]\s+)')
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])["\u201d\']?\s+')
+
+
 def extract_name_from_message(message: str) -> Optional[str]:
     """
     Extract user's name from a message using pattern matching.
@@ -21,13 +34,11 @@ def extract_name_from_message(message: str) -> Optional[str]:
     """
     message_lower = message.lower()
     
-    for pattern in RegexPatterns.NAME_PATTERNS:
-        match = re.search(pattern, message_lower)
-        if match:
-            name = match.group(1).capitalize()
-            # Basic validation
-            if len(name) >= TextLimits.MIN_NAME_LENGTH and len(name) <= TextLimits.MAX_NAME_LENGTH:
-                return name
+    for match in RegexPatterns.NAME_PATTERN.finditer(message_lower):
+        name = match.group(1).capitalize()
+        # Basic validation
+        if len(name) >= TextLimits.MIN_NAME_LENGTH and len(name) <= TextLimits.MAX_NAME_LENGTH:
+            return name
     
     return None
 
@@ -44,7 +55,7 @@ def extract_age_from_message(message: str) -> Optional[int]:
     """
     message_lower = message.lower()
     
-    match = re.search(RegexPatterns.AGE_PATTERN, message_lower)
+    match = RegexPatterns.AGE_PATTERN.search(message_lower)
     if match:
         try:
             age = int(match.group(1))
@@ -71,10 +82,29 @@ def count_words(text: str) -> int:
         return 0
     
     # Use regex to match word boundaries
-    words = re.findall(RegexPatterns.WORD_COUNT_PATTERN, text)
+    words = RegexPatterns.WORD_COUNT_PATTERN.findall(text)
     return len(words)
 
 
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate how many LLM tokens text will use.
+    
+    A character-based estimate, rounded up; close enough to keep prompts
+    under a token budget without loading a tokenizer.
+    
+    Args:
+        text: Text to estimate
+        
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    
+    return -(-len(text) // TextLimits.CHARS_PER_TOKEN)
+
+
 def count_paragraphs(text: str) -> int:
     """
     Count paragraphs in text.
@@ -89,11 +119,29 @@ def count_paragraphs(text: str) -> int:
         return 0
     
     # Split by blank lines
-    paragraphs = re.split(RegexPatterns.PARAGRAPH_SPLIT, text.strip())
+    paragraphs = RegexPatterns.PARAGRAPH_SPLIT.split(text.strip())
     # Filter out empty paragraphs
     return len([p for p in paragraphs if p.strip()])
 
 
+def sentence_word_counts(text: str) -> List[int]:
+    """
+    Count words in each sentence of text.
+    
+    Args:
+        text: Text to analyze
+        
+    Returns:
+        Word count of every non-empty sentence, in order
+    """
+    if not text:
+        return []
+    
+    sentences = _SENTENCE_END_RE.split(text.strip())
+    counts = [count_words(sentence) for sentence in sentences]
+    return [n for n in counts if n]
+
+
 def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
     """
     Truncate text to maximum length with suffix.
@@ -128,10 +176,10 @@ def clean_whitespace(text: str) -> str:
         return ""
     
     # Replace multiple spaces with single space
-    text = re.sub(r' +', ' ', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
     
     # Replace multiple newlines with double newline (paragraph break)
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
+    text = _EXTRA_NEWLINES_RE.sub('\n\n', text)
     
     # Strip leading/trailing whitespace
     return text.strip()
@@ -247,18 +295,18 @@ def remove_markdown(text: str) -> str:
         return ""
     
     # Remove bold
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    text = re.sub(r'__(.*?)__', r'\1', text)
+    text = _BOLD_STAR_RE.sub(r'\1', text)
+    text = _BOLD_UNDERSCORE_RE.sub(r'\1', text)
     
     # Remove italic
-    text = re.sub(r'\*(.*?)\*', r'\1', text)
-    text = re.sub(r'_(.*?)_', r'\1', text)
+    text = _ITALIC_STAR_RE.sub(r'\1', text)
+    text = _ITALIC_UNDERSCORE_RE.sub(r'\1', text)
     
     # Remove headers
-    text = re.sub(r'^#+\s+', '', text, flags=re.MULTILINE)
+    text = _HEADER_RE.sub('', text)
     
     # Remove links
-    text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)
+    text = _LINK_RE.sub(r'\1', text)
     
     return text
 
@@ -277,7 +325,7 @@ def capitalize_sentences(text: str) -> str:
         return ""
     
     # Split into sentences
-    sentences = re.split(r'([.!?]\s+)', text)
+    sentences = _SENTENCE_SPLIT_RE.split(text)
     
     result = []
     for i, part in enumerate(sentences):
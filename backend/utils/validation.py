@@ -94,10 +94,8 @@ def validate_story_length(length_type: str) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
-    valid_lengths = [e.value for e in StoryLength]
-    
-    if length_type not in valid_lengths:
-        return False, f"Invalid length type. Must be one of: {', '.join(valid_lengths)}"
+    if length_type not in StoryLength.ALL:
+        return False, f"Invalid length type. Must be one of: {', '.join(StoryLength.ALL)}"
     
     return True, None
 